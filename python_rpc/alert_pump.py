@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+import libtorrent as lt
+
+DEFAULT_ALERT_MASK = (
+    lt.alert.category_t.error_notification
+    | lt.alert.category_t.status_notification
+    | lt.alert.category_t.storage_notification
+)
+
+
+class AlertPump:
+    """Single session-wide consumer of libtorrent alerts.
+
+    Keeps the latest ``torrent_status`` per handle from ``state_update_alert``
+    and lets callers block on per-handle events (metadata received, file
+    priorities applied) instead of polling the handle.
+    """
+
+    def __init__(
+        self,
+        torrent_session,
+        update_interval_seconds: float = 0.5,
+        alert_mask: int = DEFAULT_ALERT_MASK,
+    ):
+        self.session = torrent_session
+        self.update_interval_seconds = max(update_interval_seconds, 0.05)
+        self.alert_mask = alert_mask
+        self.logger = logging.getLogger("hydra.alerts")
+        self.condition = threading.Condition()
+        self.snapshots = {}
+        self.metadata_ready = set()
+        self.file_prio_counters = defaultdict(int)
+        self.listeners = defaultdict(list)
+        self.update_generation = 0
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        try:
+            current_mask = self.session.get_settings().get("alert_mask", 0)
+            self.session.apply_settings({"alert_mask": current_mask | self.alert_mask})
+        except Exception:
+            self.logger.warning("Failed to update alert mask", exc_info=True)
+
+        self._thread = threading.Thread(target=self._run, name="alert-pump", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def add_listener(self, alert_type, callback: Callable):
+        """Call ``callback(alert)`` from the pump thread for every alert of ``alert_type``."""
+        with self.condition:
+            self.listeners[alert_type].append(callback)
+
+    def get_status(self, handle):
+        with self.condition:
+            return self.snapshots.get(handle)
+
+    def get_all_statuses(self):
+        with self.condition:
+            return dict(self.snapshots)
+
+    def generation(self) -> int:
+        """Counter bumped whenever a torrent status snapshot changes or goes away."""
+        with self.condition:
+            return self.update_generation
+
+    def forget(self, handle):
+        with self.condition:
+            self.snapshots.pop(handle, None)
+            self.metadata_ready.discard(handle)
+            self.file_prio_counters.pop(handle, None)
+
+    def wait_for_metadata(self, handle, timeout_seconds: float) -> bool:
+        deadline = time.monotonic() + timeout_seconds
+
+        with self.condition:
+            if handle in self.metadata_ready:
+                return True
+
+        try:
+            if handle.status(flags=0).has_metadata:
+                return True
+        except RuntimeError:
+            return False
+
+        with self.condition:
+            while handle not in self.metadata_ready:
+                snapshot = self.snapshots.get(handle)
+                if snapshot is not None and snapshot.has_metadata:
+                    return True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+
+                self.condition.wait(remaining)
+
+        return True
+
+    def file_prio_generation(self, handle) -> int:
+        with self.condition:
+            return self.file_prio_counters.get(handle, 0)
+
+    def wait_for_file_priorities(self, handle, generation: int, timeout_seconds: float) -> bool:
+        """Wait until a ``file_prio_alert`` newer than ``generation`` arrives for ``handle``."""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.file_prio_counters.get(handle, 0) > generation,
+                timeout_seconds,
+            )
+
+    def _run(self):
+        next_update = 0.0
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= next_update:
+                try:
+                    self.session.post_torrent_updates()
+                except Exception:
+                    self.logger.warning("post_torrent_updates failed", exc_info=True)
+                next_update = now + self.update_interval_seconds
+
+            wait_ms = max(int((next_update - time.monotonic()) * 1000), 1)
+            try:
+                if self.session.wait_for_alert(wait_ms) is None:
+                    continue
+
+                alerts = self.session.pop_alerts()
+            except Exception:
+                self.logger.warning("Failed to pop alerts", exc_info=True)
+                time.sleep(self.update_interval_seconds)
+                continue
+
+            self._handle_alerts(alerts)
+
+    def _handle_alerts(self, alerts):
+        with self.condition:
+            for alert in alerts:
+                if isinstance(alert, lt.state_update_alert):
+                    for status in alert.status:
+                        self.snapshots[status.handle] = status
+                        self.update_generation += 1
+                elif isinstance(alert, lt.metadata_received_alert):
+                    self.metadata_ready.add(alert.handle)
+                elif isinstance(alert, lt.file_prio_alert):
+                    self.file_prio_counters[alert.handle] += 1
+                elif isinstance(alert, lt.torrent_removed_alert):
+                    self.update_generation += 1
+                    self.snapshots.pop(alert.handle, None)
+                    self.metadata_ready.discard(alert.handle)
+                    self.file_prio_counters.pop(alert.handle, None)
+
+            self.condition.notify_all()
+            listeners = {
+                alert_type: list(callbacks)
+                for alert_type, callbacks in self.listeners.items()
+                if callbacks
+            }
+
+        if not listeners:
+            return
+
+        for alert in alerts:
+            for alert_type, callbacks in listeners.items():
+                if not isinstance(alert, alert_type):
+                    continue
+
+                for callback in callbacks:
+                    try:
+                        callback(alert)
+                    except Exception:
+                        self.logger.exception("Alert listener failed for %s", alert.what())
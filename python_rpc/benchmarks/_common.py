@@ -0,0 +1,70 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+RPC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if RPC_DIR not in sys.path:
+    sys.path.insert(0, RPC_DIR)
+
+from stdout_writer import percentile as sorted_percentile  # noqa: E402
+
+
+def load_rpc_main(torrent_port: str = "0"):
+    """Import ``main.py`` with a stdio-style argv and no initial downloads.
+
+    Unless ``HYDRA_RPC_DATA_DIR`` is already set, state files go to a
+    temporary directory removed at exit, never the user's real data dir.
+    """
+    if not os.environ.get("HYDRA_RPC_DATA_DIR"):
+        data_dir = tempfile.mkdtemp(prefix="hydra-rpc-bench-")
+        # Registered before main's own hooks, so it runs after their final saves
+        atexit.register(shutil.rmtree, data_dir, ignore_errors=True)
+        os.environ["HYDRA_RPC_DATA_DIR"] = data_dir
+
+    saved_argv = sys.argv
+    sys.argv = ["main.py", torrent_port, "", "", ""]
+    try:
+        import main
+    finally:
+        sys.argv = saved_argv
+
+    # Importing no longer builds the session; do it inline like the stdio loop
+    # does on its startup thread
+    if main.torrent_session is None:
+        main.run_startup(emit_events=False)
+
+    return main
+
+
+def percentile(values, fraction: float):
+    return sorted_percentile(sorted(values), fraction)
+
+
+def format_ms(seconds: float):
+    return "{value:.2f}ms".format(value=seconds * 1000)
+
+
+class ThreadCountSampler:
+    def __init__(self, interval_seconds: float = 0.001):
+        self.interval_seconds = interval_seconds
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(self.interval_seconds)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,372 @@
+import os
+import time
+
+import libtorrent as lt
+
+LOOPBACK_SETTINGS = {
+    "listen_interfaces": "127.0.0.1:0",
+    "enable_dht": False,
+    "enable_lsd": False,
+    "enable_upnp": False,
+    "enable_natpmp": False,
+    "allow_multiple_connections_per_ip": True,
+}
+
+
+def write_payload(root: str, name: str, file_sizes, chunk_size: int = 4 * 1024 * 1024):
+    """Write ``file_sizes`` bytes of random data under ``root/name`` and return its path."""
+    payload_dir = os.path.join(root, name)
+    for index, file_size in enumerate(file_sizes):
+        file_path = os.path.join(payload_dir, "{bucket:03d}".format(bucket=index // 1000), "file-{index}.bin".format(index=index))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        remaining = file_size
+        with open(file_path, "wb") as payload_file:
+            block = os.urandom(min(chunk_size, max(file_size, 1)))
+            while remaining > 0:
+                written = payload_file.write(block[:remaining])
+                remaining -= written
+
+    return payload_dir
+
+
+def create_torrent_file(payload_dir: str, piece_size: int = 0) -> bytes:
+    """Return the bencoded .torrent for ``payload_dir``, v2 piece layers included."""
+    files = lt.file_storage()
+    lt.add_files(files, payload_dir)
+
+    creator = lt.create_torrent(files, piece_size)
+    lt.set_piece_hashes(creator, os.path.dirname(payload_dir))
+    return lt.bencode(creator.generate())
+
+
+def create_torrent(payload_dir: str, piece_size: int = 0):
+    return lt.torrent_info(lt.bdecode(create_torrent_file(payload_dir, piece_size)))
+
+
+def create_session(extra_settings=None):
+    settings = dict(LOOPBACK_SETTINGS)
+    settings.update(extra_settings or {})
+    return lt.session(settings)
+
+
+class LoopbackSwarm:
+    """One or more local seeding sessions for a torrent, reachable on 127.0.0.1."""
+
+    def __init__(self, torrent_info, save_path: str, seeders: int = 1):
+        self.torrent_info = torrent_info
+        self.sessions = []
+        self.ports = []
+
+        for _ in range(max(1, seeders)):
+            session = create_session()
+            params = lt.add_torrent_params()
+            params.ti = torrent_info
+            params.save_path = save_path
+            params.flags = lt.torrent_flags.seed_mode
+            session.add_torrent(params)
+            self.sessions.append(session)
+
+        deadline = time.monotonic() + 10
+        for session in self.sessions:
+            while session.listen_port() == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.ports.append(session.listen_port())
+
+    def magnet(self) -> str:
+        peers = "".join("&x.pe=127.0.0.1:{port}".format(port=port) for port in self.ports)
+        return lt.make_magnet_uri(self.torrent_info) + peers
+
+    def connect(self, handle):
+        for port in self.ports:
+            handle.connect_peer(("127.0.0.1", port))
+
+    def close(self):
+        self.sessions.clear()
+
+
+def _serve_swarm(torrent_file: bytes, save_path: str, seeders: int, connection):
+    swarm = LoopbackSwarm(lt.torrent_info(lt.bdecode(torrent_file)), save_path, seeders)
+    connection.send(swarm.ports)
+    # Block until the parent closes its end of the pipe or asks us to stop
+    try:
+        connection.recv()
+    except EOFError:
+        pass
+    swarm.close()
+
+
+class SeederProcess:
+    """Runs a :class:`LoopbackSwarm` in a child process.
+
+    Keeps the seeders' CPU time and memory out of the measurements taken in
+    the benchmarking process.
+    """
+
+    def __init__(self, torrent_file: bytes, save_path: str, seeders: int = 1):
+        import multiprocessing
+
+        context = multiprocessing.get_context("spawn")
+        # The whole .torrent is shipped, not just the info dict: hybrid
+        # torrents keep their v2 piece layers outside of it
+        self.torrent_info = lt.torrent_info(lt.bdecode(torrent_file))
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_serve_swarm,
+            args=(torrent_file, save_path, seeders, child_connection),
+            daemon=True,
+        )
+        self.process.start()
+        self.ports = self.connection.recv()
+
+    def magnet(self) -> str:
+        peers = "".join("&x.pe=127.0.0.1:{port}".format(port=port) for port in self.ports)
+        return lt.make_magnet_uri(self.torrent_info) + peers
+
+    def connect(self, handle):
+        for port in self.ports:
+            handle.connect_peer(("127.0.0.1", port))
+
+    def close(self):
+        try:
+            self.connection.send("stop")
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class LocalTracker:
+    """Minimal HTTP tracker on 127.0.0.1 that hands every announce ``peers``.
+
+    ``delay_seconds`` holds each reply back, which makes a slow or
+    overloaded tracker; ``announces`` counts the requests it received.
+    """
+
+    def __init__(self, peers=(), delay_seconds: float = 0.0):
+        import http.server
+        import threading
+
+        tracker = self
+        self.peers = list(peers)
+        self.delay_seconds = delay_seconds
+        self.announces = 0
+        self.lock = threading.Lock()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                with tracker.lock:
+                    tracker.announces += 1
+                if tracker.delay_seconds:
+                    time.sleep(tracker.delay_seconds)
+
+                body = lt.bencode(
+                    {
+                        "interval": 1800,
+                        "peers": [{"ip": "127.0.0.1", "port": port} for port in tracker.peers],
+                    }
+                )
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{port}/announce".format(port=self.server.server_address[1])
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def closed_port_urls(count: int):
+    """Tracker URLs on 127.0.0.1 ports nobody listens on: dead trackers that fail fast."""
+    import socket
+
+    urls = []
+    for index in range(count):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        scheme = "udp" if index % 2 else "http"
+        urls.append("{scheme}://127.0.0.1:{port}/announce".format(scheme=scheme, port=port))
+    return urls
+
+
+# Every node of a local DHT swarm shares 127.0.0.1, which libtorrent's
+# per-IP limits would otherwise treat as a single abusive host
+DHT_LOOPBACK_SETTINGS = dict(
+    LOOPBACK_SETTINGS,
+    enable_dht=True,
+    dht_restrict_routing_ips=False,
+    dht_restrict_search_ips=False,
+    dht_enforce_node_id=False,
+    dht_ignore_dark_internet=False,
+    dht_prefer_verified_node_ids=False,
+    dht_block_ratelimit=1000000,
+    dht_upload_rate_limit=100 * 1024 * 1024,
+)
+
+
+class UdpDelayRelay:
+    """Forwards UDP datagrams to ``target`` and back, each ``delay_seconds`` late.
+
+    Every client gets its own upstream socket, so the target sees one
+    address per client, as it would without the relay.
+    """
+
+    def __init__(self, target, delay_seconds: float):
+        import socket
+        import threading
+
+        self.target = target
+        self.delay_seconds = delay_seconds
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.port = self.socket.getsockname()[1]
+        self.upstreams = {}
+        self.lock = threading.Lock()
+        self.closed = False
+        threading.Thread(target=self._serve_downstream, daemon=True).start()
+
+    def _later(self, send, *args):
+        import threading
+
+        timer = threading.Timer(self.delay_seconds, self._send_quietly, (send,) + args)
+        timer.daemon = True
+        timer.start()
+
+    def _send_quietly(self, send, *args):
+        try:
+            send(*args)
+        except OSError:
+            pass
+
+    def _serve_downstream(self):
+        while not self.closed:
+            try:
+                data, client = self.socket.recvfrom(65536)
+            except OSError:
+                return
+            self._later(self._upstream_for(client).sendto, data, self.target)
+
+    def _upstream_for(self, client):
+        import socket
+        import threading
+
+        with self.lock:
+            upstream = self.upstreams.get(client)
+            if upstream is None:
+                upstream = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                upstream.bind(("127.0.0.1", 0))
+                self.upstreams[client] = upstream
+                threading.Thread(
+                    target=self._serve_upstream, args=(upstream, client), daemon=True
+                ).start()
+            return upstream
+
+    def _serve_upstream(self, upstream, client):
+        while not self.closed:
+            try:
+                data, _ = upstream.recvfrom(65536)
+            except OSError:
+                return
+            self._later(self.socket.sendto, data, client)
+
+    def close(self):
+        self.closed = True
+        self.socket.close()
+        with self.lock:
+            for upstream in self.upstreams.values():
+                upstream.close()
+
+
+def _create_dht_node(bootstrap: str):
+    settings = dict(DHT_LOOPBACK_SETTINGS, dht_bootstrap_nodes=bootstrap)
+    session = lt.session(settings)
+    deadline = time.monotonic() + 10
+    while session.listen_port() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return session
+
+
+def _serve_dht_swarm(torrent_file: bytes, save_path: str, nodes: int, router_delay_seconds: float, connection):
+    import random
+
+    router = _create_dht_node("")
+    bootstrap = "127.0.0.1:{port}".format(port=router.listen_port())
+    sessions = [router] + [_create_dht_node(bootstrap) for _ in range(max(nodes, 1))]
+
+    # Routers are never added to routing tables, so introduce the nodes
+    # to each other directly
+    ports = [session.listen_port() for session in sessions]
+    rng = random.Random(0)
+    for session in sessions:
+        for port in rng.sample(ports, min(8, len(ports))):
+            session.add_dht_node(("127.0.0.1", port))
+
+    params = lt.add_torrent_params()
+    params.ti = lt.torrent_info(lt.bdecode(torrent_file))
+    params.save_path = save_path
+    params.flags = lt.torrent_flags.seed_mode
+    seeder = sessions[rng.randrange(1, len(sessions))]
+    seeder.add_torrent(params)
+
+    relay = UdpDelayRelay(("127.0.0.1", router.listen_port()), router_delay_seconds)
+    connection.send(relay.port)
+    try:
+        connection.recv()
+    except EOFError:
+        pass
+    relay.close()
+    del sessions, seeder, router
+
+
+class DhtSwarmProcess:
+    """A local DHT of ``nodes`` sessions, one seeding the torrent, in a child process.
+
+    New sessions bootstrap from ``router``, a DHT node reached through a
+    :class:`UdpDelayRelay` that holds every packet back by
+    ``router_delay_seconds``: a stand-in for the distant, rate-limited
+    public bootstrap routers. Nodes of the swarm answer at loopback speed.
+    """
+
+    def __init__(self, torrent_file: bytes, save_path: str, nodes: int = 40, router_delay_seconds: float = 0.0):
+        import multiprocessing
+
+        context = multiprocessing.get_context("spawn")
+        self.torrent_info = lt.torrent_info(lt.bdecode(torrent_file))
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_serve_dht_swarm,
+            args=(torrent_file, save_path, nodes, router_delay_seconds, child_connection),
+            daemon=True,
+        )
+        self.process.start()
+        self.router = "127.0.0.1:{port}".format(port=self.connection.recv())
+
+    def magnet(self) -> str:
+        """The torrent's magnet without trackers or peers: only the DHT can resolve it."""
+        return "magnet:?xt=urn:btih:{info_hash}".format(info_hash=self.torrent_info.info_hashes().v1)
+
+    def close(self):
+        try:
+            self.connection.send("stop")
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
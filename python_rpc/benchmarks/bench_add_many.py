@@ -0,0 +1,77 @@
+"""Re-enable seeding for a library one game at a time versus ``add_many``.
+
+Usage:
+    python python_rpc/benchmarks/bench_add_many.py [--games 300]
+
+Runs in-process against a real session. ``single`` issues one
+``action resume_seeding`` per game, like the Electron side does today;
+``bulk`` sends every game in one ``action add_many``. The magnets are
+synthetic, so this measures the add path (params, tracker merge, session
+round trips), not peer discovery. Each mode gets a fresh set of hashes.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from _common import format_ms, load_rpc_main
+
+
+def build_games(count: int, save_path: str, prefix: str):
+    return [
+        {
+            "game_id": "{prefix}-{index}".format(prefix=prefix, index=index),
+            "url": "magnet:?xt=urn:btih:{hash}".format(hash=os.urandom(20).hex()),
+            "save_path": save_path,
+        }
+        for index in range(count)
+    ]
+
+
+def cancel_all(main, games):
+    for game in games:
+        main.action({"action": "pause_seeding", "game_id": game["game_id"]})
+
+
+def run_single(main, games):
+    started = time.perf_counter()
+    for game in games:
+        main.action({"action": "resume_seeding", **game})
+    return time.perf_counter() - started, len(games)
+
+
+def run_bulk(main, games):
+    started = time.perf_counter()
+    response = main.action({"action": "add_many", "items": games})
+    elapsed = time.perf_counter() - started
+    return elapsed, sum(1 for result in response["results"] if result["ok"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ["HYDRA_RPC_DATA_DIR"] = os.path.join(work_dir, "rpc-data")
+        rpc_main = load_rpc_main()
+        save_path = os.path.join(work_dir, "games")
+
+        for mode, runner in (("single", run_single), ("bulk", run_bulk)):
+            games = build_games(args.games, save_path, mode)
+            elapsed, added = runner(rpc_main, games)
+            print(
+                "{mode:<7} games={games} added={added} total={total} per_game={per_game}".format(
+                    mode=mode,
+                    games=args.games,
+                    added=added,
+                    total=format_ms(elapsed),
+                    per_game=format_ms(elapsed / max(args.games, 1)),
+                )
+            )
+            cancel_all(rpc_main, games)
+
+
+if __name__ == "__main__":
+    main()
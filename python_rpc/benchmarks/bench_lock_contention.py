@@ -0,0 +1,151 @@
+"""Tail latency of status calls while other games start and cancel.
+
+Usage:
+    python python_rpc/benchmarks/bench_lock_contention.py [--seconds 10] [--seeds 200]
+
+Runs in-process against a real session with ``--seeds`` synthetic seeds
+registered. ``--starters`` threads loop ``action start`` / ``action
+cancel`` on fresh games, ``--probes`` threads loop ``torrent_files`` on
+magnets nobody seeds (each waits ``--probe-timeout-ms`` for metadata) and
+``--readers`` threads loop ``status`` and ``seed_status``. Calls go
+through the RPC dispatcher but not the worker lanes, so the numbers show
+lock contention rather than queueing. Reports p50/p99/p99.9/max per method.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from _common import format_ms, load_rpc_main, percentile
+from _swarm import LOOPBACK_SETTINGS
+
+METHOD_ORDER = ("status", "seed_status", "start", "cancel", "torrent_files")
+
+
+def random_magnet():
+    return "magnet:?xt=urn:btih:{hash}".format(hash=os.urandom(20).hex())
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def call(self, main, method, params=None, label=None):
+        started = time.perf_counter()
+        response = main.execute_request({"id": 1, "method": method, "params": params or {}})
+        elapsed = time.perf_counter() - started
+
+        label = label or method
+        with self.lock:
+            self.latencies.setdefault(label, []).append(elapsed)
+            if "error" in response:
+                code = response["error"]["code"]
+                errors = self.errors.setdefault(label, {})
+                errors[code] = errors.get(code, 0) + 1
+
+
+def starter(main, recorder, stop, save_path, index):
+    iteration = 0
+    while not stop.is_set():
+        game_id = "contention-{index}-{iteration}".format(index=index, iteration=iteration)
+        iteration += 1
+        recorder.call(
+            main,
+            "action",
+            {
+                "action": "start",
+                "game_id": game_id,
+                "url": random_magnet(),
+                "save_path": save_path,
+                "enqueue": True,
+            },
+            label="start",
+        )
+        recorder.call(main, "action", {"action": "cancel", "game_id": game_id}, label="cancel")
+
+
+def prober(main, recorder, stop, timeout_ms):
+    while not stop.is_set():
+        recorder.call(main, "torrent_files", {"magnet": random_magnet(), "timeout_ms": timeout_ms})
+
+
+def reader(main, recorder, stop):
+    while not stop.is_set():
+        recorder.call(main, "status")
+        recorder.call(main, "seed_status")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seeds", type=int, default=200)
+    parser.add_argument("--starters", type=int, default=4)
+    parser.add_argument("--probes", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--probe-timeout-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ["HYDRA_RPC_DATA_DIR"] = os.path.join(work_dir, "rpc-data")
+        rpc_main = load_rpc_main()
+        rpc_main.torrent_session.apply_settings(
+            {key: value for key, value in LOOPBACK_SETTINGS.items() if key != "listen_interfaces"}
+        )
+        save_path = os.path.join(work_dir, "games")
+
+        for index in range(args.seeds):
+            rpc_main.action(
+                {
+                    "action": "resume_seeding",
+                    "game_id": "seed-{index}".format(index=index),
+                    "url": random_magnet(),
+                    "save_path": save_path,
+                }
+            )
+
+        recorder = Recorder()
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=starter, args=(rpc_main, recorder, stop, save_path, index))
+            for index in range(args.starters)
+        ]
+        threads.extend(
+            threading.Thread(target=prober, args=(rpc_main, recorder, stop, args.probe_timeout_ms))
+            for _ in range(args.probes)
+        )
+        threads.extend(
+            threading.Thread(target=reader, args=(rpc_main, recorder, stop))
+            for _ in range(args.readers)
+        )
+
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    for method in METHOD_ORDER:
+        latencies = recorder.latencies.get(method)
+        if not latencies:
+            continue
+
+        print(
+            "{method:<14} calls={calls:<6} p50={p50} p99={p99} p99.9={p999} max={max} errors={errors}".format(
+                method=method,
+                calls=len(latencies),
+                p50=format_ms(percentile(latencies, 0.5)),
+                p99=format_ms(percentile(latencies, 0.99)),
+                p999=format_ms(percentile(latencies, 0.999)),
+                max=format_ms(max(latencies)),
+                errors=recorder.errors.get(method, {}),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""End-to-end downloader benchmark against seeders on 127.0.0.1.
+
+Usage:
+    python python_rpc/benchmarks/bench_loopback_swarm.py --shape large
+    python python_rpc/benchmarks/bench_loopback_swarm.py --shape tiny --files 100000
+
+Builds a synthetic torrent, seeds it from local libtorrent sessions running
+in a child process and drives ``torrent_files`` and ``action start`` through
+``main.handle_request``. Reports time-to-metadata, time-to-first-byte,
+sustained MB/s, CPU time and RSS of the RPC process. Runs fully offline
+(DHT, LSD, UPnP and NAT-PMP are disabled); Linux only.
+
+Time-to-metadata is the ut_metadata exchange with the loopback peers named
+in the magnet, with no peer discovery, so it is a floor rather than what a
+real swarm takes. First byte and completion are read from the torrent
+handle; the ``status`` RPC serves alert-pump snapshots refreshed every
+0.5 s, so the time it first reports bytes is printed separately. The start
+promotes the warm probe left by ``torrent_files``, and leaving upload mode
+takes libtorrent a few hundred milliseconds before pieces flow.
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import libtorrent as lt
+
+from _common import format_ms, load_rpc_main
+from _swarm import LOOPBACK_SETTINGS, SeederProcess, create_torrent_file, write_payload
+
+SHAPES = {
+    # name: (file count, total size in MiB)
+    "large": (4, 1024),
+    "tiny": (100000, 200),
+    "mixed": (500, 512),
+}
+
+
+def read_rss_bytes():
+    with open("/proc/self/statm", "r") as statm:
+        resident_pages = int(statm.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+class RpcClient:
+    def __init__(self, main):
+        self.main = main
+        self.responses = {}
+        self.next_id = 1
+        main.write_response = self._capture
+
+    def _capture(self, payload):
+        self.responses[payload.get("id")] = payload
+
+    def call(self, method, params=None):
+        request_id = self.next_id
+        self.next_id += 1
+        self.main.handle_request({"id": request_id, "method": method, "params": params or {}})
+        response = self.responses.pop(request_id)
+        if "error" in response:
+            raise RuntimeError(response["error"]["code"])
+        return response["result"]
+
+
+def run(args, work_dir):
+    file_count, total_mb = SHAPES.get(args.shape, (args.files, args.size_mb))
+    if args.files:
+        file_count = args.files
+    if args.size_mb:
+        total_mb = args.size_mb
+
+    file_size = max(total_mb * 1024 * 1024 // file_count, 1)
+    seed_dir = os.path.join(work_dir, "seed")
+
+    started = time.perf_counter()
+    payload_dir = write_payload(seed_dir, "payload", [file_size] * file_count)
+    torrent_file = create_torrent_file(payload_dir)
+    torrent_info = lt.torrent_info(lt.bdecode(torrent_file))
+    files_storage = torrent_info.layout()
+    # Hybrid torrents align files with pad files nobody asked for
+    real_indices = [
+        index
+        for index in range(files_storage.num_files())
+        if not files_storage.file_flags(index) & lt.file_storage.flag_pad_file
+    ]
+    payload_size = sum(files_storage.file_size(index) for index in real_indices)
+    print(
+        "prepared {files} files, {size:.1f} MiB in {elapsed:.1f}s".format(
+            files=len(real_indices),
+            size=payload_size / (1024 * 1024),
+            elapsed=time.perf_counter() - started,
+        )
+    )
+
+    seeders = SeederProcess(torrent_file, seed_dir, seeders=args.seeders)
+    # A reused --work-dir would otherwise serve the metadata from the store
+    rpc_data_dir = os.path.join(work_dir, "rpc-data")
+    shutil.rmtree(rpc_data_dir, ignore_errors=True)
+    os.environ["HYDRA_RPC_DATA_DIR"] = rpc_data_dir
+    main = load_rpc_main()
+    main.torrent_session.apply_settings(
+        {key: value for key, value in LOOPBACK_SETTINGS.items() if key != "listen_interfaces"}
+    )
+    client = RpcClient(main)
+
+    rss_before = read_rss_bytes()
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+
+    files_payload = client.call(
+        "torrent_files", {"magnet": seeders.magnet(), "timeout_ms": int(args.timeout * 1000)}
+    )
+    time_to_metadata = time.perf_counter() - started
+
+    file_indices = None
+    if args.selective:
+        file_indices = real_indices[::2]
+
+    client.call(
+        "action",
+        {
+            "action": "start",
+            "game_id": "bench",
+            "url": seeders.magnet(),
+            "save_path": os.path.join(work_dir, "download"),
+            "file_indices": file_indices,
+        },
+    )
+
+    downloader = main.downloads["bench"]
+    seeders.connect(downloader.torrent_handle)
+
+    first_byte_at = None
+    first_reported_at = None
+    finished_at = None
+    cpu_used = None
+    downloaded = 0
+    peak_rss = read_rss_bytes()
+    deadline = started + args.timeout
+
+    while time.perf_counter() < deadline:
+        # Polled like the app does, for the CPU and RSS figures
+        rpc_status = client.call("status")
+        handle_status = downloader.torrent_handle.status(flags=0)
+        now = time.perf_counter()
+        peak_rss = max(peak_rss, read_rss_bytes())
+        downloaded = handle_status.total_wanted_done
+
+        if first_reported_at is None and rpc_status and rpc_status["bytesDownloaded"] > 0:
+            first_reported_at = now
+
+        if first_byte_at is None and downloaded > 0:
+            first_byte_at = now
+
+        if finished_at is None and downloaded >= handle_status.total_wanted:
+            finished_at = now
+            cpu_used = cpu_seconds() - cpu_before
+
+        # A short transfer can finish before the lagging status RPC shows a
+        # byte; keep polling it so its first-byte time is still measured
+        if finished_at is not None and first_reported_at is not None:
+            break
+
+        time.sleep(args.poll_interval)
+
+    if cpu_used is None:
+        cpu_used = cpu_seconds() - cpu_before
+    client.call("action", {"action": "cancel", "game_id": "bench"})
+    seeders.close()
+
+    transfer_seconds = (finished_at or time.perf_counter()) - (first_byte_at or started)
+
+    print(
+        "files in torrent    {count} ({pad} pad files not counted)".format(
+            count=len(real_indices), pad=len(files_payload["files"]) - len(real_indices)
+        )
+    )
+    print("time to metadata    {value}".format(value=format_ms(time_to_metadata)))
+    print(
+        "time to first byte  {value}".format(
+            value=format_ms(first_byte_at - started) if first_byte_at else "n/a"
+        )
+    )
+    print(
+        "first byte (status) {value}".format(
+            value=format_ms(first_reported_at - started) if first_reported_at else "n/a"
+        )
+    )
+    print(
+        "completed           {value}".format(
+            value=format_ms(finished_at - started) if finished_at else "timeout"
+        )
+    )
+    print(
+        "sustained rate      {value:.1f} MB/s ({bytes} bytes)".format(
+            value=downloaded / transfer_seconds / (1024 * 1024) if transfer_seconds > 0 else 0,
+            bytes=downloaded,
+        )
+    )
+    print(
+        "cpu time            {value:.2f}s ({share:.0f}% of wall)".format(
+            value=cpu_used,
+            share=100 * cpu_used / max((finished_at or time.perf_counter()) - started, 1e-9),
+        )
+    )
+    print(
+        "rss                 start={start:.1f} MiB peak={peak:.1f} MiB".format(
+            start=rss_before / (1024 * 1024), peak=peak_rss / (1024 * 1024)
+        )
+    )
+
+    return finished_at is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", choices=sorted(SHAPES) + ["custom"], default="large")
+    parser.add_argument("--files", type=int, default=0, help="Override the shape's file count")
+    parser.add_argument("--size-mb", type=int, default=0, help="Override the shape's total size")
+    parser.add_argument("--seeders", type=int, default=2)
+    parser.add_argument("--selective", action="store_true", help="Download every other file")
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--work-dir", help="Directory for payload and downloads (default: temp)")
+    args = parser.parse_args()
+
+    if args.shape == "custom" and not (args.files and args.size_mb):
+        parser.error("--shape custom needs --files and --size-mb")
+
+    if args.work_dir:
+        os.makedirs(args.work_dir, exist_ok=True)
+        ok = run(args, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            ok = run(args, work_dir)
+
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
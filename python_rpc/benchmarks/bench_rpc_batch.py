@@ -0,0 +1,147 @@
+"""Round trips of single calls versus one batch frame over real stdio.
+
+Usage:
+    python python_rpc/benchmarks/bench_rpc_batch.py [--ticks 500] [--lookups 4]
+
+Starts ``main.py`` as a child process with an RPC password, like the
+Electron side does, and replays UI refresh ticks. Each tick asks for
+``status``, ``seed_status`` and ``--lookups`` ``torrent_files`` calls
+(for a malformed magnet, so only the RPC overhead is measured).
+``single`` pipelines the calls one frame each and waits for every response;
+``batch`` sends them as one array frame. Reports per-tick latency and the
+child's CPU time. Timing starts once ``startup_status`` reports the
+``ready`` stage; pushed ``event`` frames are skipped.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import RPC_DIR, format_ms, percentile
+
+RPC_PASSWORD = "bench-password"
+
+
+def build_tick(tick: int, lookups: int):
+    calls = [
+        {"method": "status", "params": {}},
+        {"method": "seed_status", "params": {}},
+    ]
+    calls.extend(
+        {
+            "method": "torrent_files",
+            "params": {"magnet": "magnet:?xt=urn:btih:{index}".format(index=index)},
+        }
+        for index in range(lookups)
+    )
+    for index, call in enumerate(calls):
+        call["id"] = tick * 1000 + index
+        call["rpc_password"] = RPC_PASSWORD
+    return calls
+
+
+def read_reply(stdout):
+    """Return the next frame that is not a pushed event."""
+    while True:
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError("RPC process closed stdout")
+
+        reply = json.loads(line)
+        if not (isinstance(reply, dict) and "event" in reply):
+            return reply
+
+
+def wait_until_ready(process, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        call = {"id": 0, "method": "startup_status", "params": {}, "rpc_password": RPC_PASSWORD}
+        process.stdin.write(json.dumps(call).encode("ascii") + b"\n")
+        process.stdin.flush()
+        stage = read_reply(process.stdout)["result"]["stage"]
+        if stage == "ready":
+            return
+        if stage == "failed":
+            raise RuntimeError("RPC startup failed")
+        time.sleep(0.05)
+
+    raise RuntimeError("RPC did not become ready")
+
+
+def child_cpu_seconds(pid: int):
+    try:
+        with open("/proc/{pid}/stat".format(pid=pid), "r", encoding="ascii") as stat_file:
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def run(mode: str, ticks: int, lookups: int):
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, HYDRA_RPC_DATA_DIR=data_dir)
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(RPC_DIR, "main.py"), "0", RPC_PASSWORD, "", ""],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+        try:
+            wait_until_ready(process)
+            cpu_before = child_cpu_seconds(process.pid)
+
+            latencies = []
+            for tick in range(ticks):
+                calls = build_tick(tick, lookups)
+                started = time.perf_counter()
+                if mode == "batch":
+                    process.stdin.write(json.dumps(calls).encode("ascii") + b"\n")
+                    process.stdin.flush()
+                    responses = read_reply(process.stdout)
+                else:
+                    process.stdin.write(
+                        b"".join(json.dumps(call).encode("ascii") + b"\n" for call in calls)
+                    )
+                    process.stdin.flush()
+                    responses = [read_reply(process.stdout) for _ in calls]
+                latencies.append(time.perf_counter() - started)
+
+                if len(responses) != len(calls):
+                    raise RuntimeError("Expected {count} responses".format(count=len(calls)))
+
+            cpu_after = child_cpu_seconds(process.pid)
+        finally:
+            process.stdin.close()
+            process.wait(timeout=30)
+
+    cpu = "n/a" if cpu_before is None else "{value:.3f}s".format(value=cpu_after - cpu_before)
+    print(
+        "{mode:<7} ticks={ticks} calls/tick={calls} p50={p50} p99={p99} child_cpu={cpu}".format(
+            mode=mode,
+            ticks=ticks,
+            calls=lookups + 2,
+            p50=format_ms(percentile(latencies, 0.5)),
+            p99=format_ms(percentile(latencies, 0.99)),
+            cpu=cpu,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=4, help="torrent_files calls per tick")
+    args = parser.parse_args()
+
+    for mode in ("single", "batch"):
+        run(mode, args.ticks, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
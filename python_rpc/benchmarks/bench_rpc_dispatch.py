@@ -0,0 +1,152 @@
+"""Replay an RPC request stream through ``main.handle_request``.
+
+Usage:
+    python python_rpc/benchmarks/bench_rpc_dispatch.py [--stream requests.jsonl]
+
+Without ``--stream`` a synthetic burst of status polls mixed with slow
+``torrent_files`` calls is replayed. Reports p50/p99 latency and the peak
+thread count for both the legacy thread-per-request dispatch and the
+lane executor. The RPC's state files go to a temporary data directory.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from _common import ThreadCountSampler, format_ms, load_rpc_main, percentile
+
+
+def load_stream(path):
+    with open(path, "r", encoding="utf-8") as stream_file:
+        return [json.loads(line) for line in stream_file if line.strip()]
+
+
+def build_synthetic_stream(count: int):
+    requests = []
+    for request_id in range(1, count + 1):
+        if request_id % 20 == 0:
+            method = "torrent_files"
+            params = {"magnet": "magnet:?xt=urn:btih:" + "a" * 40}
+        elif request_id % 2 == 0:
+            method = "seed_status"
+            params = {}
+        else:
+            method = "status"
+            params = {}
+
+        requests.append({"id": request_id, "method": method, "params": params})
+
+    return requests
+
+
+def replay(main, requests, mode: str, interval_seconds: float):
+    submitted_at = {}
+    latencies = []
+    finished = threading.Event()
+    expected = len(requests)
+    lock = threading.Lock()
+
+    def record_response(payload):
+        request_id = payload.get("id")
+        with lock:
+            started = submitted_at.pop(request_id, None)
+            if started is not None:
+                latencies.append(time.perf_counter() - started)
+            if len(latencies) + busy[0] >= expected:
+                finished.set()
+
+    busy = [0]
+    original_write_response = main.write_response
+
+    def write_response(payload):
+        error = payload.get("error")
+        if error and error.get("code") == "busy":
+            with lock:
+                submitted_at.pop(payload.get("id"), None)
+                busy[0] += 1
+                if len(latencies) + busy[0] >= expected:
+                    finished.set()
+            return
+
+        record_response(payload)
+
+    main.write_response = write_response
+    try:
+        with ThreadCountSampler() as sampler:
+            started_at = time.perf_counter()
+            for request in requests:
+                submitted_at[request["id"]] = time.perf_counter()
+                if mode == "threads":
+                    threading.Thread(
+                        target=main.handle_request, args=(request,), daemon=True
+                    ).start()
+                else:
+                    main.submit_request(request)
+
+                if interval_seconds > 0:
+                    time.sleep(interval_seconds)
+
+            finished.wait(timeout=120)
+            elapsed = time.perf_counter() - started_at
+    finally:
+        main.write_response = original_write_response
+
+    return {
+        "mode": mode,
+        "requests": expected,
+        "busy": busy[0],
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+        "elapsed": elapsed,
+        "peak_threads": sampler.peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stream", help="JSONL file with one RPC request per line")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument(
+        "--slow-ms",
+        type=float,
+        default=50.0,
+        help="Simulated latency of torrent_files lookups",
+    )
+    parser.add_argument(
+        "--interval-ms",
+        type=float,
+        default=0.2,
+        help="Delay between submitted requests (0 replays as one burst)",
+    )
+    args = parser.parse_args()
+
+    rpc_main = load_rpc_main()
+    requests = load_stream(args.stream) if args.stream else build_synthetic_stream(args.count)
+
+    slow_seconds = args.slow_ms / 1000
+
+    def slow_torrent_files(data=None):
+        time.sleep(slow_seconds)
+        return None
+
+    rpc_main.torrent_files = slow_torrent_files
+
+    for mode in ("threads", "executor"):
+        result = replay(rpc_main, requests, mode, args.interval_ms / 1000)
+        print(
+            "{mode:<9} requests={requests} busy={busy} p50={p50} p99={p99} "
+            "elapsed={elapsed} peak_threads={peak_threads}".format(
+                mode=result["mode"],
+                requests=result["requests"],
+                busy=result["busy"],
+                p50=format_ms(result["p50"]),
+                p99=format_ms(result["p99"]),
+                elapsed=format_ms(result["elapsed"]),
+                peak_threads=result["peak_threads"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
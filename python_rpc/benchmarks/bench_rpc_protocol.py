@@ -0,0 +1,119 @@
+"""Throughput of the stdio protocol framings and codecs.
+
+Usage:
+    python python_rpc/benchmarks/bench_rpc_protocol.py [--rounds 20]
+
+Encodes representative frames (a 100k-file ``torrent_files`` payload, a
+500-entry ``seed_status`` result and a small ``status`` reply) with every
+available protocol/codec pair, writes them to an in-memory pipe and reads
+and decodes them back the way the RPC loop does. Codecs whose module is not
+installed (msgpack, cbor2) are skipped.
+"""
+
+import argparse
+import io
+import sys
+import time
+
+from _common import RPC_DIR, format_ms
+
+sys.path.insert(0, RPC_DIR)
+
+from rpc_protocol import (  # noqa: E402
+    FRAMED_PROTOCOL_VERSION,
+    LINE_PROTOCOL_VERSION,
+    available_codecs,
+    create_protocol,
+)
+
+
+def status_entry(index: int):
+    return {
+        "gameId": "game-{index}".format(index=index),
+        "folderName": "Some Game Repack {index}".format(index=index),
+        "fileSize": 40 * 1024 * 1024 * 1024 + index,
+        "progress": 1.0,
+        "downloadSpeed": 0,
+        "uploadSpeed": (index * 7919) % (4 * 1024 * 1024),
+        "numPeers": index % 17,
+        "numSeeds": index % 5,
+        "status": 5,
+        "bytesDownloaded": 40 * 1024 * 1024 * 1024 + index,
+    }
+
+
+def build_payloads():
+    files = [
+        {
+            "index": index,
+            "path": "Game/data/pack-{group:03d}/asset-{index:06d}.bin".format(
+                group=index // 2000, index=index
+            ),
+            "length": 1024 + (index * 7919) % (512 * 1024),
+        }
+        for index in range(100000)
+    ]
+    return {
+        "torrent_files": {
+            "id": 1,
+            "result": {"infoHash": "0" * 40, "name": "Game", "totalSize": 1, "files": files},
+        },
+        "seed_status": {"id": 2, "result": [status_entry(index) for index in range(500)]},
+        "status": {"id": 3, "result": status_entry(0)},
+    }
+
+
+def measure(protocol, payload, rounds: int):
+    encode_seconds = 0.0
+    decode_seconds = 0.0
+    frame_bytes = 0
+
+    for _ in range(rounds):
+        started = time.perf_counter()
+        frame = protocol.encode_frame(payload)
+        encode_seconds += time.perf_counter() - started
+
+        stream = io.BytesIO(frame)
+        started = time.perf_counter()
+        protocol.decode(protocol.read_frame(stream))
+        decode_seconds += time.perf_counter() - started
+        frame_bytes = len(frame)
+
+    return encode_seconds / rounds, decode_seconds / rounds, frame_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    protocols = [("v1 json lines", create_protocol(LINE_PROTOCOL_VERSION))]
+    for codec_name in available_codecs():
+        protocols.append(
+            (
+                "v2 {codec}".format(codec=codec_name),
+                create_protocol(FRAMED_PROTOCOL_VERSION, codec_name),
+            )
+        )
+
+    for payload_name, payload in payloads.items():
+        rounds = args.rounds if payload_name == "torrent_files" else args.rounds * 50
+        print(payload_name)
+        for label, protocol in protocols:
+            encode_seconds, decode_seconds, frame_bytes = measure(protocol, payload, rounds)
+            total = encode_seconds + decode_seconds
+            print(
+                "  {label:<16} encode={encode} decode={decode} bytes={size} "
+                "throughput={rate:.1f} MB/s".format(
+                    label=label,
+                    encode=format_ms(encode_seconds),
+                    decode=format_ms(decode_seconds),
+                    size=frame_bytes,
+                    rate=frame_bytes / total / (1024 * 1024) if total > 0 else 0,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare per-downloader seed status polling with the batched ``seed_status``.
+
+Usage:
+    python python_rpc/benchmarks/bench_seed_status.py [--torrents 500]
+
+Adds N synthetic torrents in seed mode to the RPC session (no payload is
+read from disk) and times both ways of building the seeding payload.
+``legacy`` replays the old per-poll ``status()`` and ``torrent_file()``
+calls on every downloader.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import libtorrent as lt
+
+from _common import format_ms, load_rpc_main, percentile
+
+
+def build_synthetic_torrent(index: int, save_path: str, piece_size: int = 16384):
+    file_path = os.path.join("game-{index}".format(index=index), "data.bin")
+    file_size = piece_size * 4
+
+    # Seed mode still expects the files to exist with the right size
+    os.makedirs(os.path.join(save_path, os.path.dirname(file_path)), exist_ok=True)
+    with open(os.path.join(save_path, file_path), "wb") as payload_file:
+        payload_file.truncate(file_size)
+
+    files = lt.file_storage()
+    files.add_file(file_path, file_size)
+
+    creator = lt.create_torrent(files, piece_size)
+    for piece_index in range(files.num_pieces()):
+        creator.set_hash(piece_index, os.urandom(20))
+
+    return lt.torrent_info(creator.generate())
+
+
+def add_synthetic_seeds(main, count: int, save_path: str):
+    for index in range(count):
+        params = lt.add_torrent_params()
+        params.ti = build_synthetic_torrent(index, save_path)
+        params.save_path = save_path
+        # update_subscribe keeps the torrent in the alert pump's state updates,
+        # like every torrent added through TorrentDownloader
+        params.flags = (
+            lt.torrent_flags.seed_mode
+            | lt.torrent_flags.upload_mode
+            | lt.torrent_flags.update_subscribe
+        )
+
+        downloader = main.TorrentDownloader(
+            main.torrent_session,
+            params.flags,
+            alert_pump=main.alert_pump,
+        )
+        downloader.torrent_handle = main.torrent_session.add_torrent(params)
+        main.downloads.set("bench-{index}".format(index=index), downloader)
+
+
+def legacy_seed_status(main):
+    """The pre-batching path: a full ``status()`` and ``torrent_file()`` per downloader."""
+    seed_payload = []
+    for game_id, downloader in main.downloads.items():
+        handle = downloader.torrent_handle
+        if handle is None or not handle.is_valid():
+            continue
+
+        status = handle.status()
+        info = handle.torrent_file() if status.has_metadata else None
+        file_size = status.total_wanted or (info.total_size() if info else 0)
+        bytes_downloaded = status.total_wanted_done
+        progress = status.progress
+        if file_size > 0:
+            progress = min(max(bytes_downloaded / file_size, 0), 1)
+        response = {
+            "folderName": info.name() if info else "",
+            "fileSize": file_size,
+            "progress": progress,
+            "downloadSpeed": status.download_rate,
+            "uploadSpeed": status.upload_rate,
+            "numPeers": status.num_peers,
+            "numSeeds": status.num_seeds,
+            "status": status.state,
+            "bytesDownloaded": bytes_downloaded,
+        }
+        if response["status"] == 5:
+            seed_payload.append({"gameId": game_id, **response})
+
+    return seed_payload
+
+
+def measure(label, callback, rounds: int):
+    timings = []
+    payload = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        payload = callback()
+        timings.append(time.perf_counter() - started)
+
+    print(
+        "{label:<8} entries={entries} p50={p50} p99={p99}".format(
+            label=label,
+            entries=len(payload),
+            p50=format_ms(percentile(timings, 0.5)),
+            p99=format_ms(percentile(timings, 0.99)),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--torrents", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    rpc_main = load_rpc_main()
+
+    with tempfile.TemporaryDirectory() as save_path:
+        add_synthetic_seeds(rpc_main, args.torrents, save_path)
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if len(rpc_main.seed_status()) >= args.torrents:
+                break
+            time.sleep(0.1)
+
+        measure("legacy", lambda: legacy_seed_status(rpc_main), args.rounds)
+        measure("batched", rpc_main.seed_status, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure download throughput of each session settings profile over loopback.
+
+Usage:
+    python python_rpc/benchmarks/bench_session_profiles.py [--size-mb 256] [--files 4]
+
+For every profile a fresh downloader session with the profile applied pulls
+a synthetic torrent from local seeders on 127.0.0.1.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import libtorrent as lt
+
+from _common import RPC_DIR, percentile
+from _swarm import LoopbackSwarm, create_session, create_torrent, write_payload
+
+sys.path.insert(0, RPC_DIR)
+
+from session_profiles import SESSION_PROFILES, SessionProfileManager  # noqa: E402
+
+
+def download_once(profile: str, swarm: LoopbackSwarm, save_path: str, timeout_seconds: float):
+    session = create_session()
+    SessionProfileManager(session).apply(profile)
+
+    params = lt.add_torrent_params()
+    params.ti = swarm.torrent_info
+    params.save_path = save_path
+    handle = session.add_torrent(params)
+    swarm.connect(handle)
+
+    started_at = time.perf_counter()
+    deadline = started_at + timeout_seconds
+    while time.perf_counter() < deadline:
+        status = handle.status()
+        if status.is_seeding or status.is_finished:
+            break
+        time.sleep(0.05)
+
+    elapsed = time.perf_counter() - started_at
+    done = handle.status().total_wanted_done
+    session.remove_torrent(handle, lt.session.delete_files)
+    return elapsed, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--seeders", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--profiles", nargs="*", default=sorted(SESSION_PROFILES))
+    args = parser.parse_args()
+
+    file_size = args.size_mb * 1024 * 1024 // max(args.files, 1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        seed_dir = os.path.join(work_dir, "seed")
+        payload_dir = write_payload(seed_dir, "payload", [file_size] * args.files)
+        swarm = LoopbackSwarm(create_torrent(payload_dir), seed_dir, seeders=args.seeders)
+
+        # Profiles are interleaved per round so page cache warm-up and
+        # background noise do not favour whichever profile runs first
+        rates = {profile: [] for profile in args.profiles}
+        for _ in range(args.rounds):
+            for profile in args.profiles:
+                save_path = os.path.join(work_dir, "download-" + profile)
+                elapsed, done = download_once(profile, swarm, save_path, args.timeout)
+                rates[profile].append(done / elapsed / (1024 * 1024) if elapsed > 0 else 0)
+
+        for profile in args.profiles:
+            print(
+                "{profile:<16} median={median:.1f}MB/s best={best:.1f}MB/s rounds={rounds}".format(
+                    profile=profile,
+                    median=percentile(rates[profile], 0.5),
+                    best=max(rates[profile]),
+                    rounds=args.rounds,
+                )
+            )
+
+        swarm.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""First-metadata latency of a magnet with a cold DHT versus restored session state.
+
+Usage:
+    python python_rpc/benchmarks/bench_session_state.py [--rounds 5] [--nodes 40] [--router-delay-ms 500]
+
+Starts a local DHT swarm of ``--nodes`` nodes in a child process, one of
+them seeding a torrent. Each round builds a fresh session and adds the
+torrent by a magnet with no trackers or peers, so the metadata can only be
+found through the DHT, and times it until ``has_metadata``.
+
+``cold`` sessions know nothing but the bootstrap router, which answers
+through a relay adding ``--router-delay-ms`` to every packet, like the
+public routers a fresh install starts from. After each cold round the
+session is left running for ``--linger`` seconds and saved with
+``SessionStateStore``; ``warm`` sessions are built from that file, as
+``main.py`` does at startup. Runs fully offline; Linux only.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import libtorrent as lt
+
+from _common import RPC_DIR, format_ms, percentile
+from _swarm import DHT_LOOPBACK_SETTINGS, DhtSwarmProcess, create_torrent_file, write_payload
+
+if RPC_DIR not in sys.path:
+    sys.path.insert(0, RPC_DIR)
+
+from session_state import SessionStateStore  # noqa: E402
+
+
+def build_session(store, router, warm):
+    params = store.load() if warm else None
+    if params is None:
+        params = lt.session_params()
+        settings = dict(DHT_LOOPBACK_SETTINGS, dht_bootstrap_nodes=router)
+    else:
+        settings = params.settings
+
+    settings["listen_interfaces"] = DHT_LOOPBACK_SETTINGS["listen_interfaces"]
+    params.settings = settings
+    return lt.session(params)
+
+
+def run_round(state_path, swarm, save_path, warm, timeout, linger):
+    store = SessionStateStore(state_path, runtime_keys=("listen_interfaces",))
+    started = time.perf_counter()
+    session = build_session(store, swarm.router, warm)
+    params = lt.parse_magnet_uri(swarm.magnet())
+    params.save_path = save_path
+    # Only the metadata is wanted
+    params.flags |= lt.torrent_flags.upload_mode
+    handle = session.add_torrent(params)
+
+    elapsed = None
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        if handle.status(flags=0).has_metadata:
+            elapsed = time.perf_counter() - started
+            break
+        time.sleep(0.01)
+
+    if not warm:
+        time.sleep(linger)
+        store.start(session)
+        store.stop()
+
+    session.remove_torrent(handle, lt.session.delete_files)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--nodes", type=int, default=40)
+    parser.add_argument("--router-delay-ms", type=float, default=500)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--linger", type=float, default=3, help="seconds a cold session runs before saving")
+    parser.add_argument("--settle", type=float, default=5, help="seconds for the swarm to form")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        seed_dir = os.path.join(work_dir, "seed")
+        torrent_file = create_torrent_file(write_payload(seed_dir, "payload", [1024 * 1024]))
+        swarm = DhtSwarmProcess(
+            torrent_file, seed_dir, nodes=args.nodes, router_delay_seconds=args.router_delay_ms / 1000
+        )
+        time.sleep(args.settle)
+        state_path = os.path.join(work_dir, "session.state")
+
+        print(
+            "nodes={nodes} router_delay={delay}ms rounds={rounds}".format(
+                nodes=args.nodes, delay=args.router_delay_ms, rounds=args.rounds
+            )
+        )
+        try:
+            for mode in ("cold", "warm"):
+                results = []
+                for index in range(args.rounds):
+                    save_path = os.path.join(work_dir, "{mode}-{index}".format(mode=mode, index=index))
+                    results.append(
+                        run_round(state_path, swarm, save_path, mode == "warm", args.timeout, args.linger)
+                    )
+
+                found = [value for value in results if value is not None]
+                print(
+                    "{mode:<5} first_metadata_p50={p50} max={max} found={found}/{rounds}".format(
+                        mode=mode,
+                        p50=format_ms(percentile(found, 0.5)) if found else "none",
+                        max=format_ms(max(found)) if found else "none",
+                        found=len(found),
+                        rounds=args.rounds,
+                    )
+                )
+        finally:
+            swarm.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Time from spawning the RPC process to ready and to all seeds added.
+
+Usage:
+    python python_rpc/benchmarks/bench_startup.py [--seeds 0 100 500] [--runs 3]
+
+Starts ``main.py`` the way the Electron side does, passing ``--seeds``
+synthetic magnets as the initial seeding payload. For each run it records
+when the ``ready`` event arrives, when the first ``status`` call is
+answered (it waits for the session) and when the ``startup`` events report
+every seed added. Reports the median of ``--runs`` runs per seed count.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import RPC_DIR, format_ms, percentile
+
+RPC_PASSWORD = "bench-password"
+
+
+def build_seeds(count: int, save_path: str):
+    return [
+        {
+            "game_id": "seed-{index}".format(index=index),
+            "url": "magnet:?xt=urn:btih:{hash}".format(hash=os.urandom(20).hex()),
+            "save_path": save_path,
+        }
+        for index in range(count)
+    ]
+
+
+def run_once(seeds: int, timeout: float):
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, HYDRA_RPC_DATA_DIR=os.path.join(data_dir, "rpc-data"))
+        seeding_payload = json.dumps(build_seeds(seeds, os.path.join(data_dir, "games")))
+
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(RPC_DIR, "main.py"), "0", RPC_PASSWORD, "", seeding_payload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+        try:
+            ready = json.loads(process.stdout.readline())
+            if ready.get("event") != "ready":
+                raise RuntimeError("Expected the ready event, got {frame}".format(frame=ready))
+            ready_at = time.perf_counter()
+
+            request = {"id": 1, "method": "status", "params": {}, "rpc_password": RPC_PASSWORD}
+            process.stdin.write(json.dumps(request).encode("ascii") + b"\n")
+            process.stdin.flush()
+
+            answered_at = None
+            seeded_at = None
+            startup = None
+            deadline = started + timeout
+            while (answered_at is None or seeded_at is None) and time.perf_counter() < deadline:
+                line = process.stdout.readline()
+                if not line:
+                    break
+
+                frame = json.loads(line)
+                if frame.get("id") == 1:
+                    answered_at = time.perf_counter()
+                elif frame.get("event") == "startup":
+                    startup = frame
+                    if frame["stage"] in ("ready", "failed"):
+                        seeded_at = time.perf_counter()
+        finally:
+            process.stdin.close()
+            process.wait(timeout=30)
+
+    if seeded_at is None or startup["stage"] != "ready":
+        raise RuntimeError("Startup did not finish: {state}".format(state=startup))
+
+    return {
+        "ready": ready_at - started,
+        "firstAnswer": answered_at - started,
+        "seeded": seeded_at - started,
+        "sessionMs": startup["sessionMs"],
+        "seedsAdded": startup["seedsAdded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 100, 500])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    for seeds in args.seeds:
+        results = [run_once(seeds, args.timeout) for _ in range(args.runs)]
+        print(
+            "seeds={seeds:<5} ready={ready} first_answer={answer} all_seeds_added={seeded} "
+            "session={session}ms added={added}".format(
+                seeds=seeds,
+                ready=format_ms(percentile([result["ready"] for result in results], 0.5)),
+                answer=format_ms(percentile([result["firstAnswer"] for result in results], 0.5)),
+                seeded=format_ms(percentile([result["seeded"] for result in results], 0.5)),
+                session=int(percentile([result["sessionMs"] for result in results], 0.5)),
+                added=results[-1]["seedsAdded"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
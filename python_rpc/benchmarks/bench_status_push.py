@@ -0,0 +1,169 @@
+"""Compare polling ``seed_status`` with a pushed ``subscribe`` feed.
+
+Usage:
+    python python_rpc/benchmarks/bench_status_push.py [--torrents 300]
+
+Adds N idle synthetic seeds and, for the same wall time and rate, either
+polls ``seed_status`` through ``handle_request`` or subscribes to the
+``seed_status`` topic. Reports CPU time of the RPC process, frames written
+and bytes written to the (captured) pipe.
+
+A second, synthetic run feeds the subscription machinery entries whose
+upload speed keeps moving and compares whole-entry frames with delta
+frames. The RPC's state files go to a temporary data directory.
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from _common import RPC_DIR, load_rpc_main
+from bench_seed_status import add_synthetic_seeds
+
+sys.path.insert(0, RPC_DIR)
+
+from status_subscriptions import (  # noqa: E402
+    DEFAULT_STATUS_THRESHOLDS,
+    STATUS_FIELDS,
+    StatusSubscriptions,
+    _Subscription,
+)
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PipeCounter:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    def write(self, payload):
+        self.frames += 1
+        self.bytes += len(json.dumps(payload, ensure_ascii=True, separators=(",", ":"))) + 1
+
+
+def run_polling(rpc_main, counter, interval_seconds, duration_seconds):
+    request_id = 0
+    deadline = time.monotonic() + duration_seconds
+    while time.monotonic() < deadline:
+        request_id += 1
+        rpc_main.handle_request({"id": request_id, "method": "seed_status"})
+        time.sleep(interval_seconds)
+
+
+def run_push(rpc_main, counter, interval_seconds, duration_seconds):
+    rpc_main.handle_request(
+        {
+            "id": 1,
+            "method": "subscribe",
+            "params": {"topic": "seed_status", "interval_ms": int(interval_seconds * 1000)},
+        }
+    )
+    time.sleep(duration_seconds)
+    rpc_main.handle_request({"id": 2, "method": "unsubscribe"})
+
+
+def measure(label, runner, rpc_main, interval_seconds, duration_seconds):
+    counter = PipeCounter()
+    rpc_main.write_response = counter.write
+
+    cpu_before = cpu_seconds()
+    runner(rpc_main, counter, interval_seconds, duration_seconds)
+    cpu_used = cpu_seconds() - cpu_before
+
+    print(
+        "{label:<8} cpu={cpu:.3f}s frames={frames} bytes={size}".format(
+            label=label, cpu=cpu_used, frames=counter.frames, size=counter.bytes
+        )
+    )
+
+
+def measure_churn(entries: int, churn: float, ticks: int, delta: bool):
+    rows = [
+        {
+            "gameId": "game-{index}".format(index=index),
+            "folderName": "Some Game Repack {index}".format(index=index),
+            "fileSize": 40 * 1024 * 1024 * 1024,
+            "progress": 1.0,
+            "downloadSpeed": 0,
+            "uploadSpeed": 0,
+            "numPeers": 0,
+            "numSeeds": 0,
+            "status": 5,
+            "bytesDownloaded": 40 * 1024 * 1024 * 1024,
+        }
+        for index in range(entries)
+    ]
+    rng = random.Random(0)
+    counter = PipeCounter()
+    subscriptions = StatusSubscriptions(
+        {"seed_status": lambda: [dict(row) for row in rows]}, emit=counter.write
+    )
+
+    # Driven tick by tick instead of through the subscription thread
+    subscription = _Subscription(
+        "seed_status", 1.0, STATUS_FIELDS, dict(DEFAULT_STATUS_THRESHOLDS), delta=delta
+    )
+
+    cpu_before = cpu_seconds()
+    for tick in range(ticks):
+        for row in rng.sample(rows, int(entries * churn)):
+            row["uploadSpeed"] = rng.randrange(0, 4 * 1024 * 1024)
+            row["numPeers"] = rng.randrange(0, 20)
+
+        frame = subscriptions._collect(subscription, full=tick == 0)
+        if frame is not None:
+            counter.write(frame)
+    cpu_used = cpu_seconds() - cpu_before
+
+    print(
+        "{label:<8} cpu={cpu:.3f}s frames={frames} bytes={size}".format(
+            label="delta" if delta else "entries",
+            cpu=cpu_used,
+            frames=counter.frames,
+            size=counter.bytes,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--torrents", type=int, default=300)
+    parser.add_argument("--interval-ms", type=int, default=250)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--churn", type=float, default=0.1, help="Share of entries changing per tick")
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+
+    rpc_main = load_rpc_main()
+
+    with tempfile.TemporaryDirectory() as save_path:
+        add_synthetic_seeds(rpc_main, args.torrents, save_path)
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if len(rpc_main.pushed_seed_status()) >= args.torrents:
+                break
+            time.sleep(0.1)
+
+        # Let the freshly added torrents settle so both runs see idle seeds
+        time.sleep(2)
+
+        interval_seconds = args.interval_ms / 1000
+        measure("polling", run_polling, rpc_main, interval_seconds, args.seconds)
+        measure("push", run_push, rpc_main, interval_seconds, args.seconds)
+
+    print("synthetic churn: {share:.0%} of entries change per tick".format(share=args.churn))
+    measure_churn(args.torrents, args.churn, args.ticks, delta=False)
+    measure_churn(args.torrents, args.churn, args.ticks, delta=True)
+
+
+if __name__ == "__main__":
+    main()
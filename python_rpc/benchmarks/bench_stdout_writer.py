@@ -0,0 +1,156 @@
+"""Per-frame locked writes versus the coalescing stdout writer thread.
+
+Usage:
+    python python_rpc/benchmarks/bench_stdout_writer.py [--threads 16] [--frames 500]
+
+Several threads emit small ``status``-sized frames at a steady pace while
+one thread keeps emitting large ``torrent_files``-sized frames. The output is an ``os.pipe``
+drained by a reader thread, standing in for the Electron side of stdout.
+
+``locked`` is the previous ``write_response``: take the lock, write, flush.
+``writer`` hands frames to :class:`StdoutWriter`. For each mode the report
+shows how long callers were blocked, how long small frames took to reach the
+pipe, and how many write calls were made.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from _common import RPC_DIR, format_ms, percentile
+
+sys.path.insert(0, RPC_DIR)
+
+from stdout_writer import StdoutWriter  # noqa: E402
+
+
+class CountingStream:
+    def __init__(self, raw):
+        self.raw = raw
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+class LockedWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.RLock()
+        self.latencies = []
+
+    def put(self, frame: bytes, response: bool = False):
+        started = time.monotonic()
+        with self.lock:
+            self.stream.write(frame)
+            self.stream.flush()
+        if len(frame) < 64 * 1024:
+            self.latencies.append(time.monotonic() - started)
+
+    def flush(self):
+        pass
+
+
+def drain(read_fd):
+    while os.read(read_fd, 1024 * 1024):
+        pass
+
+
+def run(
+    mode: str,
+    threads: int,
+    frames: int,
+    interval_seconds: float,
+    large_frames: int,
+    large_bytes: int,
+):
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=drain, args=(read_fd,), daemon=True)
+    reader.start()
+
+    stream = CountingStream(os.fdopen(write_fd, "wb", buffering=0))
+    writer = LockedWriter(stream) if mode == "locked" else StdoutWriter(stream)
+    if mode == "writer":
+        # Keep every sample instead of the rolling window used for stats
+        writer.latencies = deque()
+        writer.start()
+
+    small_frame = b'{"id":1,"result":{"progress":0.5,"downloadSpeed":1048576}}\n'
+    large_frame = b"x" * (large_bytes - 1) + b"\n"
+    caller_seconds = []
+    caller_lock = threading.Lock()
+
+    def emit_small():
+        blocked = []
+        for _ in range(frames):
+            started = time.perf_counter()
+            writer.put(small_frame, response=True)
+            blocked.append(time.perf_counter() - started)
+            time.sleep(interval_seconds)
+        with caller_lock:
+            caller_seconds.extend(blocked)
+
+    def emit_large():
+        for _ in range(large_frames):
+            writer.put(large_frame)
+            time.sleep(interval_seconds * 10)
+
+    workers = [threading.Thread(target=emit_small) for _ in range(threads)]
+    workers.append(threading.Thread(target=emit_large))
+
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    writer.flush()
+    elapsed = time.perf_counter() - started
+
+    # The writer's samples include the few large frames as well
+    delivery_seconds = list(writer.latencies)
+    stream.raw.close()
+    reader.join()
+
+    print(
+        "{mode:<7} wall={wall} writes={writes} caller p50={c50} p99={c99} "
+        "delivery p50={d50} p99={d99}".format(
+            mode=mode,
+            wall=format_ms(elapsed),
+            writes=stream.writes,
+            c50=format_ms(percentile(caller_seconds, 0.5)),
+            c99=format_ms(percentile(caller_seconds, 0.99)),
+            d50=format_ms(percentile(delivery_seconds, 0.5)),
+            d99=format_ms(percentile(delivery_seconds, 0.99)),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=500, help="Small frames per thread")
+    parser.add_argument("--interval-ms", type=float, default=1.0, help="Pause between small frames")
+    parser.add_argument("--large-frames", type=int, default=20)
+    parser.add_argument("--large-bytes", type=int, default=8 * 1024 * 1024)
+    args = parser.parse_args()
+
+    for mode in ("locked", "writer"):
+        run(
+            mode,
+            args.threads,
+            args.frames,
+            args.interval_ms / 1000,
+            args.large_frames,
+            args.large_bytes,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Compare download storage policies on a large synthetic torrent.
+
+Usage:
+    python python_rpc/benchmarks/bench_storage_policy.py [--size-mb 1024] [--files 2]
+
+Seeds one synthetic torrent from a child process and downloads it once per
+storage policy through ``action start`` (``storage`` parameter). For each
+policy it reports how long the start call took (preallocation happens
+there), the download time, the number of on-disk extents per file (via
+``filefrag`` when available) and a cold sequential read of the result,
+which is what loading the installed game looks like. Linux only.
+
+Extent counts depend heavily on the filesystem and on how full it is; run
+it with ``--work-dir`` on the disk you care about.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+from _common import format_ms, load_rpc_main
+from _swarm import LOOPBACK_SETTINGS, SeederProcess, create_torrent_file, write_payload
+from bench_loopback_swarm import RpcClient
+
+POLICIES = {
+    "sparse": {"mode": "sparse"},
+    "allocate": {"mode": "allocate"},
+    "preallocate": {"mode": "allocate", "preallocate": True},
+    "preallocate+cache": {"mode": "allocate", "preallocate": True, "disk_cache_mb": 512},
+}
+
+READ_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def downloaded_files(root: str):
+    for directory, _, names in os.walk(root):
+        for name in names:
+            yield os.path.join(directory, name)
+
+
+def count_extents(path: str):
+    if shutil.which("filefrag") is None:
+        return None
+
+    try:
+        output = subprocess.run(
+            ["filefrag", path], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    match = re.search(r"(\d+) extents? found", output)
+    return int(match.group(1)) if match else None
+
+
+def cold_read_seconds(paths):
+    """Sequentially read ``paths`` after dropping them from the page cache."""
+    for path in paths:
+        with open(path, "rb") as target:
+            os.fsync(target.fileno())
+            os.posix_fadvise(target.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    started = time.perf_counter()
+    for path in paths:
+        with open(path, "rb", buffering=0) as target:
+            while target.read(READ_CHUNK_BYTES):
+                pass
+    return time.perf_counter() - started
+
+
+def run_policy(client, main, seeders, name, storage, save_path, timeout):
+    game_id = "bench-" + name
+    started = time.perf_counter()
+    client.call(
+        "action",
+        {
+            "action": "start",
+            "game_id": game_id,
+            "url": seeders.magnet(),
+            "save_path": save_path,
+            "storage": storage,
+        },
+    )
+    start_call = time.perf_counter() - started
+    seeders.connect(main.downloads[game_id].torrent_handle)
+
+    finished_at = None
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        status = client.call("status")
+        if status and status["progress"] >= 1:
+            finished_at = time.perf_counter()
+            break
+        time.sleep(0.05)
+
+    client.call("action", {"action": "cancel", "game_id": game_id})
+
+    paths = sorted(downloaded_files(save_path))
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    extents = [count_extents(path) for path in paths]
+    read_seconds = cold_read_seconds(paths)
+
+    print(
+        "{name:<18} start={start} download={download} extents={extents} "
+        "cold_read={read:.0f} MB/s".format(
+            name=name,
+            start=format_ms(start_call),
+            download=format_ms(finished_at - started) if finished_at else "timeout",
+            extents="n/a" if None in extents else sum(extents),
+            read=total_bytes / read_seconds / (1024 * 1024) if read_seconds > 0 else 0,
+        )
+    )
+    shutil.rmtree(save_path, ignore_errors=True)
+
+
+def run(args, work_dir):
+    seed_dir = os.path.join(work_dir, "seed")
+    file_size = args.size_mb * 1024 * 1024 // args.files
+    payload_dir = write_payload(seed_dir, "payload", [file_size] * args.files)
+    torrent_file = create_torrent_file(payload_dir)
+
+    seeders = SeederProcess(torrent_file, seed_dir, seeders=args.seeders)
+    os.environ["HYDRA_RPC_DATA_DIR"] = os.path.join(work_dir, "rpc-data")
+    main = load_rpc_main()
+    main.torrent_session.apply_settings(
+        {key: value for key, value in LOOPBACK_SETTINGS.items() if key != "listen_interfaces"}
+    )
+    client = RpcClient(main)
+
+    # Resolve metadata once so every start knows the file layout up front,
+    # which is when preallocation can happen before the first write
+    client.call("torrent_files", {"magnet": seeders.magnet(), "timeout_ms": 60000})
+
+    try:
+        for name in args.policies:
+            run_policy(
+                client,
+                main,
+                seeders,
+                name,
+                POLICIES[name],
+                os.path.join(work_dir, "download-" + name),
+                args.timeout,
+            )
+    finally:
+        seeders.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--files", type=int, default=2)
+    parser.add_argument("--seeders", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument(
+        "--policies", nargs="+", choices=sorted(POLICIES), default=list(POLICIES)
+    )
+    parser.add_argument("--work-dir", help="Directory for payload and downloads (default: temp)")
+    args = parser.parse_args()
+
+    if args.work_dir:
+        os.makedirs(args.work_dir, exist_ok=True)
+        run(args, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            run(args, work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Compare the single-frame ``torrent_files`` payload with paginated pages.
+
+Usage:
+    python python_rpc/benchmarks/bench_torrent_files_pages.py [--files 100000]
+
+Builds a synthetic torrent with a repack-like directory layout and reports,
+per encoding, the cached size, the serialized bytes and the longest single
+frame build time, which is how long other responses would queue behind it
+on stdout. Also times building the ``torrent_tree`` index and a few of its
+queries.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import libtorrent as lt
+
+from _common import RPC_DIR, format_ms
+
+sys.path.insert(0, RPC_DIR)
+
+from torrent_file_list import TorrentFileList  # noqa: E402
+
+
+def build_synthetic_torrent(file_count: int, piece_size: int = 4 * 1024 * 1024):
+    files = lt.file_storage()
+    for index in range(file_count):
+        file_path = os.path.join(
+            "Game",
+            "data",
+            "pack-{group:03d}".format(group=index // 2000),
+            "chunk-{sub:02d}".format(sub=(index // 100) % 20),
+            "asset-{index:06d}.bin".format(index=index),
+        )
+        files.add_file(file_path, 1024 + (index * 7919) % (512 * 1024))
+
+    creator = lt.create_torrent(files, piece_size, flags=lt.create_torrent.v1_only)
+    for piece_index in range(creator.num_pieces()):
+        creator.set_hash(piece_index, os.urandom(20))
+
+    return lt.torrent_info(creator.generate())
+
+
+def serialize(payload):
+    return json.dumps(payload, ensure_ascii=True, separators=(",", ":"))
+
+
+def measure_allocated(callback):
+    tracemalloc.start()
+    value = callback()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, allocated
+
+
+def run_pages(file_list, page_size, encoding):
+    frame_timings = []
+    total_bytes = 0
+    cursor = 0
+
+    started = time.perf_counter()
+    while cursor is not None:
+        frame_started = time.perf_counter()
+        page = file_list.page(cursor, page_size, encoding)
+        total_bytes += len(serialize(page))
+        frame_timings.append(time.perf_counter() - frame_started)
+        cursor = page["nextCursor"]
+
+    return time.perf_counter() - started, max(frame_timings), len(frame_timings), total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    info = build_synthetic_torrent(args.files)
+    file_list, list_bytes = measure_allocated(lambda: TorrentFileList.from_torrent_info(info))
+    legacy_payload, payload_bytes = measure_allocated(
+        lambda: file_list.to_payload(max_files=args.files)
+    )
+    print("files              {count}".format(count=len(file_list)))
+    print(
+        "cached size        list={compact:.1f} MiB legacy dicts={legacy:.1f} MiB".format(
+            compact=list_bytes / (1024 * 1024), legacy=payload_bytes / (1024 * 1024)
+        )
+    )
+
+    started = time.perf_counter()
+    legacy_bytes = len(serialize(file_list.to_payload(max_files=args.files)))
+    legacy_seconds = time.perf_counter() - started
+    del legacy_payload
+    print(
+        "single frame       total={total} longest frame={total} frames=1 bytes={size}".format(
+            total=format_ms(legacy_seconds), size=legacy_bytes
+        )
+    )
+
+    for encoding in ("objects", "columnar"):
+        total, longest, frames, size = run_pages(file_list, args.page_size, encoding)
+        print(
+            "{label:<18} total={total} longest frame={longest} frames={frames} bytes={size}".format(
+                label="pages " + encoding,
+                total=format_ms(total),
+                longest=format_ms(longest),
+                frames=frames,
+                size=size,
+            )
+        )
+
+    started = time.perf_counter()
+    tree = file_list.tree()
+    print("tree build         {value}".format(value=format_ms(time.perf_counter() - started)))
+
+    queries = [
+        ("tree children", lambda: tree.list_children("Game/data", 0, args.page_size)),
+        ("tree select", lambda: tree.select_folders(["Game/data/pack-001"])),
+        ("tree glob", lambda: tree.filter(glob="*/chunk-0[12]/*")),
+    ]
+    for label, query in queries:
+        started = time.perf_counter()
+        size = len(serialize(query()))
+        print(
+            "{label:<18} {value} bytes={size}".format(
+                label=label, value=format_ms(time.perf_counter() - started), size=size
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Announces and time to first peer: every fallback tracker versus the registry.
+
+Usage:
+    python python_rpc/benchmarks/bench_tracker_registry.py [--rounds 3] [--decoys 50]
+
+Builds a fallback list shaped like the real one: mostly dead trackers
+(closed ports on 127.0.0.1), a few slow ones and two live local HTTP
+trackers that point at a seeder running in a child process. Each round
+starts a fresh session, adds the seeded torrent by a peerless magnet plus
+``--decoys`` magnets nobody seeds, and records the time until the first
+peer connects and how many announces were sent in ``--window`` seconds.
+
+``all`` attaches the whole list to every torrent, as before the registry.
+``cold`` uses a registry with no history; ``warm`` reuses the scores the
+cold rounds saved to disk. Runs fully offline; Linux only.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import libtorrent as lt
+
+from _common import RPC_DIR, format_ms, percentile
+from _swarm import (
+    LocalTracker,
+    SeederProcess,
+    closed_port_urls,
+    create_session,
+    create_torrent_file,
+    write_payload,
+)
+
+if RPC_DIR not in sys.path:
+    sys.path.insert(0, RPC_DIR)
+
+from alert_pump import AlertPump  # noqa: E402
+from torrent_downloader import TorrentDownloader  # noqa: E402
+from tracker_registry import TrackerRegistry  # noqa: E402
+
+
+class AllTrackers:
+    """The pre-registry behaviour: every candidate on every torrent."""
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+
+    def best(self):
+        return list(self.candidates)
+
+
+def build_candidates(live_urls, slow_urls, dead_count: int, seed: int):
+    candidates = closed_port_urls(dead_count) + list(slow_urls)
+    random.Random(seed).shuffle(candidates)
+    # Like the real list: a live tracker near the top, another far down
+    candidates.insert(min(5, len(candidates)), live_urls[0])
+    candidates.insert(max(len(candidates) - 5, 0), live_urls[1])
+    return candidates
+
+
+def run_round(mode, candidates, state_path, magnet, decoys, window, work_dir):
+    session = create_session()
+    session.apply_settings({"alert_mask": lt.alert.category_t.tracker_notification})
+    alert_pump = AlertPump(session)
+    alert_pump.start()
+
+    announces = [0]
+    announce_lock = threading.Lock()
+
+    def count_announce(alert):
+        with announce_lock:
+            announces[0] += 1
+
+    alert_pump.add_listener(lt.tracker_announce_alert, count_announce)
+
+    registry = None
+    if mode == "all":
+        selector = AllTrackers(candidates)
+    else:
+        registry = TrackerRegistry(state_path, alert_pump, session, candidates=candidates)
+        registry.start()
+        selector = registry
+
+    save_path = os.path.join(work_dir, "download-" + mode)
+    started = time.perf_counter()
+    downloader = TorrentDownloader(
+        session, lt.torrent_flags.auto_managed, alert_pump=alert_pump, tracker_registry=selector
+    )
+    downloader.start_download(magnet, save_path)
+    for _ in range(decoys):
+        TorrentDownloader(
+            session, lt.torrent_flags.upload_mode, alert_pump=alert_pump, tracker_registry=selector
+        ).start_download(
+            "magnet:?xt=urn:btih:{hash}".format(hash=os.urandom(20).hex()), save_path
+        )
+
+    first_peer = None
+    deadline = started + window
+    while time.perf_counter() < deadline:
+        status = downloader.torrent_handle.status(flags=0)
+        # The payload is small enough to finish between two polls, after
+        # which the seeder connection is gone again
+        if first_peer is None and (status.num_peers > 0 or status.total_payload_download > 0):
+            first_peer = time.perf_counter() - started
+        time.sleep(0.02)
+
+    if registry is not None:
+        registry.stop()
+    alert_pump.stop()
+    with announce_lock:
+        return first_peer, announces[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--decoys", type=int, default=50)
+    parser.add_argument("--dead", type=int, default=80, help="dead trackers in the list")
+    parser.add_argument("--slow", type=int, default=6, help="trackers answering after 5s")
+    parser.add_argument("--window", type=float, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        seed_dir = os.path.join(work_dir, "seed")
+        torrent_file = create_torrent_file(write_payload(seed_dir, "payload", [16 * 1024 * 1024]))
+        seeders = SeederProcess(torrent_file, seed_dir)
+        live = [LocalTracker(seeders.ports), LocalTracker(seeders.ports)]
+        slow = [LocalTracker(seeders.ports, delay_seconds=5) for _ in range(args.slow)]
+        candidates = build_candidates(
+            [tracker.url for tracker in live], [tracker.url for tracker in slow], args.dead, seed=1
+        )
+        magnet = lt.make_magnet_uri(seeders.torrent_info)
+        state_path = os.path.join(work_dir, "trackers.json")
+
+        print(
+            "candidates={count} (dead={dead} slow={slow} live=2) decoys={decoys} window={window}s".format(
+                count=len(candidates),
+                dead=args.dead,
+                slow=args.slow,
+                decoys=args.decoys,
+                window=args.window,
+            )
+        )
+        try:
+            for mode in ("all", "cold", "warm"):
+                first_peers = []
+                announce_counts = []
+                for _ in range(args.rounds):
+                    # Every cold round starts without history; the warm
+                    # rounds reuse what the last cold round saved
+                    if mode == "cold" and os.path.exists(state_path):
+                        os.unlink(state_path)
+                    first_peer, announces = run_round(
+                        mode, candidates, state_path, magnet, args.decoys, args.window, work_dir
+                    )
+                    first_peers.append(first_peer)
+                    announce_counts.append(announces)
+
+                found = [value for value in first_peers if value is not None]
+                print(
+                    "{mode:<5} first_peer_p50={first_peer} found={found}/{rounds} "
+                    "announces_p50={announces}".format(
+                        mode=mode,
+                        first_peer=format_ms(percentile(found, 0.5)) if found else "none",
+                        found=len(found),
+                        rounds=args.rounds,
+                        announces=int(percentile(announce_counts, 0.5)),
+                    )
+                )
+        finally:
+            for tracker in live + slow:
+                tracker.close()
+            seeders.close()
+
+
+if __name__ == "__main__":
+    main()
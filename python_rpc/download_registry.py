@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, Optional
+
+
+class DownloadRegistry:
+    """Maps game ids to their downloaders.
+
+    Reads never lock: writers swap in a fresh copy of the mapping under a
+    short lock, so ``get`` and ``items`` see a consistent snapshot while
+    another game is being started or cancelled. Writes are rare (start,
+    cancel, promotion) and the mapping holds at most a library's worth of
+    games, so copying it is cheap. Nothing slow runs under the lock; each
+    downloader serializes its own lifecycle.
+    """
+
+    def __init__(self):
+        self.write_lock = threading.Lock()
+        self._entries: Dict[object, object] = {}
+
+    def get(self, game_id):
+        return self._entries.get(game_id)
+
+    def __getitem__(self, game_id):
+        return self._entries[game_id]
+
+    def items(self):
+        return list(self._entries.items())
+
+    def values(self):
+        return list(self._entries.values())
+
+    def set(self, game_id, downloader):
+        with self.write_lock:
+            entries = dict(self._entries)
+            entries[game_id] = downloader
+            self._entries = entries
+
+    def set_default(self, game_id, downloader):
+        """Register ``downloader`` unless the game already has one; return the registered one."""
+        with self.write_lock:
+            existing = self._entries.get(game_id)
+            if existing is not None:
+                return existing
+
+            entries = dict(self._entries)
+            entries[game_id] = downloader
+            self._entries = entries
+            return downloader
+
+    def set_many(self, downloaders: Dict[object, object]):
+        with self.write_lock:
+            entries = dict(self._entries)
+            entries.update(downloaders)
+            self._entries = entries
+
+    def pop(self, game_id, expected: Optional[object] = None):
+        """Remove the game's downloader, only if it still is ``expected`` when given."""
+        with self.write_lock:
+            current = self._entries.get(game_id)
+            if current is None or (expected is not None and current is not expected):
+                return None
+
+            entries = dict(self._entries)
+            del entries[game_id]
+            self._entries = entries
+            return current
@@ -0,0 +1,190 @@
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class DownloadScheduler:
+    """Decides which queued downloads are allowed to transfer.
+
+    Entries are ordered by priority (higher first) and then by submission
+    order; entries submitted with ``to_front`` go ahead of their priority
+    band. The first ``max_active`` entries are active; the rest stay paused
+    until an active entry finishes, is paused or is cancelled. Activation
+    changes are applied through the ``activate``/``deactivate`` callbacks
+    outside of the scheduler lock.
+    """
+
+    def __init__(
+        self,
+        torrent_session,
+        activate: Callable,
+        deactivate: Callable,
+        on_change: Optional[Callable] = None,
+        max_active: int = 1,
+        max_active_seeds: int = -1,
+        extra_download_slots: int = 0,
+    ):
+        self.session = torrent_session
+        self.activate = activate
+        self.deactivate = deactivate
+        self.on_change = on_change
+        self.max_active = max(1, max_active)
+        self.max_active_seeds = max_active_seeds
+        self.extra_download_slots = max(0, extra_download_slots)
+        self.logger = logging.getLogger("hydra.scheduler")
+        self.lock = threading.RLock()
+        self.entries = {}
+        self.active = set()
+        self.completed = OrderedDict()
+        self.sequence = itertools.count()
+
+    def apply_session_limits(self):
+        # Leave libtorrent room for the downloads we activate plus metadata probes,
+        # so its own auto-manager never queues a torrent we decided to run.
+        active_downloads = self.max_active + self.extra_download_slots
+        active_limit = -1 if self.max_active_seeds < 0 else active_downloads + self.max_active_seeds
+
+        try:
+            self.session.apply_settings(
+                {
+                    "active_downloads": active_downloads,
+                    "active_seeds": self.max_active_seeds,
+                    "active_limit": active_limit,
+                }
+            )
+        except Exception:
+            self.logger.warning("Failed to apply active torrent limits", exc_info=True)
+
+    def _ordered_ids(self):
+        return sorted(
+            self.entries,
+            key=lambda game_id: (
+                -self.entries[game_id]["priority"],
+                self.entries[game_id]["sequence"],
+            ),
+        )
+
+    def _rebalance(self):
+        desired = set(self._ordered_ids()[: self.max_active])
+        to_start = desired - self.active
+        to_stop = self.active - desired
+        self.active = desired
+        return to_start, to_stop
+
+    def _apply(self, to_start, to_stop, skip=None):
+        for game_id in to_stop:
+            if game_id != skip:
+                self._call(self.deactivate, game_id)
+
+        for game_id in to_start:
+            if game_id != skip:
+                self._call(self.activate, game_id)
+
+        if (to_start or to_stop) and self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception:
+                self.logger.warning("Scheduler change callback failed", exc_info=True)
+
+    def _call(self, callback, game_id):
+        try:
+            callback(game_id)
+        except Exception:
+            self.logger.warning("Scheduler callback failed for %s", game_id, exc_info=True)
+
+    def submit(self, game_id, priority: int = 0, to_front: bool = False) -> bool:
+        """Queue ``game_id`` (or update it); return whether it is active."""
+        with self.lock:
+            self.completed.pop(game_id, None)
+            sequence = next(self.sequence)
+            entry = self.entries.get(game_id)
+            if entry is None:
+                entry = self.entries[game_id] = {
+                    "priority": priority,
+                    "sequence": sequence,
+                }
+            else:
+                entry["priority"] = priority
+
+            if to_front:
+                entry["sequence"] = -sequence
+
+            to_start, to_stop = self._rebalance()
+            admitted = game_id in self.active
+
+        # The caller starts or pauses the submitted download itself
+        self._apply(to_start, to_stop, skip=game_id)
+        return admitted
+
+    def set_priority(self, game_id, priority: int) -> bool:
+        with self.lock:
+            entry = self.entries.get(game_id)
+            if entry is None:
+                return False
+
+            entry["priority"] = priority
+            to_start, to_stop = self._rebalance()
+
+        self._apply(to_start, to_stop)
+        return True
+
+    def complete(self, game_id):
+        """Free the slot of a finished download but keep reporting it as primary."""
+        with self.lock:
+            if self.entries.pop(game_id, None) is None:
+                return
+
+            self.active.discard(game_id)
+            self.completed[game_id] = True
+            to_start, to_stop = self._rebalance()
+
+        self._apply(to_start, to_stop)
+
+    def remove(self, game_id):
+        with self.lock:
+            self.completed.pop(game_id, None)
+            if self.entries.pop(game_id, None) is None:
+                return
+
+            self.active.discard(game_id)
+            to_start, to_stop = self._rebalance()
+
+        self._apply(to_start, to_stop)
+
+    def set_max_active(self, max_active: int):
+        with self.lock:
+            self.max_active = max(1, max_active)
+            to_start, to_stop = self._rebalance()
+
+        self.apply_session_limits()
+        self._apply(to_start, to_stop)
+
+    def active_count(self) -> int:
+        with self.lock:
+            return len(self.active)
+
+    def primary(self):
+        """Return the highest priority active game id, else the last completed one."""
+        with self.lock:
+            for game_id in self._ordered_ids():
+                if game_id in self.active:
+                    return game_id
+
+            if self.completed:
+                return next(reversed(self.completed))
+
+        return None
+
+    def snapshot(self):
+        with self.lock:
+            ordered = [
+                {
+                    "gameId": game_id,
+                    "priority": self.entries[game_id]["priority"],
+                    "active": game_id in self.active,
+                }
+                for game_id in self._ordered_ids()
+            ]
+            return self.max_active, ordered
@@ -0,0 +1,179 @@
+import fnmatch
+import os
+import re
+from typing import Optional
+
+MAX_FILTER_PATTERN_LENGTH = 512
+PATH_SEPARATORS_RE = re.compile(r"[\\/]+")
+
+
+def split_tree_path(path: str):
+    """Split a client path on either separator, ignoring empty components."""
+    if not isinstance(path, str):
+        raise ValueError("invalid_path")
+
+    return [part for part in PATH_SEPARATORS_RE.split(path) if part]
+
+
+class FileTree:
+    """Directory tree over a :class:`TorrentFileList`.
+
+    Nodes are kept in flat parallel lists indexed by node id, with node 0 as
+    the root. Every node knows its direct files and the aggregate size and
+    file count of its whole subtree, so folder queries never walk the flat
+    file list.
+    """
+
+    def __init__(self, file_list):
+        self.file_list = file_list
+        self.names = [""]
+        self.parents = [-1]
+        self.children = [{}]
+        self.files = [[]]
+
+        dir_nodes = [self._ensure_node(split_tree_path(directory)) for directory in file_list.dirs]
+        for index, dir_id in enumerate(file_list.file_dirs):
+            self.files[dir_nodes[dir_id]].append(index)
+
+        lengths = file_list.file_lengths
+        self.sizes = [sum(lengths[index] for index in node_files) for node_files in self.files]
+        self.file_counts = [len(node_files) for node_files in self.files]
+
+        # Children are always created after their parent, so one reverse
+        # pass rolls every subtree up into its ancestors
+        for node in range(len(self.names) - 1, 0, -1):
+            parent = self.parents[node]
+            self.sizes[parent] += self.sizes[node]
+            self.file_counts[parent] += self.file_counts[node]
+
+    def _ensure_node(self, parts):
+        node = 0
+        for part in parts:
+            child = self.children[node].get(part)
+            if child is None:
+                child = len(self.names)
+                self.names.append(part)
+                self.parents.append(node)
+                self.children.append({})
+                self.files.append([])
+                self.children[node][part] = child
+            node = child
+        return node
+
+    def find(self, path: str):
+        node = 0
+        for part in split_tree_path(path):
+            node = self.children[node].get(part)
+            if node is None:
+                raise ValueError("invalid_path")
+        return node
+
+    def node_path(self, node: int) -> str:
+        parts = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = self.parents[node]
+        return os.path.join(*reversed(parts)) if parts else ""
+
+    def stat(self, path: str):
+        node = self.find(path)
+        return {
+            "path": self.node_path(node),
+            "size": self.sizes[node],
+            "fileCount": self.file_counts[node],
+        }
+
+    def list_children(self, path: str, cursor: int, page_size: int):
+        """List sub-directories and a page of the direct files of ``path``."""
+        node = self.find(path)
+        node_path = self.node_path(node)
+        node_files = self.files[node]
+        start = min(max(cursor, 0), len(node_files))
+        stop = min(start + page_size, len(node_files))
+
+        return {
+            "path": node_path,
+            "size": self.sizes[node],
+            "fileCount": self.file_counts[node],
+            "dirs": [
+                {
+                    "name": name,
+                    "path": os.path.join(node_path, name) if node_path else name,
+                    "size": self.sizes[child],
+                    "fileCount": self.file_counts[child],
+                }
+                for name, child in sorted(self.children[node].items())
+            ],
+            "files": [
+                {
+                    "index": index,
+                    "name": self.file_list.file_names[index],
+                    "length": self.file_list.file_lengths[index],
+                }
+                for index in node_files[start:stop]
+            ],
+            "directFileCount": len(node_files),
+            "cursor": start,
+            "nextCursor": stop if stop < len(node_files) else None,
+        }
+
+    def _subtree_files(self, node: int):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from self.files[current]
+            stack.extend(self.children[current].values())
+
+    def select_folders(self, paths, exclude_paths=()):
+        """Return the file indices under ``paths`` minus those under ``exclude_paths``."""
+        selected = set()
+        for path in paths:
+            selected.update(self._subtree_files(self.find(path)))
+
+        for path in exclude_paths:
+            selected.difference_update(self._subtree_files(self.find(path)))
+
+        return self._selection(selected)
+
+    def filter(
+        self,
+        glob: Optional[str] = None,
+        regex: Optional[str] = None,
+        ignore_case: bool = False,
+    ):
+        """Return the file indices whose ``/``-separated path matches.
+
+        ``glob`` uses fnmatch rules, where ``*`` also matches across
+        directories; ``regex`` is searched anywhere in the path.
+        """
+        pattern = glob if glob is not None else regex
+        if not isinstance(pattern, str) or not pattern or len(pattern) > MAX_FILTER_PATTERN_LENGTH:
+            raise ValueError("invalid_pattern")
+
+        flags = re.IGNORECASE if ignore_case else 0
+        try:
+            if glob is not None:
+                matcher = re.compile(fnmatch.translate(glob.replace("\\", "/")), flags).match
+            else:
+                matcher = re.compile(regex, flags).search
+        except re.error as error:
+            raise ValueError("invalid_pattern") from error
+
+        dir_paths = ["/".join(split_tree_path(directory)) for directory in self.file_list.dirs]
+        selected = []
+        for index, dir_id in enumerate(self.file_list.file_dirs):
+            directory = dir_paths[dir_id]
+            name = self.file_list.file_names[index]
+            if matcher(directory + "/" + name if directory else name):
+                selected.append(index)
+
+        return self._selection(selected)
+
+    def _selection(self, indices):
+        indices = sorted(indices)
+        lengths = self.file_list.file_lengths
+        return {
+            "fileIndices": indices,
+            "fileCount": len(indices),
+            "size": sum(lengths[index] for index in indices),
+        }
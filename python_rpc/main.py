@@ -1,17 +1,55 @@
+import atexit
 import hmac
 import json
 import logging
+import os
 import re
+import signal
 import sys
 import tempfile
 import threading
 import time
 import urllib.parse
+from collections import OrderedDict
 from typing import Any, Optional
 
 import libtorrent as lt
 
+from alert_pump import AlertPump
+from download_registry import DownloadRegistry
+from download_scheduler import DownloadScheduler
+from metadata_resolver import MetadataResolver
+from metadata_store import MetadataStore, info_hash_to_hex, torrent_info_hash_hex
+from resume_data import ResumeDataStore
+from session_profiles import (
+    DEFAULT_SESSION_PROFILE,
+    DISK_CACHE_SETTING,
+    SESSION_PROFILES,
+    SessionProfileManager,
+)
+from session_state import SessionStateStore
+from sampling_profiler import DEFAULT_PROFILE_INTERVAL_MS, SamplingProfiler
+from status_subscriptions import DEFAULT_SUBSCRIPTION_INTERVAL_MS, StatusSubscriptions
+from stdout_writer import StdoutWriter
+from storage_policy import DEFAULT_STORAGE_MODE, StoragePolicy
+from rpc_executor import RequestExecutor, WorkerLane, current_queue_wait
+from rpc_metrics import MethodMetrics, SessionStatsSampler, thread_counts
+from rpc_protocol import (
+    LINE_PROTOCOL_VERSION,
+    SUPPORTED_PROTOCOL_VERSIONS,
+    LineProtocol,
+    available_codecs,
+    create_protocol,
+)
+from torrent_adder import AsyncTorrentAdder
 from torrent_downloader import TorrentDownloader
+from torrent_file_list import (
+    DEFAULT_FILES_PAGE_SIZE,
+    FILES_ENCODINGS,
+    MAX_FILES_PAGE_SIZE,
+    TorrentFileList,
+)
+from tracker_registry import DEFAULT_MAX_TRACKERS, TrackerRegistry
 
 for _stream in (sys.stdin, sys.stdout, sys.stderr):
     reconfigure = getattr(_stream, "reconfigure", None)
@@ -74,31 +112,189 @@ def parse_cli_args(argv):
     raise ValueError("invalid_arguments")
 
 
+def resolve_data_dir():
+    override = os.environ.get("HYDRA_RPC_DATA_DIR")
+    if override:
+        return override
+
+    if sys.platform == "win32":
+        base_dir = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    elif sys.platform == "darwin":
+        base_dir = os.path.expanduser("~/Library/Caches")
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+    return os.path.join(base_dir, "hydra-python-rpc")
+
+
+def read_int_env(name: str, default: int):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
 torrent_port, rpc_password, start_download_payload, start_seeding_payload = parse_cli_args(
     sys.argv
 )
 
 
-downloads = {}
-downloads_lock = threading.RLock()
-metadata_semaphore = threading.BoundedSemaphore(value=2)
+downloads = DownloadRegistry()
 
-# This can be streamed down from Node
-downloading_game_id = -1
 current_download_limit = None
-
-torrent_session = lt.session(
-    {"listen_interfaces": "0.0.0.0:{port}".format(port=torrent_port)}
-)
+current_seed_upload_limit = None
+
+# The libtorrent session and everything bound to it are built by
+# start_session() after "ready" has been sent; see run_startup()
+torrent_session = None
+session_profiles = None
+alert_pump = None
+session_stats_sampler = None
+session_ready = threading.Event()
+SESSION_WAIT_SECONDS = 30
+# Answered before the session exists
+SESSIONLESS_METHODS = frozenset({"startup_status", "io_stats", "metrics", "profiler"})
 
 MAGNET_HASH_HEX_RE = re.compile(r"^[a-fA-F0-9]{40}$")
 MAGNET_HASH_BASE32_RE = re.compile(r"^[a-zA-Z2-7]{32}$")
 
 TORRENT_FILES_CACHE_TTL_SECONDS = 300
 TORRENT_FILES_CACHE_MAX_ITEMS = 128
-torrent_files_cache = {}
+torrent_files_cache = OrderedDict()
 torrent_files_cache_lock = threading.RLock()
+torrent_files_cache_counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+# Resolved metadata probes stay in the session this long so a following
+# "start" can promote them instead of re-adding the torrent
+METADATA_PROBE_GRACE_SECONDS = 120
+warm_probes = {}
+warm_probes_lock = threading.RLock()
+
+rpc_data_dir = resolve_data_dir()
+TORRENT_METADATA_CACHE_MAX_BYTES = read_int_env(
+    "HYDRA_METADATA_CACHE_MAX_BYTES", 64 * 1024 * 1024
+)
+METADATA_MAX_PARALLEL_LOOKUPS = read_int_env("HYDRA_METADATA_MAX_PARALLEL", 2)
+metadata_store = MetadataStore(
+    os.path.join(rpc_data_dir, "metadata"), TORRENT_METADATA_CACHE_MAX_BYTES
+)
 stdout_lock = threading.RLock()
+# Framing and codec of stdin/stdout; swapped by set_protocol
+rpc_protocol = LineProtocol()
+STDOUT_FLUSH_TIMEOUT_SECONDS = 5
+stdout_writer = StdoutWriter(sys.stdout.buffer)
+stdout_writer.start()
+atexit.register(stdout_writer.flush, STDOUT_FLUSH_TIMEOUT_SECONDS)
+
+# Stop hooks of the session's components, run last-added first. Electron
+# ends the process with kill(), which skips atexit, so SIGTERM and the end
+# of stdin run them too; registered after the stdout flush so they still
+# run before it at a normal exit
+shutdown_hooks = []
+shutdown_lock = threading.Lock()
+
+
+def add_shutdown_hook(hook):
+    with shutdown_lock:
+        shutdown_hooks.append(hook)
+
+
+def run_shutdown_hooks():
+    with shutdown_lock:
+        hooks = shutdown_hooks[::-1]
+        shutdown_hooks.clear()
+
+    for hook in hooks:
+        try:
+            hook()
+        except Exception:
+            logger.exception("Shutdown hook failed")
+
+
+atexit.register(run_shutdown_hooks)
+
+
+def handle_termination_signal(signum, frame):
+    logger.info("Received signal %s, shutting down", signum)
+    # Unwinds the stdio loop; atexit then runs the hooks and flushes stdout
+    raise SystemExit(0)
+
+FAST_LANE_WORKERS = 2
+FAST_LANE_QUEUE_SIZE = 64
+SLOW_LANE_WORKERS = 4
+SLOW_LANE_QUEUE_SIZE = 32
+# Metadata waits hold a worker for up to their timeout (30-120 s), so
+# they get a lane of their own instead of starving the other actions
+METADATA_LANE_WORKERS = 4
+METADATA_LANE_QUEUE_SIZE = 32
+CONTROL_LANE_WORKERS = 2
+CONTROL_LANE_QUEUE_SIZE = 64
+MAX_BATCH_SIZE = 64
+
+# Actions that only touch handles or settings: pause, cancel and limits
+# must get through while starts and lookups are waiting
+CONTROL_ACTIONS = frozenset(
+    {
+        "pause",
+        "cancel",
+        "pause_seeding",
+        "set_download_limit",
+        "set_seed_upload_limit",
+        "set_max_active_downloads",
+        "set_download_priority",
+        "set_session_profile",
+        "set_network_interface",
+    }
+)
+
+
+def select_action_lane(method, params):
+    if method != "action" or not isinstance(params, dict):
+        return None
+
+    action_name = params.get("action")
+    if action_name in CONTROL_ACTIONS:
+        return "control"
+
+    if action_name == "start":
+        storage = params.get("storage")
+        # Selective starts wait for metadata before they return, and so do
+        # starts that preallocate
+        if params.get("file_indices") is not None or (
+            isinstance(storage, dict) and storage.get("preallocate")
+        ):
+            return "metadata"
+
+    return None
+
+
+request_executor = RequestExecutor(
+    lanes=[
+        WorkerLane("fast", FAST_LANE_WORKERS, FAST_LANE_QUEUE_SIZE),
+        WorkerLane("control", CONTROL_LANE_WORKERS, CONTROL_LANE_QUEUE_SIZE),
+        WorkerLane("metadata", METADATA_LANE_WORKERS, METADATA_LANE_QUEUE_SIZE),
+        WorkerLane("slow", SLOW_LANE_WORKERS, SLOW_LANE_QUEUE_SIZE),
+    ],
+    method_lanes={
+        "status": "fast",
+        "seed_status": "fast",
+        "queue_status": "fast",
+        "subscribe": "fast",
+        "unsubscribe": "fast",
+        "resync": "fast",
+        "io_stats": "fast",
+        "metrics": "fast",
+        "profiler": "fast",
+        "startup_status": "fast",
+        "torrent_files": "metadata",
+        "torrent_tree": "metadata",
+        "action": "slow",
+    },
+    default_lane="slow",
+    lane_selector=select_action_lane,
+)
+method_metrics = MethodMetrics(request_executor.method_lanes)
+profiler = SamplingProfiler(os.path.join(rpc_data_dir, "profiles"))
 
 
 class RpcError(Exception):
@@ -190,26 +386,31 @@ def validate_magnet_uri(magnet: str):
 
 
 def get_cached_torrent_files(info_hash: str):
+    # Keyed by hex, so a base32 magnet hits the entry of its hex twin
+    info_hash = info_hash_to_hex(info_hash)
     with torrent_files_cache_lock:
         item = torrent_files_cache.get(info_hash)
         if not item:
+            torrent_files_cache_counters["misses"] += 1
             return None
 
         if time.time() - item["timestamp"] > TORRENT_FILES_CACHE_TTL_SECONDS:
             torrent_files_cache.pop(info_hash, None)
+            torrent_files_cache_counters["expired"] += 1
             return None
 
+        torrent_files_cache.move_to_end(info_hash)
+        torrent_files_cache_counters["hits"] += 1
         return item["value"]
 
 
 def set_cached_torrent_files(info_hash: str, value):
+    info_hash = info_hash_to_hex(info_hash)
     with torrent_files_cache_lock:
-        if len(torrent_files_cache) >= TORRENT_FILES_CACHE_MAX_ITEMS:
-            oldest_key = min(
-                torrent_files_cache,
-                key=lambda cache_key: torrent_files_cache[cache_key]["timestamp"],
-            )
-            torrent_files_cache.pop(oldest_key, None)
+        torrent_files_cache.pop(info_hash, None)
+        while len(torrent_files_cache) >= TORRENT_FILES_CACHE_MAX_ITEMS:
+            torrent_files_cache.popitem(last=False)
+            torrent_files_cache_counters["evictions"] += 1
 
         torrent_files_cache[info_hash] = {
             "timestamp": time.time(),
@@ -217,6 +418,41 @@ def set_cached_torrent_files(info_hash: str, value):
         }
 
 
+def get_magnet_info_hash(magnet: str):
+    try:
+        _, info_hash = validate_magnet_uri(magnet)
+    except ValueError:
+        return None
+
+    return info_hash_to_hex(info_hash)
+
+
+def persist_received_metadata(alert):
+    try:
+        info = alert.handle.torrent_file()
+        if info is None:
+            return
+
+        info_hash = torrent_info_hash_hex(info)
+        if info_hash not in metadata_store:
+            metadata_store.put(info_hash, info)
+    except Exception:
+        logger.warning("Failed to persist received metadata", exc_info=True)
+
+
+
+def get_registered_handles():
+    return [
+        handle
+        for handle in (downloader.torrent_handle for downloader in downloads.values() if downloader)
+        if handle is not None
+    ]
+
+
+RESUME_DATA_SAVE_INTERVAL_SECONDS = 60
+resume_store = None
+
+
 def map_downloader_error_code(error: Exception):
     code = str(error)
 
@@ -230,6 +466,10 @@ def map_downloader_error_code(error: Exception):
         "invalid_url",
         "invalid_save_path",
         "invalid_trackers",
+        "invalid_path",
+        "invalid_pattern",
+        "insufficient_disk_space",
+        "download_cancelled",
     }:
         return code
 
@@ -261,13 +501,33 @@ def normalize_metadata_timeout_ms(value):
     return max(5000, min(parsed, 120000))
 
 
+def get_download_limit_share():
+    if not current_download_limit:
+        return None
+
+    # The user's cap is a total, split evenly across the running downloads
+    active_downloads = max(download_scheduler.active_count(), 1)
+    return max(current_download_limit // active_downloads, 1)
+
+
 def apply_download_limit(downloader):
     if not downloader:
         return
 
-    set_download_limit = getattr(downloader, "set_download_limit", None)
-    if callable(set_download_limit):
-        set_download_limit(current_download_limit)
+    if downloader.is_seeding_mode():
+        downloader.set_download_limit(None)
+        downloader.set_upload_limit(current_seed_upload_limit)
+        return
+
+    # A promoted probe or former seed may still carry the seed upload cap
+    downloader.set_upload_limit(None)
+    downloader.set_download_limit(get_download_limit_share())
+
+
+def apply_download_limits(include_seeds: bool = False):
+    for downloader in downloads.values():
+        if downloader and (include_seeds or not downloader.is_seeding_mode()):
+            apply_download_limit(downloader)
 
 
 def normalize_network_interface(value):
@@ -327,48 +587,375 @@ def start_torrent_download(
     trackers=None,
     flags=None,
     metadata_timeout_ms=None,
+    storage_policy: Optional[StoragePolicy] = None,
 ):
     normalized_metadata_timeout_ms = normalize_metadata_timeout_ms(metadata_timeout_ms)
     start_kwargs = {
         "file_indices": file_indices,
         "trackers": trackers,
+        "storage_policy": storage_policy,
     }
     if normalized_metadata_timeout_ms is not None:
         start_kwargs["wait_timeout_seconds"] = normalized_metadata_timeout_ms / 1000
 
-    with downloads_lock:
+    info_hash = get_magnet_info_hash(url)
+
+    if storage_policy is not None:
+        session_profiles.set_disk_cache_floor(game_id, storage_policy.disk_cache_bytes)
+
+    try:
         existing_downloader = downloads.get(game_id)
 
-    if existing_downloader and isinstance(existing_downloader, TorrentDownloader):
-        apply_download_limit(existing_downloader)
-        existing_downloader.start_download(url, save_path, **start_kwargs)
-        return
+        if existing_downloader and isinstance(existing_downloader, TorrentDownloader):
+            apply_download_limit(existing_downloader)
+            existing_downloader.start_download(url, save_path, **start_kwargs)
+            return
 
-    torrent_downloader = TorrentDownloader(
-        torrent_session,
-        flags or lt.torrent_flags.auto_managed,
-        session_lock=downloads_lock,
-    )
-    apply_download_limit(torrent_downloader)
+        # A probe was added with the default storage mode, which cannot be
+        # changed on a live torrent
+        promotable = storage_policy is None or storage_policy.mode == DEFAULT_STORAGE_MODE
+        if promotable and info_hash and promote_metadata_probe(
+            game_id, info_hash, save_path, file_indices, trackers, flags
+        ):
+            return
+
+        if not promotable and info_hash:
+            # Otherwise add_torrent would hand back the parked probe's handle
+            probe = take_metadata_probe(info_hash)
+            if probe is not None:
+                probe.cancel_download()
+
+        stored_info = metadata_store.get(info_hash) if info_hash else None
+        if stored_info is not None:
+            start_kwargs["torrent_info"] = stored_info
+
+        torrent_downloader = TorrentDownloader(
+            torrent_session,
+            flags or lt.torrent_flags.auto_managed,
+            alert_pump=alert_pump,
+            resume_store=resume_store,
+            storage_policy=storage_policy,
+            tracker_registry=tracker_registry,
+        )
+        apply_download_limit(torrent_downloader)
 
-    with downloads_lock:
-        downloads[game_id] = torrent_downloader
+        registered = downloads.set_default(game_id, torrent_downloader)
+        if registered is not torrent_downloader:
+            # A concurrent start for the same game registered first
+            registered.start_download(url, save_path, **start_kwargs)
+            return
 
-    try:
-        torrent_downloader.start_download(url, save_path, **start_kwargs)
+        try:
+            torrent_downloader.start_download(url, save_path, **start_kwargs)
+        except Exception:
+            downloads.pop(game_id, expected=torrent_downloader)
+            raise
     except Exception:
-        with downloads_lock:
-            downloads.pop(game_id, None)
+        # The floor was raised before any path could fail
+        if storage_policy is not None:
+            session_profiles.set_disk_cache_floor(game_id, None)
         raise
 
 
-def bootstrap_downloads():
-    global downloading_game_id
+def get_downloader(game_id):
+    return downloads.get(game_id)
+
+
+MAX_ADD_MANY_ITEMS = 1000
+ADD_MANY_TIMEOUT_SECONDS = 60
+torrent_adder = None
+
+
+def add_many_result(game_id, error_code: Optional[str] = None):
+    if error_code is None:
+        return {"gameId": game_id, "ok": True}
+
+    return {"gameId": game_id, "ok": False, "error": error_code}
+
+
+def add_many_torrents(items: list, seeding: bool = True):
+    """Start whole-torrent downloads or seeds for many games in one pass.
+
+    New games are added together through ``torrent_adder``; games that
+    already have a downloader, or whose torrent is a warm metadata probe,
+    go through ``start_torrent_download`` one by one. Returns one result
+    per item, in order, so one bad entry never fails the others.
+    """
+    flags = lt.torrent_flags.upload_mode if seeding else lt.torrent_flags.auto_managed
+    results = [None] * len(items)
+    seen_game_ids = set()
+    scheduled = []
+    batch = []
+
+    for index, item in enumerate(items):
+        game_id = item.get("game_id") if isinstance(item, dict) else None
+        try:
+            if not game_id or not isinstance(game_id, (str, int)):
+                raise RpcError("invalid_game_id")
+
+            if game_id in seen_game_ids:
+                raise RpcError("duplicate_game_id")
+            seen_game_ids.add(game_id)
+
+            url = item.get("url")
+            if not isinstance(url, str) or not url.startswith("magnet"):
+                raise RpcError("invalid_url")
+
+            save_path = item.get("save_path")
+            if not isinstance(save_path, str):
+                raise RpcError("invalid_save_path")
+
+            trackers = validate_trackers(item.get("trackers"))
+            info_hash = get_magnet_info_hash(url)
+
+            with warm_probes_lock:
+                has_probe = info_hash in warm_probes
+
+            if has_probe or get_downloader(game_id) is not None:
+                start_torrent_download(game_id, url, save_path, trackers=trackers, flags=flags)
+                results[index] = add_many_result(game_id)
+                scheduled.append(game_id)
+                continue
+
+            downloader = TorrentDownloader(
+                torrent_session,
+                flags,
+                alert_pump=alert_pump,
+                resume_store=resume_store,
+                tracker_registry=tracker_registry,
+            )
+            apply_download_limit(downloader)
+            stored_info = metadata_store.get(info_hash) if info_hash else None
+            # Downloads stay paused until the scheduler gives them a slot
+            params = downloader.prepare_add(
+                url, save_path, trackers, stored_info, paused=not seeding
+            )
+            batch.append((index, game_id, downloader, params))
+        except RpcError as error:
+            results[index] = add_many_result(game_id, error.code)
+        except Exception as error:
+            results[index] = add_many_result(game_id, map_downloader_error_code(error))
+
+    added = torrent_adder.add_all(
+        [params for _, _, _, params in batch], timeout_seconds=ADD_MANY_TIMEOUT_SECONDS
+    )
+
+    registered = {}
+    for (index, game_id, downloader, _), (handle, error_code) in zip(batch, added):
+        if error_code is None:
+            downloader.attach_handle(handle)
+            registered[game_id] = downloader
+            scheduled.append(game_id)
+        results[index] = add_many_result(game_id, error_code)
+    downloads.set_many(registered)
+
+    if not seeding:
+        for game_id in scheduled:
+            schedule_download(game_id, to_front=False)
+
+    return results
+
+
+def activate_scheduled_download(game_id):
+    downloader = get_downloader(game_id)
+    if downloader:
+        downloader.resume_download()
+
+
+def deactivate_scheduled_download(game_id):
+    downloader = get_downloader(game_id)
+    if downloader:
+        downloader.pause_download()
+
 
+MAX_ACTIVE_DOWNLOADS = read_int_env("HYDRA_MAX_ACTIVE_DOWNLOADS", 1)
+MAX_ACTIVE_SEEDS = read_int_env("HYDRA_MAX_ACTIVE_SEEDS", -1)
+download_scheduler = None
+
+
+def schedule_download(game_id, priority: int = 0, to_front: bool = True):
+    if not download_scheduler.submit(game_id, priority, to_front=to_front):
+        deactivate_scheduled_download(game_id)
+
+
+def on_torrent_finished(alert):
+    finished_game_ids = [
+        game_id
+        for game_id, downloader in downloads.items()
+        if downloader and downloader.torrent_handle == alert.handle
+    ]
+
+    for game_id in finished_game_ids:
+        download_scheduler.complete(game_id)
+        session_profiles.set_disk_cache_floor(game_id, None)
+
+
+
+def normalize_priority(value):
+    if value is None:
+        return 0
+
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise RpcError("invalid_priority")
+
+    return value
+
+
+MAX_FALLBACK_TRACKERS = read_int_env("HYDRA_MAX_FALLBACK_TRACKERS", DEFAULT_MAX_TRACKERS)
+TRACKER_REFRESH_INTERVAL_SECONDS = 30 * 60
+TRACKER_SAVE_INTERVAL_SECONDS = 60
+tracker_registry = None
+
+
+def refresh_fallback_trackers(selected):
+    refreshed = sum(
+        1
+        for downloader in downloads.values()
+        if downloader and downloader.refresh_fallback_trackers(selected)
+    )
+    if refreshed:
+        logger.info("Refreshed fallback trackers of %s torrents", refreshed)
+
+
+SESSION_STATE_SAVE_INTERVAL_SECONDS = 5 * 60
+# Long enough for the DHT to bootstrap and fill its routing table
+SESSION_STATE_FIRST_SAVE_DELAY_SECONDS = 30
+# Settings applied on every start by the code that owns them; the saved
+# session state must not bring back last run's values
+SESSION_RUNTIME_SETTINGS = frozenset(
+    {
+        "listen_interfaces",
+        "outgoing_interfaces",
+        "alert_mask",
+        "active_downloads",
+        "active_seeds",
+        "active_limit",
+        DISK_CACHE_SETTING,
+    }.union(key for profile in SESSION_PROFILES.values() for key in profile)
+)
+session_state_store = None
+
+
+def build_session_params():
+    """Last run's DHT nodes, settings and IP filter, with this run's listen port."""
+    session_params = session_state_store.load()
+    if session_params is None:
+        session_params = lt.session_params()
+
+    settings = session_params.settings
+    settings["listen_interfaces"] = "0.0.0.0:{port}".format(port=torrent_port)
+    session_params.settings = settings
+    return session_params
+
+
+def start_session():
+    """Build the libtorrent session and everything bound to it."""
+    global torrent_session, session_profiles, alert_pump, session_stats_sampler
+    global resume_store, download_scheduler, torrent_adder, tracker_registry
+    global session_state_store
+
+    session_state_store = SessionStateStore(
+        os.path.join(rpc_data_dir, "session.state"),
+        runtime_keys=SESSION_RUNTIME_SETTINGS,
+        save_interval_seconds=SESSION_STATE_SAVE_INTERVAL_SECONDS,
+        first_save_delay_seconds=SESSION_STATE_FIRST_SAVE_DELAY_SECONDS,
+    )
+    torrent_session = lt.session(build_session_params())
+    session_state_store.start(torrent_session)
+    add_shutdown_hook(session_state_store.stop)
+    session_profiles = SessionProfileManager(torrent_session)
+    initial_session_profile = os.environ.get("HYDRA_SESSION_PROFILE") or DEFAULT_SESSION_PROFILE
+    if initial_session_profile != DEFAULT_SESSION_PROFILE:
+        try:
+            session_profiles.apply(initial_session_profile)
+        except ValueError:
+            logger.warning("Unknown session profile: %s", initial_session_profile)
+
+    alert_pump = AlertPump(torrent_session)
+    alert_pump.start()
+    add_shutdown_hook(alert_pump.stop)
+    session_stats_sampler = SessionStatsSampler(torrent_session, alert_pump)
+    torrent_adder = AsyncTorrentAdder(torrent_session, alert_pump)
+
+    tracker_registry = TrackerRegistry(
+        os.path.join(rpc_data_dir, "trackers.json"),
+        alert_pump,
+        torrent_session,
+        max_trackers=MAX_FALLBACK_TRACKERS,
+        refresh_interval_seconds=TRACKER_REFRESH_INTERVAL_SECONDS,
+        save_interval_seconds=TRACKER_SAVE_INTERVAL_SECONDS,
+        on_refresh=refresh_fallback_trackers,
+    )
+    tracker_registry.start()
+    add_shutdown_hook(tracker_registry.stop)
+    alert_pump.add_listener(lt.metadata_received_alert, persist_received_metadata)
+
+    resume_store = ResumeDataStore(
+        os.path.join(rpc_data_dir, "resume"),
+        alert_pump,
+        get_registered_handles,
+        save_interval_seconds=RESUME_DATA_SAVE_INTERVAL_SECONDS,
+    )
+    resume_store.start()
+    # Registered after the alert pump so it runs first at exit, while alerts still flow
+    add_shutdown_hook(resume_store.stop)
+
+    download_scheduler = DownloadScheduler(
+        torrent_session,
+        activate_scheduled_download,
+        deactivate_scheduled_download,
+        on_change=apply_download_limits,
+        max_active=MAX_ACTIVE_DOWNLOADS,
+        max_active_seeds=MAX_ACTIVE_SEEDS,
+        extra_download_slots=METADATA_MAX_PARALLEL_LOOKUPS,
+    )
+    download_scheduler.apply_session_limits()
+    alert_pump.add_listener(lt.torrent_finished_alert, on_torrent_finished)
+
+
+def require_session():
+    """Block a request until the session exists; startup normally takes milliseconds."""
+    if not session_ready.wait(SESSION_WAIT_SECONDS):
+        raise RpcError("starting", "The torrent session is still starting")
+
+    if torrent_session is None:
+        raise RpcError("startup_failed", startup_state.get("error") or "startup_failed")
+
+
+STARTUP_PROGRESS_INTERVAL_SECONDS = 0.25
+# Seeds are added in chunks so startup events can report progress
+BOOTSTRAP_SEED_CHUNK_SIZE = 64
+startup_lock = threading.Lock()
+startup_events_enabled = True
+startup_state = {
+    "stage": "starting",
+    "seedsTotal": 0,
+    "seedsAdded": 0,
+    "seedsFailed": 0,
+    "downloadStarted": False,
+    "sessionMs": None,
+    "bootstrapMs": None,
+    "error": None,
+}
+
+
+def startup_status():
+    with startup_lock:
+        return dict(startup_state)
+
+
+def update_startup_state(**changes):
+    with startup_lock:
+        startup_state.update(changes)
+        snapshot = dict(startup_state)
+
+    if startup_events_enabled:
+        write_response({"event": "startup", **snapshot})
+
+
+def bootstrap_downloads():
     initial_download = load_json_payload(start_download_payload)
     if initial_download:
-        downloading_game_id = initial_download["game_id"]
-
         try:
             if initial_download["url"].startswith("magnet"):
                 file_indices = parse_file_indices(initial_download.get("file_indices"))
@@ -379,29 +966,75 @@ def bootstrap_downloads():
                     file_indices=file_indices,
                     metadata_timeout_ms=initial_download.get("metadata_timeout_ms"),
                 )
+                schedule_download(initial_download["game_id"])
+                update_startup_state(downloadStarted=True)
             else:
                 raise ValueError("invalid_url")
         except Exception as error:
-            downloading_game_id = -1
             logger.error("Error starting initial download: %s", error, exc_info=True)
 
-    initial_seeding = load_json_payload(start_seeding_payload)
-    if initial_seeding:
-        for seed in initial_seeding:
-            try:
-                start_torrent_download(
-                    seed["game_id"],
-                    seed["url"],
-                    seed["save_path"],
-                    flags=lt.torrent_flags.upload_mode,
+    initial_seeding = load_json_payload(start_seeding_payload) or []
+    update_startup_state(seedsTotal=len(initial_seeding))
+
+    added = 0
+    failed = 0
+    next_progress = time.monotonic() + STARTUP_PROGRESS_INTERVAL_SECONDS
+    for offset in range(0, len(initial_seeding), BOOTSTRAP_SEED_CHUNK_SIZE):
+        chunk = initial_seeding[offset : offset + BOOTSTRAP_SEED_CHUNK_SIZE]
+        for result in add_many_torrents(chunk, seeding=True):
+            if result["ok"]:
+                added += 1
+            else:
+                failed += 1
+                logger.error(
+                    "Error starting initial seeding for %s: %s", result["gameId"], result["error"]
                 )
-            except Exception as error:
-                logger.error("Error starting initial seeding: %s", error, exc_info=True)
+
+        if time.monotonic() >= next_progress:
+            update_startup_state(seedsAdded=added, seedsFailed=failed)
+            next_progress = time.monotonic() + STARTUP_PROGRESS_INTERVAL_SECONDS
+
+    with startup_lock:
+        startup_state.update(seedsAdded=added, seedsFailed=failed)
+
+
+def run_startup(emit_events: bool = True):
+    """Second startup stage, run once "ready" is out: session first, then seeds.
+
+    Requests that need the session wait for it; the seed bootstrap runs
+    while requests are already being answered, reporting progress through
+    ``startup`` events and ``startup_status``.
+    """
+    global startup_events_enabled
+
+    startup_events_enabled = emit_events
+    started = time.monotonic()
+    update_startup_state(stage="session")
+    try:
+        start_session()
+    except Exception as error:
+        logger.error("Failed to start the torrent session: %s", error, exc_info=True)
+        session_ready.set()
+        update_startup_state(stage="failed", error=str(error))
+        return
+
+    session_ready.set()
+    session_done = time.monotonic()
+    update_startup_state(stage="bootstrapping", sessionMs=int((session_done - started) * 1000))
+
+    try:
+        bootstrap_downloads()
+    except Exception as error:
+        logger.error("Failed to bootstrap downloads: %s", error, exc_info=True)
+
+    bootstrap_ms = int((time.monotonic() - session_done) * 1000)
+    update_startup_state(stage="ready", bootstrapMs=bootstrap_ms)
+    logger.info("Startup finished: session in %sms, bootstrap in %sms",
+                startup_state["sessionMs"], bootstrap_ms)
 
 
 def status():
-    with downloads_lock:
-        downloader = downloads.get(downloading_game_id)
+    downloader = get_downloader(download_scheduler.primary())
 
     if not downloader:
         return None
@@ -413,88 +1046,458 @@ def status():
     return status_payload
 
 
-def seed_status():
-    with downloads_lock:
-        download_items = list(downloads.items())
+def is_seeding_status(torrent_status):
+    return torrent_status.state == lt.torrent_status.seeding
+
+
+# Two concurrent get_torrent_status calls with a Python predicate deadlock
+# inside the bindings, so session-wide status queries take turns
+torrent_status_query_lock = threading.Lock()
+
+
+def seed_status(seeding_statuses: Optional[dict] = None):
+    download_items = downloads.items()
+
+    if not download_items:
+        return []
+
+    if seeding_statuses is None:
+        # One session-wide query instead of handle.status() per downloader
+        with torrent_status_query_lock:
+            torrent_statuses = torrent_session.get_torrent_status(is_seeding_status, 0)
+        seeding_statuses = {
+            torrent_status.handle: torrent_status for torrent_status in torrent_statuses
+        }
 
     seed_payload = []
     for game_id, downloader in download_items:
-        if not downloader:
+        if not downloader or downloader.torrent_handle is None:
             continue
 
-        response = downloader.get_download_status()
-        if not response:
+        torrent_status = seeding_statuses.get(downloader.torrent_handle)
+        if torrent_status is None:
             continue
 
-        if response.get("status") == 5:  # Torrent seeding check
-            seed_payload.append(
-                {
-                    "gameId": game_id,
-                    **response,
-                }
-            )
+        seed_payload.append(
+            {
+                "gameId": game_id,
+                **downloader.build_status_payload(torrent_status),
+            }
+        )
 
     return seed_payload
 
 
-def torrent_files(data: Optional[dict] = None):
-    data = data or {}
+def pushed_seed_status():
+    # Pushed frames are built from the alert pump snapshots, so a tick
+    # costs no libtorrent call at all
+    return seed_status(
+        {
+            handle: torrent_status
+            for handle, torrent_status in alert_pump.get_all_statuses().items()
+            if is_seeding_status(torrent_status)
+        }
+    )
+
+
+status_subscriptions = StatusSubscriptions(
+    {"status": status, "seed_status": pushed_seed_status},
+    emit=lambda frame: write_response(frame),
+    get_generation=lambda: alert_pump.generation(),
+)
+
 
+def lookup_torrent_files(info_hash: str):
+    cached_file_list = get_cached_torrent_files(info_hash)
+    if cached_file_list is not None:
+        return cached_file_list
+
+    stored_info = metadata_store.get(info_hash)
+    if stored_info is None:
+        return None
+
+    file_list = TorrentFileList.from_torrent_info(stored_info)
+    set_cached_torrent_files(info_hash, file_list)
+    return file_list
+
+
+def park_metadata_probe(info_hash: str, downloader):
+    # Parked probes are not counted in the scheduler's slot budget, so they
+    # must not take one of libtorrent's active_downloads slots either
     try:
-        magnet, info_hash = validate_magnet_uri(data.get("magnet"))
-    except Exception as error:
-        raise RpcError(map_downloader_error_code(error)) from error
+        downloader.park()
+    except RuntimeError:
+        logger.warning("Failed to park metadata probe hash=%s", info_hash, exc_info=True)
+
+    timer = threading.Timer(
+        METADATA_PROBE_GRACE_SECONDS,
+        expire_metadata_probe,
+        args=(info_hash, downloader),
+    )
+    timer.daemon = True
 
-    cached_payload = get_cached_torrent_files(info_hash)
-    if cached_payload is not None:
-        return cached_payload
+    with warm_probes_lock:
+        previous = warm_probes.pop(info_hash, None)
+        warm_probes[info_hash] = (downloader, timer)
 
-    timeout_ms = data.get("timeout_ms", 30000)
-    trackers = validate_trackers(data.get("trackers"))
+    if previous:
+        previous[1].cancel()
+        previous[0].cancel_download()
+
+    timer.start()
+
+
+def take_metadata_probe(info_hash: str):
+    with warm_probes_lock:
+        entry = warm_probes.pop(info_hash, None)
+
+    if not entry:
+        return None
+
+    downloader, timer = entry
+    timer.cancel()
+    return downloader
+
+
+def expire_metadata_probe(info_hash: str, downloader):
+    with warm_probes_lock:
+        entry = warm_probes.get(info_hash)
+        if not entry or entry[0] is not downloader:
+            return
+
+        warm_probes.pop(info_hash, None)
+
+    downloader.cancel_download()
+
+
+def promote_metadata_probe(game_id, info_hash, save_path, file_indices, trackers, flags):
+    probe = take_metadata_probe(info_hash)
+    if probe is None:
+        return False
+
+    probe.resume_store = resume_store
+
+    downloads.set(game_id, probe)
 
     try:
-        timeout_ms = int(timeout_ms)
-    except (TypeError, ValueError):
-        timeout_ms = 30000
+        probe.promote_download(
+            save_path,
+            file_indices=file_indices,
+            trackers=trackers,
+            flags=flags or lt.torrent_flags.auto_managed,
+        )
+    except ValueError:
+        # Invalid selection: keep the probe warm for a corrected request
+        downloads.pop(game_id, expected=probe)
+        park_metadata_probe(info_hash, probe)
+        raise
+    except Exception:
+        logger.warning("Failed to promote metadata probe hash=%s", info_hash, exc_info=True)
+        downloads.pop(game_id, expected=probe)
+        probe.cancel_download()
+        return False
 
-    timeout_ms = max(5000, min(timeout_ms, 120000))
-    timeout_seconds = timeout_ms / 1000
+    # Only now do the flags say download rather than upload mode
+    apply_download_limit(probe)
+    logger.info("Promoted metadata probe hash=%s for game %s", info_hash, game_id)
+    return True
 
-    if not metadata_semaphore.acquire(timeout=5):
-        raise RpcError("metadata_busy")
 
+def fetch_torrent_files(info_hash: str, timeout_seconds: float, magnet: str, trackers):
     temp_downloader = TorrentDownloader(
         torrent_session,
         lt.torrent_flags.upload_mode,
-        session_lock=downloads_lock,
+        alert_pump=alert_pump,
+        tracker_registry=tracker_registry,
     )
 
     started_at = time.time()
+    resolved = False
 
     try:
         temp_downloader.start_download(magnet, tempfile.gettempdir(), trackers=trackers)
-        files_payload = temp_downloader.get_torrent_files(timeout_seconds=timeout_seconds)
-        response = {
-            "infoHash": info_hash,
-            **files_payload,
-        }
+        file_list = temp_downloader.get_torrent_file_list(timeout_seconds=timeout_seconds)
+
+        resolved_info = temp_downloader.get_torrent_info()
+        if resolved_info is not None and info_hash not in metadata_store:
+            metadata_store.put(info_hash, resolved_info)
 
-        set_cached_torrent_files(info_hash, response)
+        set_cached_torrent_files(info_hash, file_list)
 
         elapsed_ms = int((time.time() - started_at) * 1000)
         logger.info("Resolved torrent metadata hash=%s in %sms", info_hash, elapsed_ms)
 
-        return response
+        resolved = True
+        return file_list
+    finally:
+        if resolved:
+            park_metadata_probe(info_hash_to_hex(info_hash), temp_downloader)
+        else:
+            temp_downloader.cancel_download()
+
+
+metadata_resolver = MetadataResolver(
+    fetch_torrent_files,
+    cache_lookup=lookup_torrent_files,
+    max_parallel=METADATA_MAX_PARALLEL_LOOKUPS,
+)
+
+
+def resolve_torrent_file_list(data: dict):
+    try:
+        magnet, info_hash = validate_magnet_uri(data.get("magnet"))
     except Exception as error:
         raise RpcError(map_downloader_error_code(error)) from error
-    finally:
-        temp_downloader.cancel_download()
-        metadata_semaphore.release()
+
+    timeout_ms = data.get("timeout_ms", 30000)
+    trackers = validate_trackers(data.get("trackers"))
+
+    try:
+        timeout_ms = int(timeout_ms)
+    except (TypeError, ValueError):
+        timeout_ms = 30000
+
+    timeout_ms = max(5000, min(timeout_ms, 120000))
+    # Time spent queued in the executor counts against the deadline
+    timeout_seconds = timeout_ms / 1000 - current_queue_wait()
+
+    try:
+        file_list = metadata_resolver.resolve(
+            info_hash_to_hex(info_hash), timeout_seconds, magnet, trackers
+        )
+    except Exception as error:
+        raise RpcError(map_downloader_error_code(error)) from error
+
+    return info_hash, file_list
+
+
+def torrent_files(data: Optional[dict] = None):
+    data = data or {}
+
+    # Any paging parameter switches to the paginated response; without them
+    # the full legacy list is returned in one frame
+    paginated = any(key in data for key in ("cursor", "page_size", "encoding"))
+    if paginated:
+        cursor, page_size, encoding = parse_files_page_params(data)
+
+    info_hash, file_list = resolve_torrent_file_list(data)
+
+    try:
+        if paginated:
+            return {"infoHash": info_hash, **file_list.page(cursor, page_size, encoding)}
+
+        return {"infoHash": info_hash, **file_list.to_payload()}
+    except Exception as error:
+        raise RpcError(map_downloader_error_code(error)) from error
+
+
+def parse_files_page_params(data: dict):
+    cursor = data.get("cursor") or 0
+    if isinstance(cursor, bool) or not isinstance(cursor, int) or cursor < 0:
+        raise RpcError("invalid_cursor")
+
+    page_size = data.get("page_size", DEFAULT_FILES_PAGE_SIZE)
+    if isinstance(page_size, bool) or not isinstance(page_size, int) or page_size <= 0:
+        raise RpcError("invalid_page_size")
+
+    encoding = data.get("encoding") or "objects"
+    if encoding not in FILES_ENCODINGS:
+        raise RpcError("invalid_encoding")
+
+    return cursor, min(page_size, MAX_FILES_PAGE_SIZE), encoding
+
+
+def parse_tree_paths(paths):
+    if paths is None:
+        return []
+
+    if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+        raise RpcError("invalid_path")
+
+    return paths
+
+
+def torrent_tree(data: Optional[dict] = None):
+    """Query the directory tree of a torrent's files.
+
+    ``op`` is one of ``children`` (sub-directories and a page of direct
+    files of ``path``), ``size`` (aggregate size of each of ``paths``),
+    ``filter`` (files matching ``glob`` or ``regex``) and ``select``
+    (file indices under ``folders`` minus ``exclude``).
+    """
+    data = data or {}
+    op = data.get("op")
+    if op not in {"children", "size", "filter", "select"}:
+        raise RpcError("invalid_op")
+
+    if op == "children":
+        cursor, page_size, _ = parse_files_page_params(data)
+
+    info_hash, file_list = resolve_torrent_file_list(data)
+    tree = file_list.tree()
+
+    try:
+        if op == "children":
+            result = tree.list_children(data.get("path") or "", cursor, page_size)
+        elif op == "size":
+            result = {"paths": [tree.stat(path) for path in parse_tree_paths(data.get("paths"))]}
+        elif op == "filter":
+            glob = data.get("glob")
+            result = tree.filter(
+                glob=glob,
+                regex=data.get("regex") if glob is None else None,
+                ignore_case=bool(data.get("ignore_case")),
+            )
+        else:
+            result = tree.select_folders(
+                parse_tree_paths(data.get("folders")),
+                parse_tree_paths(data.get("exclude")),
+            )
+    except ValueError as error:
+        raise RpcError(map_downloader_error_code(error)) from error
+
+    return {"infoHash": info_hash, **result}
+
+
+def subscribe(data: Optional[dict] = None):
+    data = data or {}
+
+    interval_ms = data.get("interval_ms", DEFAULT_SUBSCRIPTION_INTERVAL_MS)
+    if isinstance(interval_ms, bool) or not isinstance(interval_ms, int):
+        raise RpcError("invalid_interval")
+
+    fields = data.get("fields")
+    if fields is not None and (
+        not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)
+    ):
+        raise RpcError("invalid_fields")
+
+    thresholds = data.get("thresholds")
+    if thresholds is not None and (
+        not isinstance(thresholds, dict)
+        or not all(
+            isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+            for value in thresholds.values()
+        )
+    ):
+        raise RpcError("invalid_thresholds")
+
+    try:
+        return status_subscriptions.subscribe(
+            data.get("topic"),
+            interval_ms=interval_ms,
+            fields=fields,
+            thresholds=thresholds,
+            delta=bool(data.get("delta")),
+        )
+    except ValueError as error:
+        raise RpcError(str(error)) from error
+
+
+def unsubscribe(data: Optional[dict] = None):
+    data = data or {}
+    return {"removed": status_subscriptions.unsubscribe(data.get("topic"))}
+
+
+def resync(data: Optional[dict] = None):
+    data = data or {}
+
+    try:
+        return status_subscriptions.resync(data.get("topic"))
+    except ValueError as error:
+        raise RpcError(str(error)) from error
+
+
+def queue_status():
+    max_active, entries = download_scheduler.snapshot()
+
+    active = []
+    queued = []
+    for position, entry in enumerate(entries):
+        downloader = get_downloader(entry["gameId"])
+        item = {
+            "gameId": entry["gameId"],
+            "priority": entry["priority"],
+            "position": position,
+            "status": downloader.get_download_status() if downloader else None,
+        }
+        (active if entry["active"] else queued).append(item)
+
+    return {
+        "maxActiveDownloads": max_active,
+        "active": active,
+        "queued": queued,
+    }
+
+
+def io_stats():
+    return {"stdout": stdout_writer.stats()}
+
+
+def torrent_files_cache_stats():
+    with torrent_files_cache_lock:
+        return {
+            **torrent_files_cache_counters,
+            "size": len(torrent_files_cache),
+            "maxItems": TORRENT_FILES_CACHE_MAX_ITEMS,
+            "ttlSeconds": TORRENT_FILES_CACHE_TTL_SECONDS,
+        }
+
+
+def metrics(data: Optional[dict] = None):
+    data = data or {}
+
+    # Sampling the session waits for the alert pump, so it can be skipped
+    session_stats = None
+    if data.get("session", True) and session_stats_sampler is not None:
+        try:
+            session_stats = session_stats_sampler.sample()
+        except Exception:
+            logger.warning("Failed to sample session stats", exc_info=True)
+
+    return {
+        "methods": method_metrics.snapshot(),
+        "lanes": request_executor.stats(),
+        "torrentFilesCache": torrent_files_cache_stats(),
+        "metadataStore": metadata_store.stats(),
+        "metadataResolver": metadata_resolver.stats(),
+        "stdout": stdout_writer.stats(),
+        "threads": thread_counts(),
+        "session": session_stats,
+        "profiler": profiler.status(),
+        "trackers": tracker_registry.stats_payload() if tracker_registry is not None else None,
+    }
+
+
+def profiler_action(data: Optional[dict] = None):
+    data = data or {}
+    action_name = data.get("action", "status")
+
+    if action_name == "status":
+        return profiler.status()
+
+    if action_name == "start":
+        interval_ms = data.get("interval_ms", DEFAULT_PROFILE_INTERVAL_MS)
+        if isinstance(interval_ms, bool) or not isinstance(interval_ms, int):
+            raise RpcError("invalid_interval")
+
+        try:
+            return profiler.start(interval_ms)
+        except ValueError as error:
+            raise RpcError(str(error)) from error
+
+    if action_name == "stop":
+        try:
+            return profiler.stop()
+        except ValueError as error:
+            raise RpcError(str(error)) from error
+
+    raise RpcError("invalid_action")
 
 
 def action(data: Optional[dict] = None):
-    global downloading_game_id
     global current_download_limit
+    global current_seed_upload_limit
 
     data = data or {}
     action_name = data.get("action")
@@ -503,7 +1506,14 @@ def action(data: Optional[dict] = None):
     if not action_name:
         raise RpcError("invalid_action")
 
-    requires_game_id = {"start", "pause", "cancel", "resume_seeding", "pause_seeding"}
+    requires_game_id = {
+        "start",
+        "pause",
+        "cancel",
+        "resume_seeding",
+        "pause_seeding",
+        "set_download_priority",
+    }
     if action_name in requires_game_id and not game_id:
         raise RpcError("invalid_game_id")
 
@@ -517,6 +1527,13 @@ def action(data: Optional[dict] = None):
             if not isinstance(save_path, str):
                 raise RpcError("invalid_save_path")
 
+            priority = normalize_priority(data.get("priority"))
+
+            try:
+                storage_policy = StoragePolicy.from_payload(data.get("storage"))
+            except ValueError:
+                raise RpcError("invalid_storage_policy")
+
             if url.startswith("magnet"):
                 file_indices = parse_file_indices(data.get("file_indices"))
                 start_torrent_download(
@@ -526,32 +1543,31 @@ def action(data: Optional[dict] = None):
                     file_indices=file_indices,
                     trackers=validate_trackers(data.get("trackers")),
                     metadata_timeout_ms=data.get("metadata_timeout_ms"),
+                    storage_policy=storage_policy,
                 )
             else:
                 raise RpcError("invalid_url")
 
-            downloading_game_id = game_id
+            # Plain starts keep the old "latest start wins" behaviour; queued
+            # starts wait behind everything already scheduled at their priority
+            schedule_download(game_id, priority, to_front=not data.get("enqueue"))
         elif action_name == "pause":
-            with downloads_lock:
-                downloader = downloads.get(game_id)
+            download_scheduler.remove(game_id)
 
+            downloader = downloads.get(game_id)
             if downloader:
                 downloader.pause_download()
-
-            if downloading_game_id == game_id:
-                downloading_game_id = -1
         elif action_name == "cancel":
-            with downloads_lock:
-                downloader = downloads.get(game_id)
-
+            # Unregistered first so status calls stop reporting it right away
+            downloader = downloads.pop(game_id)
             if downloader:
-                downloader.cancel_download()
-
-            with downloads_lock:
-                downloads.pop(game_id, None)
+                info_hash = downloader.get_info_hash()
+                downloader.close()
+                if info_hash:
+                    resume_store.discard(info_hash)
 
-            if downloading_game_id == game_id:
-                downloading_game_id = -1
+            download_scheduler.remove(game_id)
+            session_profiles.set_disk_cache_floor(game_id, None)
         elif action_name == "resume_seeding":
             start_torrent_download(
                 game_id,
@@ -560,25 +1576,51 @@ def action(data: Optional[dict] = None):
                 flags=lt.torrent_flags.upload_mode,
                 trackers=validate_trackers(data.get("trackers")),
             )
-        elif action_name == "pause_seeding":
-            with downloads_lock:
-                downloader = downloads.get(game_id)
+        elif action_name == "add_many":
+            items = data.get("items")
+            if not isinstance(items, list) or not items:
+                raise RpcError("invalid_items")
 
-            if downloader:
-                downloader.cancel_download()
+            if len(items) > MAX_ADD_MANY_ITEMS:
+                raise RpcError("too_many_items")
+
+            seeding = data.get("seeding", True)
+            if not isinstance(seeding, bool):
+                raise RpcError("invalid_params")
 
-            with downloads_lock:
-                downloads.pop(game_id, None)
+            return {"results": add_many_torrents(items, seeding=seeding)}
+        elif action_name == "pause_seeding":
+            downloader = downloads.pop(game_id)
+            if downloader:
+                downloader.close()
+            session_profiles.set_disk_cache_floor(game_id, None)
         elif action_name == "set_download_limit":
             current_download_limit = normalize_download_limit(
                 data.get("max_download_speed_bytes_per_second")
             )
-
-            with downloads_lock:
-                active_downloaders = list(downloads.values())
-
-            for downloader in active_downloaders:
-                apply_download_limit(downloader)
+            apply_download_limits()
+        elif action_name == "set_seed_upload_limit":
+            current_seed_upload_limit = normalize_download_limit(
+                data.get("max_upload_speed_bytes_per_second")
+            )
+            apply_download_limits(include_seeds=True)
+        elif action_name == "set_max_active_downloads":
+            try:
+                max_active = int(data.get("max_active_downloads"))
+            except (TypeError, ValueError):
+                raise RpcError("invalid_max_active_downloads")
+
+            download_scheduler.set_max_active(max_active)
+        elif action_name == "set_download_priority":
+            if not download_scheduler.set_priority(
+                game_id, normalize_priority(data.get("priority"))
+            ):
+                raise RpcError("invalid_game_id")
+        elif action_name == "set_session_profile":
+            try:
+                session_profiles.apply(data.get("profile"))
+            except ValueError:
+                raise RpcError("invalid_profile")
         elif action_name == "set_network_interface":
             apply_network_interface(
                 normalize_network_interface(data.get("interface"))
@@ -593,11 +1635,17 @@ def action(data: Optional[dict] = None):
     return None
 
 
-def write_response(payload: dict):
-    serialized = json.dumps(payload, ensure_ascii=True, separators=(",", ":"))
+def write_response(payload):
+    # Only answers to calls may overtake queued frames; pushed events
+    # keep their order
+    is_response = not (isinstance(payload, dict) and "event" in payload)
+    protocol = rpc_protocol
+    frame = protocol.encode_frame(payload)
     with stdout_lock:
-        sys.stdout.write(serialized + "\n")
-        sys.stdout.flush()
+        # The protocol may have been switched while we were encoding
+        if protocol is not rpc_protocol:
+            frame = rpc_protocol.encode_frame(payload)
+        stdout_writer.put(frame, response=is_response)
 
 
 def build_error_response(request_id: Any, code: str, message: Optional[str] = None):
@@ -619,76 +1667,258 @@ def dispatch_method(method: str, params: Optional[dict]):
     if method == "seed_status":
         return seed_status()
 
+    if method == "queue_status":
+        return queue_status()
+
     if method == "torrent_files":
         return torrent_files(payload)
 
+    if method == "torrent_tree":
+        return torrent_tree(payload)
+
     if method == "action":
         return action(payload)
 
+    if method == "subscribe":
+        return subscribe(payload)
+
+    if method == "unsubscribe":
+        return unsubscribe(payload)
+
+    if method == "resync":
+        return resync(payload)
+
+    if method == "io_stats":
+        return io_stats()
+
+    if method == "metrics":
+        return metrics(payload)
+
+    if method == "profiler":
+        return profiler_action(payload)
+
+    if method == "startup_status":
+        return startup_status()
+
     raise RpcError("method_not_found", f"Unknown method: {method}")
 
 
-def handle_request(request_payload: dict):
+def execute_request(request_payload: dict, authorized: Optional[bool] = None):
+    """Run one call and return its response frame instead of writing it."""
     request_id = request_payload.get("id")
     method = request_payload.get("method")
     params = request_payload.get("params")
-    rpc_password_value = request_payload.get("rpc_password")
 
-    if not validate_rpc_password_value(rpc_password_value):
-        write_response(build_error_response(request_id, "unauthorized", "Unauthorized"))
-        return
+    if authorized is None:
+        authorized = validate_rpc_password_value(request_payload.get("rpc_password"))
+
+    if not authorized:
+        return build_error_response(request_id, "unauthorized", "Unauthorized")
 
     if request_id is None:
-        write_response(build_error_response(None, "invalid_request", "Missing request id"))
-        return
+        return build_error_response(None, "invalid_request", "Missing request id")
 
     if not isinstance(method, str) or not method:
-        write_response(build_error_response(request_id, "invalid_method", "Invalid method"))
-        return
+        return build_error_response(request_id, "invalid_method", "Invalid method")
 
     if params is not None and not isinstance(params, dict):
-        write_response(
-            build_error_response(request_id, "invalid_params", "Params must be an object")
-        )
-        return
+        return build_error_response(request_id, "invalid_params", "Params must be an object")
 
+    started = time.perf_counter()
+    error_code = None
     try:
+        if method not in SESSIONLESS_METHODS:
+            require_session()
         result = dispatch_method(method, params)
-        write_response({"id": request_id, "result": result})
+        return {"id": request_id, "result": result}
     except RpcError as error:
-        write_response(build_error_response(request_id, error.code, error.message))
+        error_code = error.code
+        return build_error_response(request_id, error.code, error.message)
     except Exception as error:
+        error_code = "internal_error"
         logger.error("Unhandled RPC dispatcher error: %s", error, exc_info=True)
-        write_response(build_error_response(request_id, "internal_error", "internal_error"))
+        return build_error_response(request_id, "internal_error", "internal_error")
+    finally:
+        method_metrics.record(method, time.perf_counter() - started, error_code)
 
 
-def start_stdio_rpc_loop():
-    write_response({"event": "ready", "protocolVersion": 1})
+def handle_request(request_payload: dict):
+    write_response(execute_request(request_payload))
+
 
-    for raw_line in sys.stdin:
-        line = raw_line.strip()
-        if not line:
+def validate_batch_password(calls: list):
+    """Check each distinct password of a batch once; every call must carry a valid one."""
+    passwords = set()
+    for call in calls:
+        if not isinstance(call, dict):
             continue
 
+        password = call.get("rpc_password")
+        if password is not None and not isinstance(password, str):
+            return False
+        passwords.add(password)
+
+    return all(validate_rpc_password_value(password) for password in passwords)
+
+
+def execute_batch_call(call, authorized: bool):
+    if not isinstance(call, dict):
+        return build_error_response(None, "invalid_request", "Request must be an object")
+
+    if call.get("method") == "set_protocol":
+        return build_error_response(
+            call.get("id"), "invalid_request", "set_protocol cannot be batched"
+        )
+
+    return execute_request(call, authorized)
+
+
+def submit_batch(calls: list):
+    """Answer an array of calls with one array of responses, in request order."""
+    if not calls:
+        write_response(build_error_response(None, "invalid_request", "Empty batch"))
+        return
+
+    if len(calls) > MAX_BATCH_SIZE:
+        write_response(
+            build_error_response(
+                None, "batch_too_large", f"Batches are limited to {MAX_BATCH_SIZE} calls"
+            )
+        )
+        return
+
+    authorized = validate_batch_password(calls)
+    if not authorized:
+        write_response(
+            [
+                build_error_response(
+                    call.get("id") if isinstance(call, dict) else None,
+                    "unauthorized",
+                    "Unauthorized",
+                )
+                for call in calls
+            ]
+        )
+        return
+
+    request_executor.submit_batch(
+        [call.get("method") if isinstance(call, dict) else None for call in calls],
+        run=lambda index: execute_batch_call(calls[index], authorized),
+        busy=lambda index: build_error_response(
+            calls[index].get("id") if isinstance(calls[index], dict) else None,
+            "busy",
+            "Request queue is full",
+        ),
+        on_complete=write_response,
+        params=[call.get("params") if isinstance(call, dict) else None for call in calls],
+    )
+
+
+def set_protocol(request_payload: dict):
+    """Switch stdin/stdout framing; the response is the last frame in the old protocol."""
+    global rpc_protocol
+
+    request_id = request_payload.get("id")
+    params = request_payload.get("params") or {}
+
+    if not validate_rpc_password_value(request_payload.get("rpc_password")):
+        write_response(build_error_response(request_id, "unauthorized", "Unauthorized"))
+        return
+
+    if request_id is None or not isinstance(params, dict):
+        write_response(build_error_response(request_id, "invalid_request", "Invalid request"))
+        return
+
+    try:
+        new_protocol = create_protocol(params.get("version"), params.get("codec") or "json")
+    except ValueError as error:
+        write_response(build_error_response(request_id, str(error)))
+        return
+
+    with stdout_lock:
+        # The writer puts small responses ahead of other frames; drain it so the
+        # response really is the last old-protocol frame on the wire
+        stdout_writer.flush()
+        write_response(
+            {
+                "id": request_id,
+                "result": {
+                    "protocolVersion": new_protocol.version,
+                    "codec": new_protocol.codec.name,
+                },
+            }
+        )
+        stdout_writer.flush()
+        rpc_protocol = new_protocol
+
+    logger.info(
+        "Switched RPC protocol to version %s (%s)", new_protocol.version, new_protocol.codec.name
+    )
+
+
+def start_stdio_rpc_loop():
+    signal.signal(signal.SIGTERM, handle_termination_signal)
+    write_response(
+        {
+            "event": "ready",
+            "protocolVersion": rpc_protocol.version,
+            "protocolVersions": SUPPORTED_PROTOCOL_VERSIONS,
+            "codecs": available_codecs(),
+            "startup": startup_status()["stage"],
+        }
+    )
+    threading.Thread(target=run_startup, name="startup", daemon=True).start()
+
+    stdin = sys.stdin.buffer
+    while True:
         try:
-            payload = json.loads(line)
+            frame = rpc_protocol.read_frame(stdin)
+        except EOFError as error:
+            logger.error("Closing RPC input stream: %s", error)
+            break
+
+        if frame is None:
+            break
+
+        try:
+            payload = rpc_protocol.decode(frame)
         except Exception:
-            write_response(build_error_response(None, "invalid_json", "Invalid JSON"))
+            if rpc_protocol.version == LINE_PROTOCOL_VERSION:
+                write_response(build_error_response(None, "invalid_json", "Invalid JSON"))
+            else:
+                write_response(build_error_response(None, "invalid_frame", "Invalid frame"))
+            continue
+
+        if isinstance(payload, list):
+            submit_batch(payload)
             continue
 
         if not isinstance(payload, dict):
             write_response(build_error_response(None, "invalid_request", "Request must be an object"))
             continue
 
-        request_thread = threading.Thread(
-            target=handle_request,
-            args=(payload,),
-            daemon=True,
-        )
-        request_thread.start()
+        # Handled on the reader thread so the next frame is already read
+        # with the new protocol
+        if payload.get("method") == "set_protocol":
+            set_protocol(payload)
+            continue
 
+        submit_request(payload)
 
-bootstrap_downloads()
+    logger.info("RPC input stream closed, shutting down")
+    run_shutdown_hooks()
+
+
+def submit_request(request_payload: dict):
+    method = request_payload.get("method")
+    if not request_executor.submit(
+        method, handle_request, request_payload, params=request_payload.get("params")
+    ):
+        write_response(
+            build_error_response(
+                request_payload.get("id"), "busy", "Request queue is full"
+            )
+        )
 
 
 if __name__ == "__main__":
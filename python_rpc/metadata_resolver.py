@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from rpc_metrics import LatencyHistogram
+
+
+class _Lookup:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class MetadataResolver:
+    """Resolve torrent metadata with per-info-hash request coalescing.
+
+    Concurrent callers for the same info-hash share one in-flight lookup.
+    At most ``max_parallel`` lookups run at once; further lookups wait in a
+    FIFO queue until a slot frees up or their own deadline passes.
+    ``info_hash`` must be normalized (lowercase hex) by the caller, or the
+    same torrent given as hex and as base32 would not be coalesced.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable,
+        cache_lookup: Optional[Callable] = None,
+        max_parallel: int = 2,
+    ):
+        self.fetch = fetch
+        self.cache_lookup = cache_lookup
+        self.max_parallel = max(1, max_parallel)
+        self.condition = threading.Condition()
+        self.inflight = {}
+        self.waiting = deque()
+        self.active = 0
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "timeouts": 0,
+        }
+        self.slot_wait = LatencyHistogram()
+        self.fetch_time = LatencyHistogram()
+
+    def stats(self):
+        with self.condition:
+            return {
+                **self.counters,
+                "active": self.active,
+                "queued": len(self.waiting),
+                "inflight": len(self.inflight),
+                "maxParallel": self.max_parallel,
+                "slotWait": self.slot_wait.snapshot(),
+                "fetchTime": self.fetch_time.snapshot(),
+            }
+
+    def _count(self, name: str):
+        with self.condition:
+            self.counters[name] += 1
+
+    def resolve(self, info_hash: str, timeout_seconds: float, *fetch_args):
+        deadline = time.monotonic() + timeout_seconds
+
+        if self.cache_lookup is not None:
+            cached = self.cache_lookup(info_hash)
+            if cached is not None:
+                self._count("hits")
+                return cached
+
+        # The caller's deadline may already have passed while it was queued
+        if timeout_seconds <= 0:
+            self._count("timeouts")
+            raise TimeoutError("metadata_timeout")
+
+        with self.condition:
+            lookup = self.inflight.get(info_hash)
+            is_owner = lookup is None
+            if is_owner:
+                lookup = _Lookup()
+                self.inflight[info_hash] = lookup
+                self.counters["misses"] += 1
+            else:
+                self.counters["coalesced"] += 1
+
+        if not is_owner:
+            if not lookup.done.wait(max(deadline - time.monotonic(), 0)):
+                self._count("timeouts")
+                raise TimeoutError("metadata_timeout")
+
+            if lookup.error is not None:
+                raise lookup.error
+
+            return lookup.result
+
+        try:
+            self._acquire_slot(deadline)
+        except TimeoutError as error:
+            self._finish(info_hash, lookup, error=error)
+            raise
+
+        fetch_started = time.monotonic()
+        try:
+            remaining = max(deadline - fetch_started, 0)
+            lookup.result = self.fetch(info_hash, remaining, *fetch_args)
+        except TimeoutError as error:
+            self._count("timeouts")
+            self._finish(info_hash, lookup, error=error)
+            raise
+        except BaseException as error:
+            self._finish(info_hash, lookup, error=error)
+            raise
+        finally:
+            self.fetch_time.record(time.monotonic() - fetch_started)
+            self._release_slot()
+
+        self._finish(info_hash, lookup)
+        return lookup.result
+
+    def _acquire_slot(self, deadline: float):
+        ticket = object()
+        wait_started = time.monotonic()
+
+        with self.condition:
+            self.waiting.append(ticket)
+            try:
+                while not (self.waiting[0] is ticket and self.active < self.max_parallel):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters["timeouts"] += 1
+                        raise TimeoutError("metadata_timeout")
+
+                    self.condition.wait(remaining)
+            finally:
+                self.waiting.remove(ticket)
+                self.condition.notify_all()
+
+            self.active += 1
+
+        self.slot_wait.record(time.monotonic() - wait_started)
+
+    def _release_slot(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def _finish(self, info_hash: str, lookup: _Lookup, error: Optional[BaseException] = None):
+        with self.condition:
+            lookup.error = error
+            self.inflight.pop(info_hash, None)
+        lookup.done.set()
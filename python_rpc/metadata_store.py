@@ -0,0 +1,165 @@
+import base64
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import libtorrent as lt
+
+TORRENT_FILE_SUFFIX = ".torrent"
+
+
+def info_hash_to_hex(info_hash: str) -> str:
+    """Normalize a hex or base32 btih value to lowercase hex."""
+    if len(info_hash) == 32:
+        return base64.b32decode(info_hash.upper()).hex()
+
+    return info_hash.lower()
+
+
+def torrent_info_hash_hex(torrent_info) -> str:
+    """Return the v1 info-hash of ``torrent_info``, which is what magnets carry."""
+    info_hashes = getattr(torrent_info, "info_hashes", None)
+    if callable(info_hashes):
+        hashes = info_hashes()
+        if hashes.has_v1():
+            return str(hashes.v1)
+
+    return str(torrent_info.info_hash())
+
+
+def write_file_atomic(path: str, data: bytes):
+    directory = os.path.dirname(path)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class MetadataStore:
+    """Disk-backed cache of torrent info dicts keyed by v1 info-hash.
+
+    Entries are kept in LRU order with a total byte budget; touching or
+    evicting an entry is O(1). Recency survives restarts through file mtimes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        self.logger = logging.getLogger("hydra.metadata")
+        self.lock = threading.RLock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load_index()
+        except OSError:
+            self.logger.warning("Metadata store unavailable at %s", directory, exc_info=True)
+
+    def _path_for(self, info_hash: str) -> str:
+        return os.path.join(self.directory, info_hash + TORRENT_FILE_SUFFIX)
+
+    def _load_index(self):
+        found = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name.endswith(TORRENT_FILE_SUFFIX):
+                continue
+
+            stat = entry.stat()
+            found.append((stat.st_mtime, entry.name[: -len(TORRENT_FILE_SUFFIX)], stat.st_size))
+
+        for _, info_hash, size in sorted(found):
+            self.entries[info_hash] = size
+            self.total_bytes += size
+
+        self._evict()
+
+    def _evict(self):
+        while self.entries and self.total_bytes > self.max_bytes:
+            info_hash, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.unlink(self._path_for(info_hash))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "maxBytes": self.max_bytes,
+            }
+
+    def __contains__(self, info_hash: str) -> bool:
+        with self.lock:
+            return info_hash_to_hex(info_hash) in self.entries
+
+    def get(self, info_hash: str):
+        info_hash = info_hash_to_hex(info_hash)
+
+        with self.lock:
+            if info_hash not in self.entries:
+                return None
+
+            self.entries.move_to_end(info_hash)
+            path = self._path_for(info_hash)
+
+        try:
+            with open(path, "rb") as torrent_file:
+                data = torrent_file.read()
+            os.utime(path)
+            return lt.torrent_info(lt.bdecode(data))
+        except Exception:
+            self.logger.warning("Dropping unreadable metadata for %s", info_hash, exc_info=True)
+            self.discard(info_hash)
+            return None
+
+    def put(self, info_hash: str, torrent_info) -> bool:
+        info_hash = info_hash_to_hex(info_hash)
+
+        try:
+            data = b"d4:info" + bytes(torrent_info.info_section()) + b"e"
+        except Exception:
+            self.logger.warning("Failed to serialize metadata for %s", info_hash, exc_info=True)
+            return False
+
+        if len(data) > self.max_bytes:
+            return False
+
+        with self.lock:
+            try:
+                write_file_atomic(self._path_for(info_hash), data)
+            except OSError:
+                self.logger.warning("Failed to persist metadata for %s", info_hash, exc_info=True)
+                return False
+
+            self.total_bytes -= self.entries.pop(info_hash, 0)
+            self.entries[info_hash] = len(data)
+            self.total_bytes += len(data)
+            self._evict()
+
+        return True
+
+    def discard(self, info_hash: str):
+        info_hash = info_hash_to_hex(info_hash)
+
+        with self.lock:
+            size = self.entries.pop(info_hash, None)
+            if size is None:
+                return
+
+            self.total_bytes -= size
+            try:
+                os.unlink(self._path_for(info_hash))
+            except OSError:
+                pass
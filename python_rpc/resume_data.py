@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+from typing import Callable, Iterable, Optional
+
+import libtorrent as lt
+
+from metadata_store import write_file_atomic
+
+RESUME_FILE_SUFFIX = ".fastresume"
+RESUME_SAVE_FLAGS = (
+    lt.torrent_handle.flush_disk_cache
+    | lt.torrent_handle.save_info_dict
+    | lt.torrent_handle.only_if_modified
+)
+
+
+def add_torrent_params_hash_hex(params) -> str:
+    info_hashes = getattr(params, "info_hashes", None)
+    if info_hashes is not None and info_hashes.has_v1():
+        return str(info_hashes.v1)
+
+    return str(params.info_hash)
+
+
+class ResumeDataStore:
+    """Keeps libtorrent fast-resume data on disk, one file per v1 info-hash.
+
+    ``save_resume_data()`` is requested periodically for every handle that
+    reports ``need_save_resume``; the resulting alerts are written atomically
+    from the alert pump thread.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        alert_pump,
+        get_handles: Callable[[], Iterable],
+        save_interval_seconds: float = 60.0,
+    ):
+        self.directory = directory
+        self.alert_pump = alert_pump
+        self.get_handles = get_handles
+        self.save_interval_seconds = max(save_interval_seconds, 1.0)
+        self.logger = logging.getLogger("hydra.resume")
+        self.condition = threading.Condition()
+        self.outstanding = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            self.logger.warning("Resume data directory unavailable: %s", directory, exc_info=True)
+
+        alert_pump.add_listener(lt.save_resume_data_alert, self._on_resume_data)
+        alert_pump.add_listener(lt.save_resume_data_failed_alert, self._on_resume_failed)
+
+    def _path_for(self, info_hash: str) -> str:
+        return os.path.join(self.directory, info_hash + RESUME_FILE_SUFFIX)
+
+    def load(self, info_hash: str):
+        """Return ``add_torrent_params`` read from stored resume data, if any."""
+        path = self._path_for(info_hash)
+        try:
+            with open(path, "rb") as resume_file:
+                data = resume_file.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            self.logger.warning("Failed to read resume data %s", path, exc_info=True)
+            return None
+
+        try:
+            return lt.read_resume_data(data)
+        except Exception:
+            self.logger.warning("Discarding corrupt resume data %s", path, exc_info=True)
+            self.discard(info_hash)
+            return None
+
+    def discard(self, info_hash: str):
+        try:
+            os.unlink(self._path_for(info_hash))
+        except OSError:
+            pass
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="resume-data", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush_timeout_seconds: float = 5.0):
+        self._stop.set()
+        self.save_all(only_if_needed=True, wait_timeout_seconds=flush_timeout_seconds)
+
+    def save_all(self, only_if_needed: bool = True, wait_timeout_seconds: Optional[float] = None):
+        requested = 0
+
+        for handle in list(self.get_handles()):
+            try:
+                if not handle.is_valid():
+                    continue
+
+                snapshot = self.alert_pump.get_status(handle)
+                if snapshot is None:
+                    snapshot = handle.status(flags=0)
+
+                if not snapshot.has_metadata:
+                    continue
+
+                if only_if_needed and not snapshot.need_save_resume:
+                    continue
+            except Exception:
+                self.logger.warning("Failed to read status for resume data", exc_info=True)
+                continue
+
+            with self.condition:
+                self.outstanding += 1
+
+            try:
+                handle.save_resume_data(RESUME_SAVE_FLAGS)
+                requested += 1
+            except Exception:
+                self._finish_request()
+                self.logger.warning("Failed to request resume data", exc_info=True)
+
+        if wait_timeout_seconds:
+            with self.condition:
+                self.condition.wait_for(lambda: self.outstanding == 0, wait_timeout_seconds)
+
+        return requested
+
+    def _run(self):
+        while not self._stop.wait(self.save_interval_seconds):
+            try:
+                self.save_all(only_if_needed=True)
+            except Exception:
+                self.logger.exception("Periodic resume data save failed")
+
+    def _finish_request(self):
+        with self.condition:
+            self.outstanding = max(self.outstanding - 1, 0)
+            self.condition.notify_all()
+
+    def _on_resume_data(self, alert):
+        try:
+            info_hash = add_torrent_params_hash_hex(alert.params)
+            write_file_atomic(self._path_for(info_hash), lt.write_resume_data_buf(alert.params))
+        except Exception:
+            self.logger.warning("Failed to write resume data", exc_info=True)
+        finally:
+            self._finish_request()
+
+    def _on_resume_failed(self, alert):
+        self._finish_request()
@@ -0,0 +1,160 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from rpc_metrics import LatencyHistogram
+
+_task_context = threading.local()
+
+
+def current_queue_wait() -> float:
+    """Seconds the task running on this worker thread spent queued; 0 elsewhere.
+
+    Calls with a deadline count it against their timeout, so time spent
+    behind other calls in a full lane is not added on top.
+    """
+    return getattr(_task_context, "queue_wait", 0.0)
+
+
+class WorkerLane:
+    def __init__(self, name: str, max_workers: int, max_queue_size: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.queue = queue.Queue(maxsize=max(1, max_queue_size))
+        self.logger = logging.getLogger("hydra.rpc.executor")
+        self.workers = []
+        self.queue_wait = LatencyHistogram()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+
+            for worker_index in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._run,
+                    name="rpc-{lane}-{index}".format(lane=self.name, index=worker_index),
+                    daemon=True,
+                )
+                worker.start()
+                self.workers.append(worker)
+
+            self._started = True
+
+    def submit(self, task: Callable, *args) -> bool:
+        self.start()
+
+        try:
+            self.queue.put_nowait((task, args, time.monotonic()))
+        except queue.Full:
+            return False
+
+        return True
+
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending(),
+            "queueWait": self.queue_wait.snapshot(),
+        }
+
+    def _run(self):
+        while True:
+            task, args, enqueued_at = self.queue.get()
+            queue_wait = time.monotonic() - enqueued_at
+            self.queue_wait.record(queue_wait)
+            _task_context.queue_wait = queue_wait
+            try:
+                task(*args)
+            except Exception:
+                self.logger.exception("Unhandled error in %s lane worker", self.name)
+            finally:
+                _task_context.queue_wait = 0.0
+                self.queue.task_done()
+
+
+class RequestExecutor:
+    """Fixed-size worker pool that routes RPC requests into per-method lanes.
+
+    A lane rejects new work once its queue is full so callers can answer with
+    an explicit ``busy`` error instead of spawning more threads.
+
+    ``lane_selector(method, params)`` may pick a lane from the call's params
+    (e.g. one action that waits for metadata, another that must not); it
+    returns ``None`` to fall back to ``method_lanes``.
+    """
+
+    def __init__(
+        self,
+        lanes: Iterable[WorkerLane],
+        method_lanes: Dict[str, str],
+        default_lane: str,
+        lane_selector: Optional[Callable[[Optional[str], Any], Optional[str]]] = None,
+    ):
+        self.lanes = {lane.name: lane for lane in lanes}
+        self.method_lanes = dict(method_lanes)
+        self.default_lane = default_lane
+        self.lane_selector = lane_selector
+
+        if default_lane not in self.lanes:
+            raise ValueError("unknown_default_lane")
+
+    def lane_for(self, method: Optional[str], params: Any = None) -> WorkerLane:
+        lane_name = None
+        if self.lane_selector is not None:
+            lane_name = self.lane_selector(method, params)
+        if lane_name is None:
+            lane_name = self.method_lanes.get(method, self.default_lane)
+        return self.lanes.get(lane_name) or self.lanes[self.default_lane]
+
+    def submit(self, method: Optional[str], task: Callable, *args, params: Any = None) -> bool:
+        return self.lane_for(method, params).submit(task, *args)
+
+    def submit_batch(
+        self,
+        methods: List[Optional[str]],
+        run: Callable[[int], Any],
+        busy: Callable[[int], Any],
+        on_complete: Callable[[list], None],
+        params: Optional[List[Any]] = None,
+    ):
+        """Run ``run(index)`` for every call of a batch on its method's lane.
+
+        Calls that do not fit in their lane get ``busy(index)`` instead. Once
+        every call has a result, ``on_complete`` receives them in request
+        order, on whichever thread finished last.
+        """
+        results = [None] * len(methods)
+        pending = [len(methods)]
+        pending_lock = threading.Lock()
+
+        def finish(index: int, result):
+            results[index] = result
+            with pending_lock:
+                pending[0] -= 1
+                done = pending[0] == 0
+            if done:
+                on_complete(results)
+
+        def task(index: int):
+            try:
+                result = run(index)
+            except Exception:
+                logging.getLogger("hydra.rpc.executor").exception("Unhandled error in batch call")
+                result = None
+            finish(index, result)
+
+        for index, method in enumerate(methods):
+            call_params = params[index] if params is not None else None
+            if not self.submit(method, task, index, params=call_params):
+                finish(index, busy(index))
+
+    def stats(self):
+        return {name: lane.stats() for name, lane in self.lanes.items()}
@@ -0,0 +1,180 @@
+import bisect
+import threading
+import time
+from typing import Iterable, Optional
+
+import libtorrent as lt
+
+# Upper bounds of the latency buckets: 0.1ms doubling up to ~105s
+LATENCY_BUCKET_BOUNDS = tuple(0.0001 * 2**exponent for exponent in range(21))
+
+SESSION_STATS_GAUGES = (
+    "disk.queued_disk_jobs",
+    "disk.num_running_disk_jobs",
+    "disk.blocked_disk_jobs",
+    "disk.queued_write_bytes",
+    "peer.num_peers_connected",
+    "peer.num_peers_half_open",
+    "net.limiter_up_queue",
+    "net.limiter_down_queue",
+    "ses.num_checking_torrents",
+    "ses.num_downloading_torrents",
+    "ses.num_seeding_torrents",
+    "dht.dht_nodes",
+)
+
+SESSION_STATS_COUNTERS = (
+    "net.recv_bytes",
+    "net.sent_bytes",
+    "net.recv_payload_bytes",
+    "net.sent_payload_bytes",
+    "net.recv_failed_bytes",
+    "disk.num_blocks_read",
+    "disk.num_blocks_written",
+    "disk.num_read_ops",
+    "disk.num_write_ops",
+    "ses.num_piece_passed",
+    "ses.num_piece_failed",
+)
+
+
+class LatencyHistogram:
+    """Fixed log-scale histogram; percentiles are reported as bucket upper bounds."""
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKET_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.lock = threading.Lock()
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self.lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def _percentile(self, fraction: float) -> float:
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if bucket_count and seen >= target:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "count": self.count,
+                "meanMs": self.total / self.count * 1000 if self.count else 0.0,
+                "p50Ms": self._percentile(0.5) * 1000,
+                "p95Ms": self._percentile(0.95) * 1000,
+                "p99Ms": self._percentile(0.99) * 1000,
+                "maxMs": self.max * 1000,
+            }
+
+
+class MethodMetrics:
+    """Per-method latency histograms and error counts of handled RPC calls."""
+
+    def __init__(self, methods: Iterable[str], other: str = "other"):
+        self.methods = frozenset(methods)
+        self.other = other
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.errors = {}
+
+    def record(self, method, seconds: float, error_code: Optional[str] = None):
+        # Unknown method names are folded together so clients cannot grow the map
+        name = method if method in self.methods else self.other
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            if error_code is not None:
+                errors = self.errors.setdefault(name, {})
+                errors[error_code] = errors.get(error_code, 0) + 1
+
+        histogram.record(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            histograms = dict(self.histograms)
+            errors = {name: dict(codes) for name, codes in self.errors.items()}
+
+        return {
+            name: {**histogram.snapshot(), "errors": errors.get(name, {})}
+            for name, histogram in sorted(histograms.items())
+        }
+
+
+class SessionStatsSampler:
+    """Reads selected ``post_session_stats`` counters through the alert pump.
+
+    Counter rates are computed against the previous sample, so the first
+    call only reports totals.
+    """
+
+    def __init__(self, torrent_session, alert_pump):
+        self.session = torrent_session
+        self.condition = threading.Condition()
+        self.values = None
+        self.sampled_at = None
+        self.generation = 0
+        self.previous = None
+        alert_pump.add_listener(lt.session_stats_alert, self._on_stats)
+
+    def _on_stats(self, alert):
+        with self.condition:
+            self.values = dict(alert.values)
+            self.sampled_at = time.monotonic()
+            self.generation += 1
+            self.condition.notify_all()
+
+    def sample(self, timeout_seconds: float = 1.0):
+        with self.condition:
+            generation = self.generation
+
+        self.session.post_session_stats()
+
+        with self.condition:
+            fresh = self.condition.wait_for(lambda: self.generation > generation, timeout_seconds)
+            if self.values is None:
+                return None
+
+            values = self.values
+            sampled_at = self.sampled_at
+            previous = self.previous
+            if fresh:
+                self.previous = (sampled_at, values)
+
+        gauges = {name: values.get(name, 0) for name in SESSION_STATS_GAUGES}
+        counters = {name: values.get(name, 0) for name in SESSION_STATS_COUNTERS}
+        result = {"gauges": gauges, "counters": counters, "stale": not fresh}
+
+        if fresh and previous is not None and sampled_at > previous[0]:
+            elapsed = sampled_at - previous[0]
+            result["intervalMs"] = int(elapsed * 1000)
+            result["ratesPerSecond"] = {
+                name: (value - previous[1].get(name, 0)) / elapsed for name, value in counters.items()
+            }
+
+        return result
+
+
+def thread_counts():
+    """Live threads grouped by name with the trailing worker index dropped."""
+    groups = {}
+    threads = threading.enumerate()
+    for thread in threads:
+        prefix, _, suffix = thread.name.rpartition("-")
+        name = prefix if prefix and suffix.isdigit() else thread.name
+        groups[name] = groups.get(name, 0) + 1
+
+    return {"total": len(threads), "byName": dict(sorted(groups.items()))}
@@ -0,0 +1,154 @@
+import importlib
+import importlib.util
+import json
+import struct
+from typing import Optional
+
+LINE_PROTOCOL_VERSION = 1
+FRAMED_PROTOCOL_VERSION = 2
+SUPPORTED_PROTOCOL_VERSIONS = [LINE_PROTOCOL_VERSION, FRAMED_PROTOCOL_VERSION]
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class JsonCodec:
+    name = "json"
+
+    def encode(self, payload) -> bytes:
+        return json.dumps(payload, ensure_ascii=True, separators=(",", ":")).encode("ascii")
+
+    def decode(self, data: bytes):
+        return json.loads(data)
+
+
+# The optional codec modules are only imported once a client switches to
+# them; startup just checks that they are installed
+def module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class MsgpackCodec:
+    name = "msgpack"
+
+    def __init__(self):
+        self.msgpack = importlib.import_module("msgpack")
+
+    def encode(self, payload) -> bytes:
+        return self.msgpack.packb(payload, use_bin_type=True)
+
+    def decode(self, data: bytes):
+        return self.msgpack.unpackb(data, raw=False)
+
+
+class CborCodec:
+    name = "cbor"
+
+    def __init__(self):
+        self.cbor2 = importlib.import_module("cbor2")
+
+    def encode(self, payload) -> bytes:
+        return self.cbor2.dumps(payload)
+
+    def decode(self, data: bytes):
+        return self.cbor2.loads(data)
+
+
+CODECS = {
+    JsonCodec.name: (JsonCodec, True),
+    MsgpackCodec.name: (MsgpackCodec, module_available("msgpack")),
+    CborCodec.name: (CborCodec, module_available("cbor2")),
+}
+
+
+def available_codecs():
+    return [name for name, (_, available) in CODECS.items() if available]
+
+
+class LineProtocol:
+    """Protocol 1: one JSON document per ``\\n``-terminated line."""
+
+    version = LINE_PROTOCOL_VERSION
+
+    def __init__(self):
+        self.codec = JsonCodec()
+
+    def encode_frame(self, payload) -> bytes:
+        return self.codec.encode(payload) + b"\n"
+
+    def read_frame(self, stream) -> Optional[bytes]:
+        """Return the next non-empty line from the binary ``stream``, or None at EOF."""
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+
+            line = line.strip()
+            if line:
+                return line
+
+    def decode(self, frame: bytes):
+        return self.codec.decode(frame)
+
+
+class FramedProtocol:
+    """Protocol 2: a 4-byte big-endian length followed by one encoded payload."""
+
+    version = FRAMED_PROTOCOL_VERSION
+
+    def __init__(self, codec):
+        self.codec = codec
+
+    def encode_frame(self, payload) -> bytes:
+        data = self.codec.encode(payload)
+        return FRAME_HEADER.pack(len(data)) + data
+
+    def read_frame(self, stream) -> Optional[bytes]:
+        header = self._read_exactly(stream, FRAME_HEADER.size)
+        if header is None:
+            return None
+
+        (length,) = FRAME_HEADER.unpack(header)
+        if length > MAX_FRAME_BYTES:
+            # The stream cannot be resynchronized after a bogus header
+            raise EOFError("frame_too_large")
+
+        frame = self._read_exactly(stream, length)
+        if frame is None:
+            raise EOFError("truncated_frame")
+        return frame
+
+    def decode(self, frame: bytes):
+        return self.codec.decode(frame)
+
+    def _read_exactly(self, stream, size: int) -> Optional[bytes]:
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = stream.read(remaining)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+def create_protocol(version: int, codec_name: str = JsonCodec.name):
+    if version == LINE_PROTOCOL_VERSION:
+        if codec_name != JsonCodec.name:
+            raise ValueError("invalid_codec")
+        return LineProtocol()
+
+    if version != FRAMED_PROTOCOL_VERSION:
+        raise ValueError("invalid_protocol_version")
+
+    codec_class, available = CODECS.get(codec_name, (None, False))
+    if not available:
+        raise ValueError("invalid_codec")
+
+    try:
+        codec = codec_class()
+    except ImportError as error:
+        raise ValueError("invalid_codec") from error
+
+    return FramedProtocol(codec)
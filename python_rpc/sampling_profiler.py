@@ -0,0 +1,141 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_PROFILE_INTERVAL_MS = 10
+MIN_PROFILE_INTERVAL_MS = 1
+MAX_PROFILE_INTERVAL_MS = 1000
+MAX_PROFILE_SECONDS = 600
+
+
+class SamplingProfiler:
+    """Samples the stacks of every thread and writes them as folded stacks.
+
+    ``cProfile`` only sees the thread that enabled it, while stalls in this
+    process usually come from lane workers, the alert pump or libtorrent
+    calls. Sampling ``sys._current_frames`` covers all of them. The output
+    has one ``thread;outer;...;inner count`` line per distinct stack, which
+    ``flamegraph.pl`` and speedscope read directly.
+
+    A run stops by itself after ``MAX_PROFILE_SECONDS`` so a forgotten
+    toggle does not keep sampling forever.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.logger = logging.getLogger("hydra.profiler")
+        self.lock = threading.Lock()
+        # Serializes start/stop so a profile is never reset while being written
+        self.toggle_lock = threading.Lock()
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.interval_seconds = DEFAULT_PROFILE_INTERVAL_MS / 1000
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self):
+        with self.lock:
+            return {
+                "running": self._running(),
+                "samples": self.samples,
+                "intervalMs": int(self.interval_seconds * 1000),
+                "elapsedMs": (
+                    int((time.monotonic() - self.started_at) * 1000)
+                    if self.started_at is not None
+                    else 0
+                ),
+            }
+
+    def start(self, interval_ms: int = DEFAULT_PROFILE_INTERVAL_MS):
+        interval_ms = max(MIN_PROFILE_INTERVAL_MS, min(interval_ms, MAX_PROFILE_INTERVAL_MS))
+        with self.toggle_lock, self.lock:
+            if self._thread is not None:
+                raise ValueError("profiler_running")
+
+            self.stacks = Counter()
+            self.samples = 0
+            self.started_at = time.monotonic()
+            self.interval_seconds = interval_ms / 1000
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+        return self.status()
+
+    def stop(self) -> dict:
+        """Stop sampling and write the profile; returns its path and sample count."""
+        with self.toggle_lock:
+            return self._stop_and_write()
+
+    def _stop_and_write(self) -> dict:
+        with self.lock:
+            thread = self._thread
+        if thread is None:
+            raise ValueError("profiler_not_running")
+
+        self._stop.set()
+        thread.join()
+
+        with self.lock:
+            self._thread = None
+            stacks = self.stacks
+            samples = self.samples
+            elapsed = time.monotonic() - self.started_at
+            self.started_at = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(
+            self.output_dir, "profile-{stamp}.folded".format(stamp=time.strftime("%Y%m%d-%H%M%S"))
+        )
+        with open(path, "w", encoding="utf-8") as profile_file:
+            for stack, count in stacks.most_common():
+                profile_file.write("{stack} {count}\n".format(stack=stack, count=count))
+
+        self.logger.info("Wrote %s samples over %.1fs to %s", samples, elapsed, path)
+        return {
+            "path": path,
+            "samples": samples,
+            "stacks": len(stacks),
+            "elapsedMs": int(elapsed * 1000),
+        }
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + MAX_PROFILE_SECONDS
+
+        while not self._stop.wait(self.interval_seconds):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            sampled = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(
+                        "{name} ({file}:{line})".format(
+                            name=code.co_name,
+                            file=os.path.basename(code.co_filename),
+                            line=code.co_firstlineno,
+                        )
+                    )
+                    frame = frame.f_back
+
+                frames.append(names.get(ident, str(ident)))
+                sampled.append(";".join(reversed(frames)))
+
+            with self.lock:
+                self.stacks.update(sampled)
+                self.samples += 1
+
+            if time.monotonic() >= deadline:
+                self.logger.warning("Profiler stopped sampling after %ss", MAX_PROFILE_SECONDS)
+                break
@@ -0,0 +1,125 @@
+import logging
+import threading
+from typing import Optional
+
+DEFAULT_SESSION_PROFILE = "default"
+
+# libtorrent 2.x caches through the OS; this bounds the bytes waiting to be
+# written, which is the closest thing to a disk cache size it still has
+DISK_CACHE_SETTING = "max_queued_disk_bytes"
+
+# Values are libtorrent settings_pack entries. Keys the running libtorrent
+# build does not know (e.g. cache_size on 2.x) are skipped when applied.
+SESSION_PROFILES = {
+    DEFAULT_SESSION_PROFILE: {},
+    "high_throughput": {
+        "cache_size": 8192,
+        "aio_threads": 16,
+        "hashing_threads": 4,
+        "checking_mem_usage": 1024,
+        "max_queued_disk_bytes": 256 * 1024 * 1024,
+        "connections_limit": 800,
+        "max_out_request_queue": 1500,
+        "max_allowed_in_request_queue": 4000,
+        "request_queue_time": 5,
+        "send_buffer_watermark": 4 * 1024 * 1024,
+        "send_buffer_low_watermark": 1024 * 1024,
+        "send_buffer_watermark_factor": 150,
+        "mixed_mode_algorithm": 1,  # peer_proportional
+        "file_pool_size": 200,
+    },
+    "low_memory": {
+        "cache_size": 256,
+        "aio_threads": 2,
+        "hashing_threads": 1,
+        "checking_mem_usage": 32,
+        "max_queued_disk_bytes": 4 * 1024 * 1024,
+        "connections_limit": 80,
+        "max_out_request_queue": 200,
+        "max_allowed_in_request_queue": 500,
+        "send_buffer_watermark": 128 * 1024,
+        "send_buffer_low_watermark": 8 * 1024,
+        "send_buffer_watermark_factor": 50,
+        "max_peerlist_size": 500,
+        "file_pool_size": 20,
+    },
+    "seed_box": {
+        "cache_size": 4096,
+        "aio_threads": 8,
+        "connections_limit": 1000,
+        "unchoke_slots_limit": 32,
+        "seed_choking_algorithm": 1,  # fastest_upload
+        "suggest_mode": 1,  # suggest_read_cache
+        "send_buffer_watermark": 2 * 1024 * 1024,
+        "send_buffer_low_watermark": 512 * 1024,
+        "send_buffer_watermark_factor": 100,
+        "max_allowed_in_request_queue": 4000,
+        "file_pool_size": 500,
+    },
+}
+
+
+class SessionProfileManager:
+    """Switches a libtorrent session between named settings profiles.
+
+    The session's values for every key any profile touches are captured on
+    construction, so switching back to ``default`` restores them.
+
+    Downloads can also ask for a larger disk write queue than the profile
+    gives; the largest such floor is layered on top of the active profile
+    until its owner releases it.
+    """
+
+    def __init__(self, torrent_session):
+        self.session = torrent_session
+        self.logger = logging.getLogger("hydra.profiles")
+        self.lock = threading.Lock()
+        self.current = DEFAULT_SESSION_PROFILE
+        self.disk_cache_floors = {}
+
+        current_settings = self.session.get_settings()
+        self.supported_keys = set(current_settings)
+        self.baseline = {
+            key: current_settings[key]
+            for profile in SESSION_PROFILES.values()
+            for key in profile
+            if key in current_settings
+        }
+        if DISK_CACHE_SETTING in current_settings:
+            self.baseline.setdefault(DISK_CACHE_SETTING, current_settings[DISK_CACHE_SETTING])
+
+    def apply(self, name: str):
+        profile = SESSION_PROFILES.get(name)
+        if profile is None:
+            raise ValueError("invalid_profile")
+
+        with self.lock:
+            self.session.apply_settings(self._settings_for(profile))
+            self.current = name
+
+        self.logger.info("Applied session profile: %s", name)
+
+    def set_disk_cache_floor(self, owner, size_bytes: Optional[int]):
+        """Keep the disk write queue at ``size_bytes`` or more until ``owner`` passes None."""
+        with self.lock:
+            if size_bytes is None:
+                if self.disk_cache_floors.pop(owner, None) is None:
+                    return
+            else:
+                self.disk_cache_floors[owner] = size_bytes
+
+            settings = self._settings_for(SESSION_PROFILES[self.current])
+            if DISK_CACHE_SETTING in settings:
+                self.session.apply_settings({DISK_CACHE_SETTING: settings[DISK_CACHE_SETTING]})
+
+    def _settings_for(self, profile):
+        settings = dict(self.baseline)
+        settings.update(
+            {key: value for key, value in profile.items() if key in self.supported_keys}
+        )
+
+        if self.disk_cache_floors and DISK_CACHE_SETTING in settings:
+            settings[DISK_CACHE_SETTING] = max(
+                settings[DISK_CACHE_SETTING], max(self.disk_cache_floors.values())
+            )
+        return settings
@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+from typing import Iterable, Optional
+
+import libtorrent as lt
+
+from metadata_store import write_file_atomic
+
+# DHT routing table, settings and IP filter (and extension state)
+SESSION_STATE_FLAGS = lt.save_state_flags_t.all
+
+
+class SessionStateStore:
+    """Keeps the session's persistent state in one file across restarts.
+
+    A fresh session bootstraps the DHT from the router nodes, so the first
+    magnet lookups after launch wait seconds to tens of seconds for peers.
+    ``load()`` returns ``session_params`` holding the previous run's DHT
+    node table, non-default settings and IP filter for the session to be
+    built from. ``start()`` writes the file once ``first_save_delay_seconds``
+    after the session starts, when the DHT has bootstrapped, and then every
+    ``save_interval_seconds``; ``stop()`` writes it once more at shutdown.
+    The process is usually killed rather than exited, so the periodic saves
+    are what most sessions leave behind.
+
+    Settings in ``runtime_keys`` are owned by code that sets them on every
+    start (listen port, profiles, scheduler limits), so they are neither
+    saved nor restored.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        runtime_keys: Iterable[str] = (),
+        save_interval_seconds: float = 5 * 60,
+        first_save_delay_seconds: float = 30,
+    ):
+        self.path = path
+        self.runtime_keys = frozenset(runtime_keys)
+        self.save_interval_seconds = max(save_interval_seconds, 1.0)
+        self.first_save_delay_seconds = max(first_save_delay_seconds, 0.0)
+        self.logger = logging.getLogger("hydra.session_state")
+        self.save_lock = threading.Lock()
+        self.session = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self) -> Optional[lt.session_params]:
+        try:
+            with open(self.path, "rb") as state_file:
+                data = state_file.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            self.logger.warning("Failed to read session state %s", self.path, exc_info=True)
+            return None
+
+        try:
+            params = lt.read_session_params(data, SESSION_STATE_FLAGS)
+        except Exception:
+            self.logger.warning("Discarding corrupt session state %s", self.path, exc_info=True)
+            self.discard()
+            return None
+
+        params.settings = self._without_runtime_keys(params.settings)
+        self.logger.info("Restored session state with %s DHT nodes", self._count_dht_nodes(data))
+        return params
+
+    def discard(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def start(self, torrent_session):
+        if self._thread is not None:
+            return
+
+        self.session = torrent_session
+        self._thread = threading.Thread(target=self._run, name="session-state", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.save()
+
+    def save(self) -> bool:
+        if self.session is None:
+            return False
+
+        with self.save_lock:
+            try:
+                params = self.session.session_state(SESSION_STATE_FLAGS)
+                params.settings = self._without_runtime_keys(params.settings)
+                data = lt.write_session_params_buf(params, SESSION_STATE_FLAGS)
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                write_file_atomic(self.path, data)
+            except Exception:
+                self.logger.warning("Failed to save session state", exc_info=True)
+                return False
+
+        return True
+
+    def _run(self):
+        if self._stop.wait(self.first_save_delay_seconds):
+            return
+
+        self.save()
+        while not self._stop.wait(self.save_interval_seconds):
+            self.save()
+
+    @staticmethod
+    def _count_dht_nodes(data: bytes) -> int:
+        # The bindings cannot convert session_params.dht_state's node lists
+        dht_state = (lt.bdecode(data) or {}).get(b"dht state") or {}
+        return len(dht_state.get(b"nodes") or []) + len(dht_state.get(b"nodes6") or [])
+
+    def _without_runtime_keys(self, settings):
+        return {key: value for key, value in settings.items() if key not in self.runtime_keys}
@@ -26,7 +26,18 @@ def get_windows_openssl_includes():
 
 
 build_exe_options = {
-    "packages": ["libtorrent"],
+    # rpc_protocol imports the optional codecs by name, which the module
+    # finder cannot follow; cbor2 is not a requirement and is not shipped
+    "packages": ["libtorrent", "msgpack"],
+    # Standard library modules the RPC never imports; fewer files to scan
+    # and load when the frozen executable starts
+    "excludes": ["tkinter", "unittest", "pydoc_data", "test", "lib2to3", "distutils"],
+    # Pure Python modules load from the zip archive instead of thousands of
+    # loose files; extension modules (libtorrent, msgpack's C packer) have
+    # to stay on disk
+    "zip_include_packages": ["*"],
+    "zip_exclude_packages": ["libtorrent", "msgpack"],
+    "optimize": 1,
     "build_exe": "hydra-python-rpc",
     "include_msvcr": True,
     "include_files": get_windows_openssl_includes(),
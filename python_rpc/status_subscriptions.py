@@ -0,0 +1,350 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+STATUS_FIELDS = (
+    "folderName",
+    "fileSize",
+    "progress",
+    "downloadSpeed",
+    "uploadSpeed",
+    "numPeers",
+    "numSeeds",
+    "status",
+    "bytesDownloaded",
+)
+
+# Minimum change of a numeric field before it is pushed again. A field that
+# becomes or stops being zero is always pushed, so a stalled speed never
+# stays stuck on the client.
+DEFAULT_STATUS_THRESHOLDS = {
+    "progress": 0.001,
+    "downloadSpeed": 16 * 1024,
+    "uploadSpeed": 16 * 1024,
+    "bytesDownloaded": 1024 * 1024,
+}
+
+DEFAULT_SUBSCRIPTION_INTERVAL_MS = 1000
+MIN_SUBSCRIPTION_INTERVAL_MS = 100
+MAX_SUBSCRIPTION_INTERVAL_MS = 60000
+
+
+def changed_fields(previous: dict, current: dict, thresholds: dict) -> dict:
+    """Return the fields of ``current`` that moved past their threshold since ``previous``."""
+    changes = {}
+    for field, value in current.items():
+        last_value = previous.get(field)
+        threshold = thresholds.get(field)
+        if threshold and isinstance(value, (int, float)) and isinstance(last_value, (int, float)):
+            if (value == 0) != (last_value == 0) or abs(value - last_value) >= threshold:
+                changes[field] = value
+        elif value != last_value or field not in previous:
+            changes[field] = value
+
+    return changes
+
+
+def entry_changed(previous: Optional[dict], current: Optional[dict], thresholds: dict) -> bool:
+    if previous is None or current is None:
+        return previous is not current
+
+    return bool(changed_fields(previous, current, thresholds))
+
+
+class _Subscription:
+    def __init__(
+        self,
+        topic: str,
+        interval_seconds: float,
+        fields,
+        thresholds: dict,
+        delta: bool = False,
+    ):
+        self.topic = topic
+        self.interval_seconds = interval_seconds
+        self.fields = fields
+        self.thresholds = thresholds
+        self.delta = delta
+        self.next_due = 0.0
+        self.generation = None
+        self.sequence = 0
+        self.resync_requested = False
+        self.has_sent = False
+        self.sent = None
+
+    def project(self, entry: Optional[dict]):
+        if entry is None:
+            return None
+
+        projected = {field: entry[field] for field in self.fields if field in entry}
+        if "gameId" in entry:
+            projected["gameId"] = entry["gameId"]
+        return projected
+
+    def describe(self):
+        return {
+            "topic": self.topic,
+            "intervalMs": int(self.interval_seconds * 1000),
+            "fields": list(self.fields),
+            "thresholds": dict(self.thresholds),
+            "delta": self.delta,
+            "seq": self.sequence,
+        }
+
+
+class StatusSubscriptions:
+    """Pushes status changes to the client as ``event`` frames.
+
+    Each topic has a collector returning either one status dict (or None)
+    or a list of dicts keyed by ``gameId``. Every subscribed topic is
+    collected at most once per interval, and a frame is only emitted when a
+    value moved past its threshold. List topics only carry the entries that
+    changed plus the ``gameId`` of entries that disappeared. When
+    ``get_generation`` reports no new torrent updates since the last tick,
+    collection is skipped entirely.
+
+    Every frame carries a per-subscription ``seq``. Delta subscriptions give
+    each game a stable small ``id``: new entries are sent whole in ``add``,
+    later frames only list the fields that changed in ``update`` and
+    ``removed`` holds ids. A client that sees a gap in ``seq`` calls
+    :meth:`resync` and gets a ``full`` frame next.
+    """
+
+    def __init__(
+        self,
+        collectors: Dict[str, Callable],
+        emit: Callable[[dict], None],
+        get_generation: Optional[Callable[[], int]] = None,
+    ):
+        self.collectors = collectors
+        self.emit = emit
+        self.get_generation = get_generation
+        self.logger = logging.getLogger("hydra.subscriptions")
+        self.condition = threading.Condition()
+        self.subscriptions = {}
+        self.torrent_ids = {}
+        self._thread = None
+
+    def subscribe(
+        self,
+        topic: str,
+        interval_ms: int = DEFAULT_SUBSCRIPTION_INTERVAL_MS,
+        fields=None,
+        thresholds: Optional[dict] = None,
+        delta: bool = False,
+    ):
+        if topic not in self.collectors:
+            raise ValueError("invalid_topic")
+
+        interval_ms = max(MIN_SUBSCRIPTION_INTERVAL_MS, min(interval_ms, MAX_SUBSCRIPTION_INTERVAL_MS))
+        fields = tuple(fields) if fields else STATUS_FIELDS
+        if any(field not in STATUS_FIELDS for field in fields):
+            raise ValueError("invalid_fields")
+
+        merged_thresholds = dict(DEFAULT_STATUS_THRESHOLDS)
+        merged_thresholds.update(thresholds or {})
+
+        subscription = _Subscription(
+            topic, interval_ms / 1000, fields, merged_thresholds, delta=delta
+        )
+
+        with self.condition:
+            self.subscriptions[topic] = subscription
+            self._ensure_thread()
+            self.condition.notify_all()
+
+        return subscription.describe()
+
+    def unsubscribe(self, topic: Optional[str] = None):
+        with self.condition:
+            if topic is None:
+                removed = sorted(self.subscriptions)
+                self.subscriptions.clear()
+            else:
+                removed = [topic] if self.subscriptions.pop(topic, None) else []
+            self.condition.notify_all()
+
+        return removed
+
+    def resync(self, topic: str):
+        """Make the next frame of ``topic`` a full one and send it right away."""
+        with self.condition:
+            subscription = self.subscriptions.get(topic)
+            if subscription is None:
+                raise ValueError("invalid_topic")
+
+            subscription.resync_requested = True
+            subscription.next_due = 0.0
+            self.condition.notify_all()
+            return {"topic": topic, "seq": subscription.sequence}
+
+    def _torrent_id(self, game_id) -> int:
+        torrent_id = self.torrent_ids.get(game_id)
+        if torrent_id is None:
+            torrent_id = self.torrent_ids[game_id] = len(self.torrent_ids) + 1
+        return torrent_id
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="status-subscriptions", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while True:
+                    now = time.monotonic()
+                    due = [
+                        subscription
+                        for subscription in self.subscriptions.values()
+                        if subscription.next_due <= now
+                    ]
+                    if due:
+                        break
+
+                    next_due = min(
+                        (subscription.next_due for subscription in self.subscriptions.values()),
+                        default=None,
+                    )
+                    self.condition.wait(None if next_due is None else next_due - now)
+
+                full_frames = set()
+                for subscription in due:
+                    subscription.next_due = now + subscription.interval_seconds
+                    if subscription.resync_requested or not subscription.has_sent:
+                        subscription.resync_requested = False
+                        full_frames.add(subscription)
+
+            generation = self.get_generation() if self.get_generation is not None else None
+            for subscription in due:
+                full = subscription in full_frames
+                if not full and generation is not None and subscription.generation == generation:
+                    continue
+
+                try:
+                    frame = self._collect(subscription, full)
+                except Exception:
+                    self.logger.warning("Failed to collect %s", subscription.topic, exc_info=True)
+                    continue
+
+                subscription.generation = generation
+                if frame is None:
+                    continue
+
+                with self.condition:
+                    # Dropped while we were collecting
+                    if self.subscriptions.get(subscription.topic) is not subscription:
+                        continue
+
+                try:
+                    self.emit(frame)
+                except Exception:
+                    self.logger.warning("Failed to push %s", subscription.topic, exc_info=True)
+
+    def _collect(self, subscription: _Subscription, full: bool):
+        current = self.collectors[subscription.topic]()
+
+        if isinstance(current, list):
+            if subscription.delta:
+                frame = self._list_delta_frame(subscription, current, full)
+            else:
+                frame = self._list_frame(subscription, current, full)
+        else:
+            frame = self._single_frame(subscription, current, full)
+
+        subscription.has_sent = True
+        if frame is None:
+            return None
+
+        subscription.sequence += 1
+        frame["seq"] = subscription.sequence
+        if subscription.delta:
+            frame["encoding"] = "delta"
+            frame["full"] = full
+        return frame
+
+    def _single_frame(self, subscription: _Subscription, current: Optional[dict], full: bool):
+        projected = subscription.project(current)
+        previous = subscription.sent
+
+        if full or previous is None or projected is None:
+            if not full and not entry_changed(previous, projected, subscription.thresholds):
+                return None
+
+            subscription.sent = projected
+            return {"event": subscription.topic, "data": projected}
+
+        changes = changed_fields(previous, projected, subscription.thresholds)
+        if not changes:
+            return None
+
+        if subscription.delta:
+            subscription.sent = {**previous, **changes}
+            return {"event": subscription.topic, "data": changes}
+
+        subscription.sent = projected
+        return {"event": subscription.topic, "data": projected}
+
+    def _list_frame(self, subscription: _Subscription, current: list, full: bool):
+        sent = {} if full else subscription.sent or {}
+        current_entries = {}
+        changed = []
+        for entry in current:
+            projected = subscription.project(entry)
+            game_id = projected["gameId"]
+            previous = sent.get(game_id)
+            if full or entry_changed(previous, projected, subscription.thresholds):
+                changed.append(projected)
+                current_entries[game_id] = projected
+            else:
+                current_entries[game_id] = previous
+
+        removed = [game_id for game_id in sent if game_id not in current_entries]
+        subscription.sent = current_entries
+
+        if not (full or changed or removed):
+            return None
+
+        return {
+            "event": subscription.topic,
+            "data": changed,
+            "removed": removed,
+            "full": full,
+        }
+
+    def _list_delta_frame(self, subscription: _Subscription, current: list, full: bool):
+        sent = {} if full else subscription.sent or {}
+        current_entries = {}
+        added = []
+        updated = []
+        for entry in current:
+            projected = subscription.project(entry)
+            game_id = projected["gameId"]
+            torrent_id = self._torrent_id(game_id)
+            previous = sent.get(game_id)
+
+            if previous is None:
+                added.append({"id": torrent_id, **projected})
+                current_entries[game_id] = projected
+                continue
+
+            changes = changed_fields(previous, projected, subscription.thresholds)
+            if changes:
+                updated.append({"id": torrent_id, **changes})
+                current_entries[game_id] = {**previous, **changes}
+            else:
+                current_entries[game_id] = previous
+
+        removed = [self._torrent_id(game_id) for game_id in sent if game_id not in current_entries]
+        subscription.sent = current_entries
+
+        if not (full or added or updated or removed):
+            return None
+
+        return {
+            "event": subscription.topic,
+            "add": added,
+            "update": updated,
+            "removed": removed,
+        }
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+SMALL_FRAME_BYTES = 64 * 1024
+LATENCY_SAMPLES = 1024
+
+
+def percentile(sorted_values, fraction: float):
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class StdoutWriter:
+    """Single thread that owns the output stream.
+
+    Callers only append encoded frames to a queue. The writer drains
+    whatever is pending in one ``write`` + ``flush``. Responses up to
+    ``small_frame_bytes`` (``put(..., response=True)``) go ahead of
+    everything else, so status replies never wait behind a huge
+    ``torrent_files`` payload. All other frames, pushed events included,
+    are written strictly in order: subscription ``seq`` numbers and
+    ``add``/``update`` frames must not overtake each other. Every large
+    frame is written on its own.
+    """
+
+    def __init__(self, stream, small_frame_bytes: int = SMALL_FRAME_BYTES):
+        self.stream = stream
+        self.small_frame_bytes = small_frame_bytes
+        self.logger = logging.getLogger("hydra.stdout")
+        self.condition = threading.Condition()
+        self.small_responses = deque()
+        self.ordered_frames = deque()
+        self.writing = 0
+        self.max_queue_depth = 0
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.writes = 0
+        self.write_errors = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._thread = None
+
+    def start(self):
+        with self.condition:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(target=self._run, name="stdout-writer", daemon=True)
+            self._thread.start()
+
+    def put(self, frame: bytes, response: bool = False):
+        item = (time.monotonic(), frame)
+        with self.condition:
+            if response and len(frame) <= self.small_frame_bytes:
+                self.small_responses.append(item)
+            else:
+                self.ordered_frames.append(item)
+
+            self.max_queue_depth = max(self.max_queue_depth, self._depth())
+            self.condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every frame queued so far has been written."""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self._depth() and not self.writing, timeout
+            )
+
+    def _depth(self) -> int:
+        return len(self.small_responses) + len(self.ordered_frames)
+
+    def stats(self):
+        with self.condition:
+            latencies = sorted(self.latencies)
+            return {
+                "queueDepth": self._depth(),
+                "maxQueueDepth": self.max_queue_depth,
+                "framesWritten": self.frames_written,
+                "bytesWritten": self.bytes_written,
+                "writes": self.writes,
+                "writeErrors": self.write_errors,
+                "latencyMs": {
+                    "p50": percentile(latencies, 0.5) * 1000,
+                    "p95": percentile(latencies, 0.95) * 1000,
+                    "p99": percentile(latencies, 0.99) * 1000,
+                    "max": (latencies[-1] if latencies else 0.0) * 1000,
+                },
+            }
+
+    def _take_batch(self):
+        # Every pending small response in one batch; else the small frames
+        # at the head of the ordered queue, or the large frame there alone
+        if self.small_responses:
+            batch = list(self.small_responses)
+            self.small_responses.clear()
+        else:
+            batch = [self.ordered_frames.popleft()]
+            if len(batch[0][1]) <= self.small_frame_bytes:
+                while (
+                    self.ordered_frames
+                    and len(self.ordered_frames[0][1]) <= self.small_frame_bytes
+                ):
+                    batch.append(self.ordered_frames.popleft())
+
+        self.writing = len(batch)
+        return batch
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(self._depth)
+                batch = self._take_batch()
+
+            data = b"".join(frame for _, frame in batch)
+            failed = False
+            try:
+                self.stream.write(data)
+                self.stream.flush()
+            except Exception:
+                failed = True
+                self.logger.warning("Failed to write %s frames", len(batch), exc_info=True)
+
+            written_at = time.monotonic()
+            with self.condition:
+                self.writing = 0
+                self.writes += 1
+                if failed:
+                    self.write_errors += 1
+                else:
+                    self.frames_written += len(batch)
+                    self.bytes_written += len(data)
+                    self.latencies.extend(written_at - enqueued_at for enqueued_at, _ in batch)
+                self.condition.notify_all()
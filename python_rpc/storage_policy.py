@@ -0,0 +1,130 @@
+import errno
+import logging
+import os
+from typing import Iterable, Optional
+
+import libtorrent as lt
+
+STORAGE_MODES = {
+    "sparse": lt.storage_mode_t.storage_mode_sparse,
+    "allocate": lt.storage_mode_t.storage_mode_allocate,
+}
+DEFAULT_STORAGE_MODE = "sparse"
+MAX_DISK_CACHE_MB = 4096
+
+logger = logging.getLogger("hydra.storage")
+
+
+class StoragePolicy:
+    """How a download lays out its files on disk.
+
+    ``mode`` is libtorrent's storage mode: ``sparse`` only allocates what
+    has been written, ``allocate`` gives every file its full size when it
+    is first opened. ``preallocate`` reserves the selected files up front,
+    so large installs get contiguous extents and a full disk fails the
+    start instead of the download halfway through; it implies ``allocate``.
+    ``disk_cache_mb`` raises the session's disk write queue while the
+    download is active (libtorrent 2.x has no per-torrent cache).
+    """
+
+    def __init__(
+        self,
+        mode: str = DEFAULT_STORAGE_MODE,
+        preallocate: bool = False,
+        disk_cache_mb: Optional[int] = None,
+    ):
+        if mode not in STORAGE_MODES:
+            raise ValueError("invalid_storage_policy")
+
+        self.mode = "allocate" if preallocate else mode
+        self.preallocate = preallocate
+        self.disk_cache_mb = disk_cache_mb
+
+    @classmethod
+    def from_payload(cls, payload) -> Optional["StoragePolicy"]:
+        if payload is None:
+            return None
+
+        if not isinstance(payload, dict):
+            raise ValueError("invalid_storage_policy")
+
+        mode = payload.get("mode", DEFAULT_STORAGE_MODE)
+        preallocate = payload.get("preallocate", False)
+        disk_cache_mb = payload.get("disk_cache_mb")
+
+        if not isinstance(preallocate, bool):
+            raise ValueError("invalid_storage_policy")
+
+        if disk_cache_mb is not None and (
+            isinstance(disk_cache_mb, bool)
+            or not isinstance(disk_cache_mb, int)
+            or not 0 < disk_cache_mb <= MAX_DISK_CACHE_MB
+        ):
+            raise ValueError("invalid_storage_policy")
+
+        return cls(mode, preallocate, disk_cache_mb)
+
+    @property
+    def disk_cache_bytes(self) -> Optional[int]:
+        if self.disk_cache_mb is None:
+            return None
+        return self.disk_cache_mb * 1024 * 1024
+
+    def apply_to_params(self, params):
+        params.storage_mode = STORAGE_MODES[self.mode]
+
+
+def storage_policy_changed(current: Optional[StoragePolicy], requested: Optional[StoragePolicy]) -> bool:
+    """Whether a torrent added under ``current`` must be re-added to honour ``requested``.
+
+    Only the storage mode and preallocation count; the disk cache floor is
+    session-wide and applied without touching the torrent.
+    """
+    if requested is None:
+        return False
+
+    current_mode = current.mode if current is not None else DEFAULT_STORAGE_MODE
+    already_preallocated = current is not None and current.preallocate
+    return requested.mode != current_mode or (requested.preallocate and not already_preallocated)
+
+
+def preallocate_files(save_path: str, files_storage, file_indices: Optional[Iterable[int]] = None):
+    """Reserve the full size of each file without touching data already written.
+
+    Must run once the torrent has been checked: files that exist when a
+    torrent without resume data is added make libtorrent hash all of them.
+    Returns the number of bytes newly reserved; raises
+    ``RuntimeError("insufficient_disk_space")`` when the disk is full.
+    """
+    fallocate = getattr(os, "posix_fallocate", None)
+    indices = range(files_storage.num_files()) if file_indices is None else file_indices
+    reserved = 0
+
+    for index in indices:
+        if files_storage.file_flags(index) & lt.file_storage.flag_pad_file:
+            continue
+
+        size = files_storage.file_size(index)
+        path = os.path.join(save_path, files_storage.file_path(index))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "ab") as target:
+                before = os.fstat(target.fileno())
+                if fallocate is not None:
+                    # Run even when the file already has its full size:
+                    # libtorrent's allocate mode extends files sparsely,
+                    # and fallocate fills the holes without touching data
+                    fallocate(target.fileno(), 0, size)
+                    after = os.fstat(target.fileno())
+                    reserved += max(after.st_blocks - before.st_blocks, 0) * 512
+                elif before.st_size < size:
+                    # NTFS allocates clusters for the new end of file without
+                    # zero-filling them
+                    target.truncate(size)
+                    reserved += size - before.st_size
+        except OSError as error:
+            if error.errno in (errno.ENOSPC, errno.EDQUOT):
+                raise RuntimeError("insufficient_disk_space") from error
+            logger.warning("Failed to preallocate %s", path, exc_info=True)
+
+    return reserved
@@ -0,0 +1,97 @@
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+import libtorrent as lt
+
+from resume_data import add_torrent_params_hash_hex
+
+
+class AsyncTorrentAdder:
+    """Adds many torrents with ``async_add_torrent`` and collects their handles.
+
+    ``session.add_torrent`` round-trips to the network thread once per
+    torrent. Submitting a whole batch asynchronously lets libtorrent add
+    them back to back; the handles come back as ``add_torrent_alert`` and
+    are matched to their params by info-hash. Synchronous adds post the same
+    alert, so only hashes this adder is waiting for are claimed.
+    """
+
+    def __init__(self, torrent_session, alert_pump):
+        self.session = torrent_session
+        self.logger = logging.getLogger("hydra.torrent")
+        self.condition = threading.Condition()
+        self.pending = {}
+        # Adds that timed out: removed again if their alert still arrives
+        self.abandoned = set()
+        alert_pump.add_listener(lt.add_torrent_alert, self._on_added)
+
+    def add_all(self, params_list, timeout_seconds: float = 30.0) -> List[Tuple[object, Optional[str]]]:
+        """Return one ``(handle, error_code)`` per params, in order.
+
+        ``error_code`` is ``None`` on success, ``duplicate_torrent`` when
+        the batch (or another pending batch) already adds that info-hash,
+        ``add_failed`` when libtorrent rejects the params and
+        ``add_timeout`` when no alert arrived in time.
+        """
+        results = [None] * len(params_list)
+        submitted = []
+
+        with self.condition:
+            for index, params in enumerate(params_list):
+                info_hash = add_torrent_params_hash_hex(params)
+                if info_hash in self.pending:
+                    results[index] = (None, "duplicate_torrent")
+                    continue
+
+                self.abandoned.discard(info_hash)
+                self.pending[info_hash] = (results, index)
+                submitted.append((info_hash, params))
+
+        for info_hash, params in submitted:
+            try:
+                self.session.async_add_torrent(params)
+            except Exception:
+                self.logger.warning("Failed to submit torrent %s", info_hash, exc_info=True)
+                with self.condition:
+                    entry = self.pending.pop(info_hash, None)
+                    if entry is not None:
+                        entry[0][entry[1]] = (None, "add_failed")
+
+        with self.condition:
+            self.condition.wait_for(
+                lambda: all(result is not None for result in results), timeout_seconds
+            )
+
+            for info_hash, _ in submitted:
+                entry = self.pending.get(info_hash)
+                if entry is not None and entry[0] is results:
+                    self.pending.pop(info_hash)
+                    self.abandoned.add(info_hash)
+                    results[entry[1]] = (None, "add_timeout")
+
+        return results
+
+    def _on_added(self, alert):
+        try:
+            info_hash = add_torrent_params_hash_hex(alert.params)
+        except Exception:
+            return
+
+        error = alert.error
+        failed = error.value() != 0
+
+        with self.condition:
+            entry = self.pending.pop(info_hash, None)
+            if entry is None:
+                abandoned = info_hash in self.abandoned
+                self.abandoned.discard(info_hash)
+            else:
+                entry[0][entry[1]] = (None, "add_failed") if failed else (alert.handle, None)
+                self.condition.notify_all()
+
+        if failed:
+            self.logger.warning("Failed to add torrent %s: %s", info_hash, error.message())
+        elif entry is None and abandoned:
+            # Nobody owns the handle any more
+            self.session.remove_torrent(alert.handle)
@@ -5,134 +5,70 @@ from typing import List, Optional, Set
 
 import libtorrent as lt
 
+from resume_data import add_torrent_params_hash_hex
+from storage_policy import StoragePolicy, preallocate_files, storage_policy_changed
+from torrent_file_list import TorrentFileList
+from tracker_registry import DEFAULT_TRACKERS
+
 
 class TorrentDownloader:
     def __init__(
         self,
         torrent_session,
         flags=lt.torrent_flags.auto_managed,
-        session_lock: Optional[threading.RLock] = None,
+        alert_pump=None,
+        resume_store=None,
+        storage_policy: Optional[StoragePolicy] = None,
+        tracker_registry=None,
     ):
         self.torrent_handle = None
         self.session = torrent_session
+        self.alert_pump = alert_pump
+        self.resume_store = resume_store
         self.flags = flags
-        self.session_lock = session_lock or threading.RLock()
+        self.storage_policy = storage_policy
+        # Serializes this torrent's add/remove transitions; other downloaders
+        # and registry lookups never wait on it
+        self.lifecycle_lock = threading.RLock()
+        self.closed = False
         self.selected_file_indices = None
         self.selected_size_bytes = None
+        self.static_fields = None
+        self.download_limit = 0
+        self.upload_limit = 0
         self.logger = logging.getLogger("hydra.torrent")
-        self.trackers = [
-            "udp://tracker.opentrackr.org:1337/announce",
-            "http://tracker.opentrackr.org:1337/announce",
-            "udp://open.tracker.cl:1337/announce",
-            "udp://open.demonii.com:1337/announce",
-            "udp://open.stealth.si:80/announce",
-            "udp://tracker.torrent.eu.org:451/announce",
-            "udp://exodus.desync.com:6969/announce",
-            "udp://tracker.theoks.net:6969/announce",
-            "udp://tracker-udp.gbitt.info:80/announce",
-            "udp://explodie.org:6969/announce",
-            "https://tracker.tamersunion.org:443/announce",
-            "udp://tracker2.dler.org:80/announce",
-            "udp://tracker1.myporn.club:9337/announce",
-            "udp://tracker.tiny-vps.com:6969/announce",
-            "udp://tracker.dler.org:6969/announce",
-            "udp://tracker.bittor.pw:1337/announce",
-            "udp://tracker.0x7c0.com:6969/announce",
-            "udp://retracker01-msk-virt.corbina.net:80/announce",
-            "udp://opentracker.io:6969/announce",
-            "udp://open.free-tracker.ga:6969/announce",
-            "udp://new-line.net:6969/announce",
-            "udp://moonburrow.club:6969/announce",
-            "udp://leet-tracker.moe:1337/announce",
-            "udp://bt2.archive.org:6969/announce",
-            "udp://bt1.archive.org:6969/announce",
-            "http://tracker2.dler.org:80/announce",
-            "http://tracker1.bt.moack.co.kr:80/announce",
-            "http://tracker.dler.org:6969/announce",
-            "http://tr.kxmp.cf:80/announce",
-            "udp://u.peer-exchange.download:6969/announce",
-            "udp://ttk2.nbaonlineservice.com:6969/announce",
-            "udp://tracker.tryhackx.org:6969/announce",
-            "udp://tracker.srv00.com:6969/announce",
-            "udp://tracker.skynetcloud.site:6969/announce",
-            "udp://tracker.jamesthebard.net:6969/announce",
-            "udp://tracker.fnix.net:6969/announce",
-            "udp://tracker.filemail.com:6969/announce",
-            "udp://tracker.farted.net:6969/announce",
-            "udp://tracker.edkj.club:6969/announce",
-            "udp://tracker.dump.cl:6969/announce",
-            "udp://tracker.deadorbit.nl:6969/announce",
-            "udp://tracker.darkness.services:6969/announce",
-            "udp://tracker.ccp.ovh:6969/announce",
-            "udp://tamas3.ynh.fr:6969/announce",
-            "udp://ryjer.com:6969/announce",
-            "udp://run.publictracker.xyz:6969/announce",
-            "udp://public.tracker.vraphim.com:6969/announce",
-            "udp://p4p.arenabg.com:1337/announce",
-            "udp://p2p.publictracker.xyz:6969/announce",
-            "udp://open.u-p.pw:6969/announce",
-            "udp://open.publictracker.xyz:6969/announce",
-            "udp://open.dstud.io:6969/announce",
-            "udp://open.demonoid.ch:6969/announce",
-            "udp://odd-hd.fr:6969/announce",
-            "udp://martin-gebhardt.eu:25/announce",
-            "udp://jutone.com:6969/announce",
-            "udp://isk.richardsw.club:6969/announce",
-            "udp://evan.im:6969/announce",
-            "udp://epider.me:6969/announce",
-            "udp://d40969.acod.regrucolo.ru:6969/announce",
-            "udp://bt.rer.lol:6969/announce",
-            "udp://amigacity.xyz:6969/announce",
-            "udp://1c.premierzal.ru:6969/announce",
-            "https://trackers.run:443/announce",
-            "https://tracker.yemekyedim.com:443/announce",
-            "https://tracker.renfei.net:443/announce",
-            "https://tracker.pmman.tech:443/announce",
-            "https://tracker.lilithraws.org:443/announce",
-            "https://tracker.imgoingto.icu:443/announce",
-            "https://tracker.cloudit.top:443/announce",
-            "https://tracker-zhuqiy.dgj055.icu:443/announce",
-            "http://tracker.renfei.net:8080/announce",
-            "http://tracker.mywaifu.best:6969/announce",
-            "http://tracker.ipv6tracker.org:80/announce",
-            "http://tracker.files.fm:6969/announce",
-            "http://tracker.edkj.club:6969/announce",
-            "http://tracker.bt4g.com:2095/announce",
-            "http://tracker-zhuqiy.dgj055.icu:80/announce",
-            "http://t1.aag.moe:17715/announce",
-            "http://t.overflow.biz:6969/announce",
-            "http://bittorrent-tracker.e-n-c-r-y-p-t.net:1337/announce",
-            "udp://torrents.artixlinux.org:6969/announce",
-            "udp://mail.artixlinux.org:6969/announce",
-            "udp://ipv4.rer.lol:2710/announce",
-            "udp://concen.org:6969/announce",
-            "udp://bt.rer.lol:2710/announce",
-            "udp://aegir.sexy:6969/announce",
-            "https://www.peckservers.com:9443/announce",
-            "https://tracker.ipfsscan.io:443/announce",
-            "https://tracker.gcrenwp.top:443/announce",
-            "http://www.peckservers.com:9000/announce",
-            "http://tracker1.itzmx.com:8080/announce",
-            "http://ch3oh.ru:6969/announce",
-            "http://bvarf.tracker.sh:2086/announce",
-        ]
+        self.tracker_registry = tracker_registry
+        # Fallback trackers this downloader attached, as opposed to the
+        # magnet's own and the caller's
+        self.fallback_trackers = []
+
+    def is_seeding_mode(self):
+        return bool(self.flags & lt.torrent_flags.upload_mode)
 
     def set_download_limit(self, max_download_speed: int = None):
-        download_limit = (
+        self.download_limit = (
             max_download_speed if max_download_speed and max_download_speed > 0 else 0
         )
-        try:
-            self.session.apply_settings({"download_rate_limit": download_limit})
+        self._apply_rate_limits()
+
+    def set_upload_limit(self, max_upload_speed: int = None):
+        self.upload_limit = (
+            max_upload_speed if max_upload_speed and max_upload_speed > 0 else 0
+        )
+        self._apply_rate_limits()
+
+    def _apply_rate_limits(self):
+        handle = self.torrent_handle
+        if not handle or not handle.is_valid():
             return
-        except Exception:
-            pass
 
-        legacy_setter = getattr(self.session, "set_download_rate_limit", None)
-        if callable(legacy_setter):
-            try:
-                legacy_setter(download_limit)
-            except Exception:
-                pass
+        # -1 is "unlimited" for per-torrent limits
+        try:
+            handle.set_download_limit(self.download_limit or -1)
+            handle.set_upload_limit(self.upload_limit or -1)
+        except RuntimeError:
+            # A concurrent cancel removed the handle after the check
+            self.logger.debug("Skipped rate limits for a removed torrent")
 
     def _build_add_torrent_params(
         self,
@@ -140,20 +76,36 @@ class TorrentDownloader:
         save_path: str,
         flags,
         trackers: Optional[List[str]] = None,
+        torrent_info=None,
     ):
         try:
             params = lt.parse_magnet_uri(magnet)
         except Exception as error:
             raise ValueError("invalid_magnet") from error
 
+        # Resume data carries the tracker list of the previous run, fallback
+        # trackers included; start over from the magnet's own
+        magnet_trackers = list(params.trackers)
+        tiers = list(params.tracker_tiers)[: len(magnet_trackers)]
+
+        resume_params = self._load_resume_params(params)
+        if resume_params is not None:
+            params = resume_params
+            # Upload mode is a per-start choice, never carry it over from a previous seed
+            params.flags = params.flags & ~lt.torrent_flags.upload_mode
+
+        if torrent_info is not None and params.ti is None:
+            params.ti = torrent_info
+
         params.save_path = save_path
         params.flags = params.flags | flags
+        if self.storage_policy is not None:
+            self.storage_policy.apply_to_params(params)
+        params.download_limit = self.download_limit or -1
+        params.upload_limit = self.upload_limit or -1
 
         extra_trackers = trackers or []
-        magnet_trackers = list(params.trackers)
         known_trackers = set(magnet_trackers)
-
-        tiers = list(params.tracker_tiers)[: len(magnet_trackers)]
         tiers.extend([0] * (len(magnet_trackers) - len(tiers)))
 
         for tracker in extra_trackers:
@@ -165,26 +117,126 @@ class TorrentDownloader:
             tiers.append(0)
 
         fallback_tier = max(tiers) + 1 if tiers else 0
+        fallback_trackers = []
 
-        for tracker in self.trackers:
+        for tracker in self._select_fallback_trackers():
             if tracker in known_trackers:
                 continue
 
             magnet_trackers.append(tracker)
             known_trackers.add(tracker)
             tiers.append(fallback_tier)
+            fallback_trackers.append(tracker)
 
         params.trackers = magnet_trackers
         params.tracker_tiers = tiers
+        self.fallback_trackers = fallback_trackers
 
         return params
 
+    def _select_fallback_trackers(self):
+        if self.tracker_registry is None:
+            return DEFAULT_TRACKERS
+
+        return self.tracker_registry.best()
+
+    def refresh_fallback_trackers(self, selected: List[str]):
+        """Swap the attached fallback trackers for ``selected``; no-op when unchanged."""
+        with self.lifecycle_lock:
+            handle = self.torrent_handle
+            if not handle or not handle.is_valid():
+                return False
+
+            try:
+                entries = handle.trackers()
+            except RuntimeError:
+                return False
+
+            current = set(self.fallback_trackers)
+            kept = [entry for entry in entries if entry["url"] not in current]
+            known = {entry["url"] for entry in kept}
+            if {tracker for tracker in selected if tracker not in known} == current:
+                return False
+
+            fallback_tier = max((entry["tier"] for entry in kept), default=-1) + 1
+
+            replacement = []
+            for entry in kept:
+                announce_entry = lt.announce_entry(entry["url"])
+                announce_entry.tier = entry["tier"]
+                replacement.append(announce_entry)
+
+            fallback_trackers = []
+            for tracker in selected:
+                if tracker in known:
+                    continue
+                announce_entry = lt.announce_entry(tracker)
+                announce_entry.tier = fallback_tier
+                replacement.append(announce_entry)
+                fallback_trackers.append(tracker)
+
+            try:
+                handle.replace_trackers(replacement)
+            except RuntimeError:
+                self.logger.warning("Failed to refresh trackers", exc_info=True)
+                return False
+
+            self.fallback_trackers = fallback_trackers
+            return True
+
+    def prepare_add(
+        self,
+        magnet: str,
+        save_path: str,
+        trackers: Optional[List[str]] = None,
+        torrent_info=None,
+        paused: bool = False,
+    ):
+        """Build the params of a whole-torrent start for someone else to add.
+
+        Pairs with ``attach_handle`` for callers that add many torrents at
+        once with ``async_add_torrent``.
+        """
+        flags = self.flags | lt.torrent_flags.auto_managed
+        if paused:
+            flags |= lt.torrent_flags.paused
+
+        return self._build_add_torrent_params(magnet, save_path, flags, trackers, torrent_info)
+
+    def attach_handle(self, handle):
+        with self.lifecycle_lock:
+            self.torrent_handle = handle
+
+        self.selected_file_indices = None
+        self.selected_size_bytes = None
+        self.static_fields = None
+
+    def _load_resume_params(self, magnet_params):
+        if self.resume_store is None:
+            return None
+
+        return self.resume_store.load(add_torrent_params_hash_hex(magnet_params))
+
+    def get_info_hash(self):
+        handle = self.torrent_handle
+        if not handle or not handle.is_valid():
+            return None
+
+        try:
+            info_hashes = handle.info_hashes()
+            if info_hashes.has_v1():
+                return str(info_hashes.v1)
+        except AttributeError:
+            pass
+
+        return str(handle.info_hash())
+
     def _apply_trackers(self, trackers: Optional[List[str]] = None):
         if not self.torrent_handle or not self.torrent_handle.is_valid() or not trackers:
             return
 
         try:
-            existing_urls = {t.url for t in self.torrent_handle.trackers()}
+            existing_urls = {t["url"] for t in self.torrent_handle.trackers()}
         except Exception:
             existing_urls = set()
 
@@ -199,11 +251,12 @@ class TorrentDownloader:
                 )
 
     def _get_torrent_info(self):
-        if not self.torrent_handle or not self.torrent_handle.is_valid():
+        handle = self.torrent_handle
+        if not handle or not handle.is_valid():
             return None
 
-        getter = getattr(self.torrent_handle, "torrent_file", None) or getattr(
-            self.torrent_handle, "get_torrent_info", None
+        getter = getattr(handle, "torrent_file", None) or getattr(
+            handle, "get_torrent_info", None
         )
 
         if not callable(getter):
@@ -214,10 +267,18 @@ class TorrentDownloader:
         except RuntimeError:
             return None
 
+    def get_torrent_info(self):
+        return self._get_torrent_info()
+
     def _wait_for_metadata(self, timeout_seconds: float = 30.0, poll_interval: float = 0.25):
         if not self.torrent_handle or not self.torrent_handle.is_valid():
             return False
 
+        if self.alert_pump is not None:
+            return self.alert_pump.wait_for_metadata(
+                self.torrent_handle, max(timeout_seconds, 1.0)
+            )
+
         deadline = time.monotonic() + max(timeout_seconds, 1.0)
 
         while time.monotonic() < deadline:
@@ -236,6 +297,42 @@ class TorrentDownloader:
     def wait_for_metadata(self, timeout_seconds: float = 30.0):
         return self._wait_for_metadata(timeout_seconds=timeout_seconds)
 
+    def _wait_until_checked(self, timeout_seconds: float):
+        deadline = time.monotonic() + timeout_seconds
+        while time.monotonic() < deadline:
+            try:
+                state = self.torrent_handle.status(flags=0).state
+            except RuntimeError:
+                return False
+
+            if state not in (
+                lt.torrent_status.states.checking_files,
+                lt.torrent_status.states.checking_resume_data,
+            ):
+                return True
+
+            time.sleep(0.05)
+
+        return False
+
+    def _preallocate(self, save_path: str, files_storage, file_indices, timeout_seconds: float):
+        """Reserve disk space for a paused torrent when its storage policy asks for it."""
+        if self.storage_policy is None or not self.storage_policy.preallocate:
+            return
+
+        # Preallocating before the initial check would make it hash every file
+        if not self._wait_until_checked(timeout_seconds):
+            self.logger.warning("Skipping preallocation, torrent is still being checked")
+            return
+
+        started = time.monotonic()
+        reserved = preallocate_files(save_path, files_storage, file_indices)
+        self.logger.info(
+            "Preallocated %s bytes in %sms",
+            reserved,
+            int((time.monotonic() - started) * 1000),
+        )
+
     def _sanitize_file_indices(self, file_indices: List[int], files_storage):
         if file_indices is None:
             return None
@@ -265,7 +362,16 @@ class TorrentDownloader:
         for index in selected_indices:
             priorities[index] = 1
 
-        self.torrent_handle.prioritize_files(priorities)
+        if self.alert_pump is not None:
+            generation = self.alert_pump.file_prio_generation(self.torrent_handle)
+            self.torrent_handle.prioritize_files(priorities)
+
+            if self.alert_pump.wait_for_file_priorities(
+                self.torrent_handle, generation, timeout_seconds=3.0
+            ):
+                return
+        else:
+            self.torrent_handle.prioritize_files(priorities)
 
         deadline = time.monotonic() + 3.0
         while time.monotonic() < deadline:
@@ -288,12 +394,20 @@ class TorrentDownloader:
         file_indices: Optional[List[int]] = None,
         wait_timeout_seconds: float = 30.0,
         trackers: Optional[List[str]] = None,
+        torrent_info=None,
+        storage_policy: Optional[StoragePolicy] = None,
     ):
         selective_download = file_indices is not None
-
-        with self.session_lock:
+        # The storage mode is fixed once a torrent is added, so a restart
+        # asking for a different layout has to re-add it
+        storage_changed = storage_policy_changed(self.storage_policy, storage_policy)
+        if storage_policy is not None:
+            self.storage_policy = storage_policy
+
+        with self.lifecycle_lock:
+            self._ensure_open()
             if self.torrent_handle and self.torrent_handle.is_valid():
-                if not selective_download:
+                if not selective_download and not storage_changed:
                     self.torrent_handle.set_flags(lt.torrent_flags.auto_managed)
                     self.torrent_handle.resume()
                     self._apply_trackers(trackers)
@@ -312,9 +426,20 @@ class TorrentDownloader:
                 initial_flags |= lt.torrent_flags.auto_managed
 
             params = self._build_add_torrent_params(
-                magnet, save_path, initial_flags, trackers
+                magnet, save_path, initial_flags, trackers, torrent_info
             )
 
+            # Preallocation needs the file list: without stored metadata,
+            # fetch it first the way selective starts do
+            preallocate_after_metadata = (
+                not selective_download
+                and params.ti is None
+                and self.storage_policy is not None
+                and self.storage_policy.preallocate
+            )
+            if preallocate_after_metadata:
+                params.flags |= lt.torrent_flags.default_dont_download
+
             if self.torrent_handle is None or not self.torrent_handle.is_valid():
                 self.torrent_handle = self.session.add_torrent(params)
 
@@ -323,8 +448,9 @@ class TorrentDownloader:
 
         self.selected_file_indices = None
         self.selected_size_bytes = None
+        self.static_fields = None
 
-        if selective_download:
+        if selective_download or preallocate_after_metadata:
             try:
                 self.torrent_handle.set_flags(lt.torrent_flags.auto_managed)
                 self.torrent_handle.resume()
@@ -341,19 +467,98 @@ class TorrentDownloader:
                 self.torrent_handle.pause()
                 self.torrent_handle.unset_flags(lt.torrent_flags.auto_managed)
 
-                sanitized_indices = self._sanitize_file_indices(file_indices, files_storage)
-                self._set_selected_file_priorities(sanitized_indices, files_storage)
-
-                self.selected_file_indices = sanitized_indices
-                self.selected_size_bytes = sum(files_storage.file_size(index) for index in sanitized_indices)
-            except Exception:
+                if selective_download:
+                    sanitized_indices = self._sanitize_file_indices(file_indices, files_storage)
+                    self._set_selected_file_priorities(sanitized_indices, files_storage)
+
+                    self.selected_file_indices = sanitized_indices
+                    self.selected_size_bytes = sum(files_storage.file_size(index) for index in sanitized_indices)
+                else:
+                    # Undo default_dont_download: the whole torrent is wanted
+                    sanitized_indices = None
+                    self._set_selected_file_priorities(
+                        list(range(files_storage.num_files())), files_storage
+                    )
+
+                self._preallocate(save_path, files_storage, sanitized_indices, wait_timeout_seconds)
+            except Exception as error:
                 self.cancel_download()
+                self._ensure_open(error)
+                raise
+        elif params.ti is not None:
+            # Metadata is already known, so the still paused torrent can be
+            # preallocated before it starts writing
+            try:
+                self._preallocate(save_path, params.ti.files(), None, wait_timeout_seconds)
+            except Exception as error:
+                self.cancel_download()
+                self._ensure_open(error)
                 raise
 
-        self.torrent_handle.set_flags(lt.torrent_flags.auto_managed)
-        self.torrent_handle.resume()
+        with self.lifecycle_lock:
+            self._ensure_open()
+            self.torrent_handle.set_flags(lt.torrent_flags.auto_managed)
+            self.torrent_handle.resume()
 
-    def get_torrent_files(self, timeout_seconds: float = 30.0, max_files: int = 100000):
+    def promote_download(
+        self,
+        save_path: str,
+        file_indices: Optional[List[int]] = None,
+        trackers: Optional[List[str]] = None,
+        flags=lt.torrent_flags.auto_managed,
+    ):
+        """Turn a warm metadata probe into a regular download without re-adding it."""
+        with self.lifecycle_lock:
+            self._ensure_open()
+            if not self.torrent_handle or not self.torrent_handle.is_valid():
+                raise RuntimeError("metadata_incomplete")
+
+            info = self._get_torrent_info()
+            if info is None:
+                raise RuntimeError("metadata_incomplete")
+
+            files_storage = info.files()
+            sanitized_indices = self._sanitize_file_indices(file_indices, files_storage)
+
+            # No pause here: pausing drops every connected peer and libtorrent
+            # then waits min_reconnect_time before dialing them again
+            self.flags = flags
+            self._apply_rate_limits()
+            self.torrent_handle.move_storage(save_path, lt.move_flags_t.dont_replace)
+            self._apply_trackers(trackers)
+
+        self.selected_file_indices = None
+        self.selected_size_bytes = None
+        self.static_fields = None
+
+        if sanitized_indices is not None:
+            self._set_selected_file_priorities(sanitized_indices, files_storage)
+            self.selected_file_indices = sanitized_indices
+            self.selected_size_bytes = sum(
+                files_storage.file_size(index) for index in sanitized_indices
+            )
+
+        with self.lifecycle_lock:
+            self._ensure_open()
+            self.torrent_handle.unset_flags(lt.torrent_flags.upload_mode)
+            self.torrent_handle.set_flags(flags | lt.torrent_flags.auto_managed)
+            self.torrent_handle.resume()
+
+    def park(self):
+        """Take a warm probe out of libtorrent's queue so it holds no active slot.
+
+        Promotion makes it auto-managed again.
+        """
+        with self.lifecycle_lock:
+            handle = self.torrent_handle
+            if not handle or not handle.is_valid():
+                return
+
+            handle.unset_flags(lt.torrent_flags.auto_managed)
+            # The queue may have paused it; keep the peers for promotion
+            handle.resume()
+
+    def get_torrent_file_list(self, timeout_seconds: float = 30.0) -> TorrentFileList:
         if not self._wait_for_metadata(timeout_seconds=timeout_seconds):
             raise TimeoutError("metadata_timeout")
 
@@ -361,42 +566,45 @@ class TorrentDownloader:
         if info is None:
             raise RuntimeError("metadata_incomplete")
 
-        files_storage = info.files()
-        file_count = files_storage.num_files()
+        return TorrentFileList.from_torrent_info(info)
 
-        if file_count > max_files:
-            raise OverflowError("too_many_files")
-
-        files = []
-        for index in range(file_count):
-            files.append(
-                {
-                    "index": index,
-                    "path": files_storage.file_path(index),
-                    "length": files_storage.file_size(index),
-                }
-            )
+    def get_torrent_files(self, timeout_seconds: float = 30.0, max_files: int = 100000):
+        return self.get_torrent_file_list(timeout_seconds).to_payload(max_files=max_files)
 
-        return {
-            "name": info.name(),
-            "totalSize": info.total_size(),
-            "files": files,
-        }
+    def resume_download(self):
+        handle = self.torrent_handle
+        if handle and handle.is_valid():
+            handle.set_flags(lt.torrent_flags.auto_managed)
+            handle.resume()
 
     def pause_download(self):
-        if self.torrent_handle:
-            self.torrent_handle.pause()
-            self.torrent_handle.unset_flags(lt.torrent_flags.auto_managed)
+        handle = self.torrent_handle
+        if handle:
+            handle.pause()
+            handle.unset_flags(lt.torrent_flags.auto_managed)
+
+    def _ensure_open(self, cause: Optional[Exception] = None):
+        if self.closed:
+            raise RuntimeError("download_cancelled") from cause
+
+    def close(self):
+        """Cancel for good: a start still in flight fails instead of re-adding the torrent."""
+        with self.lifecycle_lock:
+            self.closed = True
+            self.cancel_download()
 
     def cancel_download(self):
-        with self.session_lock:
+        with self.lifecycle_lock:
             if self.torrent_handle:
                 if self.torrent_handle.is_valid():
                     self.torrent_handle.pause()
                     self.session.remove_torrent(self.torrent_handle, lt.session.delete_partfile)
+                if self.alert_pump is not None:
+                    self.alert_pump.forget(self.torrent_handle)
                 self.torrent_handle = None
                 self.selected_file_indices = None
                 self.selected_size_bytes = None
+                self.static_fields = None
 
     def abort_session(self):
         self.cancel_download()
@@ -408,26 +616,45 @@ class TorrentDownloader:
         self.torrent_handle = None
         self.selected_file_indices = None
         self.selected_size_bytes = None
+        self.static_fields = None
 
     def _get_handle_status(self):
-        if self.torrent_handle is None:
+        # Read once: a concurrent cancel may clear it at any point
+        handle = self.torrent_handle
+        if handle is None:
             return None
 
-        if not self.torrent_handle.is_valid():
+        if self.alert_pump is not None:
+            snapshot = self.alert_pump.get_status(handle)
+            if snapshot is not None:
+                return snapshot
+
+        if not handle.is_valid():
             return None
 
         try:
-            return self.torrent_handle.status()
+            return handle.status()
         except RuntimeError:
             return None
 
-    def _get_torrent_info_if_available(self, status):
+    def _get_static_fields(self, status):
+        if self.static_fields is not None:
+            return self.static_fields
+
         if not status.has_metadata:
             return None
 
-        return self._get_torrent_info()
+        info = self._get_torrent_info()
+        if info is None:
+            return None
 
-    def _get_file_size(self, status, info):
+        self.static_fields = {
+            "name": info.name(),
+            "total_size": info.total_size(),
+        }
+        return self.static_fields
+
+    def _get_file_size(self, status, static_fields):
         total_wanted = getattr(status, "total_wanted", 0)
         if total_wanted > 0:
             return total_wanted
@@ -435,8 +662,8 @@ class TorrentDownloader:
         if self.selected_size_bytes is not None:
             return self.selected_size_bytes
 
-        if info:
-            return info.total_size()
+        if static_fields:
+            return static_fields["total_size"]
 
         return 0
 
@@ -461,13 +688,17 @@ class TorrentDownloader:
         if status is None:
             return None
 
-        info = self._get_torrent_info_if_available(status)
-        file_size = self._get_file_size(status, info)
+        return self.build_status_payload(status)
+
+    def build_status_payload(self, status):
+        """Build the RPC status dict from an already fetched ``torrent_status``."""
+        static_fields = self._get_static_fields(status)
+        file_size = self._get_file_size(status, static_fields)
         bytes_downloaded = self._get_bytes_downloaded(status, file_size)
         progress = self._get_progress(status, file_size, bytes_downloaded)
 
         response = {
-            'folderName': info.name() if info else "",
+            'folderName': static_fields["name"] if static_fields else "",
             'fileSize': file_size,
             'progress': progress,
             'downloadSpeed': status.download_rate,
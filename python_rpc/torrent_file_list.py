@@ -0,0 +1,126 @@
+import os
+import threading
+from array import array
+
+from file_tree import FileTree
+
+DEFAULT_FILES_PAGE_SIZE = 1000
+MAX_FILES_PAGE_SIZE = 10000
+FILES_ENCODINGS = {"objects", "columnar"}
+
+
+class TorrentFileList:
+    """Compact, immutable view of a torrent's file list.
+
+    Directory paths are interned once and every file only keeps a directory
+    id, its base name and its length, so a cached 100k-file torrent costs a
+    fraction of the equivalent list of dicts and can be served page by page.
+    """
+
+    def __init__(self, name: str, total_size: int, dirs, file_dirs, file_names, file_lengths):
+        self.name = name
+        self.total_size = total_size
+        self.dirs = dirs
+        self.file_dirs = file_dirs
+        self.file_names = file_names
+        self.file_lengths = file_lengths
+        self._tree = None
+        self._tree_lock = threading.Lock()
+
+    @classmethod
+    def from_torrent_info(cls, info):
+        files_storage = info.files()
+        dirs = []
+        dir_ids = {}
+        file_dirs = array("I")
+        file_names = []
+        file_lengths = array("q")
+
+        for index in range(files_storage.num_files()):
+            directory, file_name = os.path.split(files_storage.file_path(index))
+            dir_id = dir_ids.get(directory)
+            if dir_id is None:
+                dir_id = dir_ids[directory] = len(dirs)
+                dirs.append(directory)
+
+            file_dirs.append(dir_id)
+            file_names.append(file_name)
+            file_lengths.append(files_storage.file_size(index))
+
+        return cls(info.name(), info.total_size(), dirs, file_dirs, file_names, file_lengths)
+
+    def tree(self) -> FileTree:
+        """Return the directory tree, building it on first use."""
+        with self._tree_lock:
+            if self._tree is None:
+                self._tree = FileTree(self)
+            return self._tree
+
+    def __len__(self):
+        return len(self.file_names)
+
+    def file_path(self, index: int) -> str:
+        directory = self.dirs[self.file_dirs[index]]
+        return os.path.join(directory, self.file_names[index]) if directory else self.file_names[index]
+
+    def _file_objects(self, start: int, stop: int):
+        return [
+            {
+                "index": index,
+                "path": self.file_path(index),
+                "length": self.file_lengths[index],
+            }
+            for index in range(start, stop)
+        ]
+
+    def to_payload(self, max_files: int = 100000):
+        """Return the legacy ``{name, totalSize, files}`` payload with every file."""
+        if len(self) > max_files:
+            raise OverflowError("too_many_files")
+
+        return {
+            "name": self.name,
+            "totalSize": self.total_size,
+            "files": self._file_objects(0, len(self)),
+        }
+
+    def page(self, cursor: int, page_size: int, encoding: str = "objects"):
+        """Return files ``[cursor, cursor + page_size)``.
+
+        ``columnar`` pages carry parallel ``dir``/``name``/``length`` arrays
+        whose ``dir`` entries index into the page's own ``dirs`` table; file
+        indices are implicit (``cursor`` + position).
+        """
+        start = min(max(cursor, 0), len(self))
+        stop = min(start + page_size, len(self))
+
+        payload = {
+            "name": self.name,
+            "totalSize": self.total_size,
+            "fileCount": len(self),
+            "cursor": start,
+            "nextCursor": stop if stop < len(self) else None,
+            "encoding": encoding,
+        }
+
+        if encoding == "columnar":
+            page_dirs = []
+            page_dir_ids = {}
+            dir_column = []
+            for dir_id in self.file_dirs[start:stop]:
+                page_dir_id = page_dir_ids.get(dir_id)
+                if page_dir_id is None:
+                    page_dir_id = page_dir_ids[dir_id] = len(page_dirs)
+                    page_dirs.append(self.dirs[dir_id])
+                dir_column.append(page_dir_id)
+
+            payload["dirs"] = page_dirs
+            payload["files"] = {
+                "dir": dir_column,
+                "name": self.file_names[start:stop],
+                "length": self.file_lengths[start:stop].tolist(),
+            }
+        else:
+            payload["files"] = self._file_objects(start, stop)
+
+        return payload
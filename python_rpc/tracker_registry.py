@@ -0,0 +1,376 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+import libtorrent as lt
+
+from metadata_store import write_file_atomic
+
+DEFAULT_TRACKERS = (
+    "udp://tracker.opentrackr.org:1337/announce",
+    "http://tracker.opentrackr.org:1337/announce",
+    "udp://open.tracker.cl:1337/announce",
+    "udp://open.demonii.com:1337/announce",
+    "udp://open.stealth.si:80/announce",
+    "udp://tracker.torrent.eu.org:451/announce",
+    "udp://exodus.desync.com:6969/announce",
+    "udp://tracker.theoks.net:6969/announce",
+    "udp://tracker-udp.gbitt.info:80/announce",
+    "udp://explodie.org:6969/announce",
+    "https://tracker.tamersunion.org:443/announce",
+    "udp://tracker2.dler.org:80/announce",
+    "udp://tracker1.myporn.club:9337/announce",
+    "udp://tracker.tiny-vps.com:6969/announce",
+    "udp://tracker.dler.org:6969/announce",
+    "udp://tracker.bittor.pw:1337/announce",
+    "udp://tracker.0x7c0.com:6969/announce",
+    "udp://retracker01-msk-virt.corbina.net:80/announce",
+    "udp://opentracker.io:6969/announce",
+    "udp://open.free-tracker.ga:6969/announce",
+    "udp://new-line.net:6969/announce",
+    "udp://moonburrow.club:6969/announce",
+    "udp://leet-tracker.moe:1337/announce",
+    "udp://bt2.archive.org:6969/announce",
+    "udp://bt1.archive.org:6969/announce",
+    "http://tracker2.dler.org:80/announce",
+    "http://tracker1.bt.moack.co.kr:80/announce",
+    "http://tracker.dler.org:6969/announce",
+    "http://tr.kxmp.cf:80/announce",
+    "udp://u.peer-exchange.download:6969/announce",
+    "udp://ttk2.nbaonlineservice.com:6969/announce",
+    "udp://tracker.tryhackx.org:6969/announce",
+    "udp://tracker.srv00.com:6969/announce",
+    "udp://tracker.skynetcloud.site:6969/announce",
+    "udp://tracker.jamesthebard.net:6969/announce",
+    "udp://tracker.fnix.net:6969/announce",
+    "udp://tracker.filemail.com:6969/announce",
+    "udp://tracker.farted.net:6969/announce",
+    "udp://tracker.edkj.club:6969/announce",
+    "udp://tracker.dump.cl:6969/announce",
+    "udp://tracker.deadorbit.nl:6969/announce",
+    "udp://tracker.darkness.services:6969/announce",
+    "udp://tracker.ccp.ovh:6969/announce",
+    "udp://tamas3.ynh.fr:6969/announce",
+    "udp://ryjer.com:6969/announce",
+    "udp://run.publictracker.xyz:6969/announce",
+    "udp://public.tracker.vraphim.com:6969/announce",
+    "udp://p4p.arenabg.com:1337/announce",
+    "udp://p2p.publictracker.xyz:6969/announce",
+    "udp://open.u-p.pw:6969/announce",
+    "udp://open.publictracker.xyz:6969/announce",
+    "udp://open.dstud.io:6969/announce",
+    "udp://open.demonoid.ch:6969/announce",
+    "udp://odd-hd.fr:6969/announce",
+    "udp://martin-gebhardt.eu:25/announce",
+    "udp://jutone.com:6969/announce",
+    "udp://isk.richardsw.club:6969/announce",
+    "udp://evan.im:6969/announce",
+    "udp://epider.me:6969/announce",
+    "udp://d40969.acod.regrucolo.ru:6969/announce",
+    "udp://bt.rer.lol:6969/announce",
+    "udp://amigacity.xyz:6969/announce",
+    "udp://1c.premierzal.ru:6969/announce",
+    "https://trackers.run:443/announce",
+    "https://tracker.yemekyedim.com:443/announce",
+    "https://tracker.renfei.net:443/announce",
+    "https://tracker.pmman.tech:443/announce",
+    "https://tracker.lilithraws.org:443/announce",
+    "https://tracker.imgoingto.icu:443/announce",
+    "https://tracker.cloudit.top:443/announce",
+    "https://tracker-zhuqiy.dgj055.icu:443/announce",
+    "http://tracker.renfei.net:8080/announce",
+    "http://tracker.mywaifu.best:6969/announce",
+    "http://tracker.ipv6tracker.org:80/announce",
+    "http://tracker.files.fm:6969/announce",
+    "http://tracker.edkj.club:6969/announce",
+    "http://tracker.bt4g.com:2095/announce",
+    "http://tracker-zhuqiy.dgj055.icu:80/announce",
+    "http://t1.aag.moe:17715/announce",
+    "http://t.overflow.biz:6969/announce",
+    "http://bittorrent-tracker.e-n-c-r-y-p-t.net:1337/announce",
+    "udp://torrents.artixlinux.org:6969/announce",
+    "udp://mail.artixlinux.org:6969/announce",
+    "udp://ipv4.rer.lol:2710/announce",
+    "udp://concen.org:6969/announce",
+    "udp://bt.rer.lol:2710/announce",
+    "udp://aegir.sexy:6969/announce",
+    "https://www.peckservers.com:9443/announce",
+    "https://tracker.ipfsscan.io:443/announce",
+    "https://tracker.gcrenwp.top:443/announce",
+    "http://www.peckservers.com:9000/announce",
+    "http://tracker1.itzmx.com:8080/announce",
+    "http://ch3oh.ru:6969/announce",
+    "http://bvarf.tracker.sh:2086/announce",
+)
+
+DEFAULT_MAX_TRACKERS = 12
+# Slots of every selection given to trackers with little or stale history,
+# so scores keep up with trackers that come back or go away
+EXPLORE_SLOTS = 2
+DEAD_AFTER_FAILURES = 3
+DEAD_RETRY_SECONDS = 6 * 60 * 60
+# Weight of a new sample in the latency and peer count moving averages
+SAMPLE_WEIGHT = 0.3
+# Latency assumed for a tracker that has never answered
+UNKNOWN_LATENCY_MS = 1000.0
+PENDING_ANNOUNCE_TTL_SECONDS = 300
+STATE_VERSION = 1
+
+
+class TrackerStats:
+    __slots__ = (
+        "replies",
+        "failures",
+        "consecutive_failures",
+        "latency_ms",
+        "peers",
+        "last_reply",
+        "last_failure",
+        "last_announce",
+    )
+
+    def __init__(self):
+        self.replies = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency_ms = None
+        self.peers = 0.0
+        self.last_reply = 0.0
+        self.last_failure = 0.0
+        self.last_announce = 0.0
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "TrackerStats":
+        stats = cls()
+        for name in cls.__slots__:
+            if name in payload:
+                setattr(stats, name, payload[name])
+        return stats
+
+    def to_payload(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def is_dead(self, now: float) -> bool:
+        return (
+            self.consecutive_failures >= DEAD_AFTER_FAILURES
+            and now - self.last_failure < DEAD_RETRY_SECONDS
+        )
+
+    def score(self) -> float:
+        # Laplace-smoothed success rate, so one lucky reply is not a perfect score
+        success_rate = (self.replies + 1) / (self.replies + self.failures + 2)
+        latency_ms = self.latency_ms if self.latency_ms is not None else UNKNOWN_LATENCY_MS
+        return success_rate * (1 + math.log1p(self.peers)) / (1 + latency_ms / 1000)
+
+
+def moving_average(current: Optional[float], sample: float) -> float:
+    if current is None:
+        return sample
+    return current + SAMPLE_WEIGHT * (sample - current)
+
+
+class TrackerRegistry:
+    """Session-wide health scores for the fallback trackers.
+
+    Every torrent used to get all of ``DEFAULT_TRACKERS``, most of which are
+    dead at any given time, so hundreds of seeds meant tens of thousands of
+    announces. The registry follows tracker alerts for those URLs (success,
+    announce round trip, peers returned), keeps the scores on disk, and
+    ``best()`` hands out the top ``max_trackers`` live ones. Changed scores
+    are written every ``save_interval_seconds``, since the process is usually
+    killed before ``stop()`` runs. A refresh runs every
+    ``refresh_interval_seconds`` and passes the current selection to
+    ``on_refresh`` so running torrents can swap trackers that went bad.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        alert_pump,
+        torrent_session,
+        candidates: Iterable[str] = DEFAULT_TRACKERS,
+        max_trackers: int = DEFAULT_MAX_TRACKERS,
+        refresh_interval_seconds: float = 30 * 60,
+        save_interval_seconds: float = 60,
+        on_refresh: Optional[Callable[[List[str]], None]] = None,
+    ):
+        self.path = path
+        self.session = torrent_session
+        self.candidates = list(dict.fromkeys(candidates))
+        self.max_trackers = max(max_trackers, 1)
+        self.refresh_interval_seconds = max(refresh_interval_seconds, 1.0)
+        self.save_interval_seconds = min(
+            max(save_interval_seconds, 1.0), self.refresh_interval_seconds
+        )
+        self.on_refresh = on_refresh
+        self.logger = logging.getLogger("hydra.trackers")
+        self.lock = threading.Lock()
+        self.stats = {url: TrackerStats() for url in self.candidates}
+        self.pending_announces = {}
+        self.dirty = False
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._load()
+
+        alert_pump.add_listener(lt.tracker_announce_alert, self._on_announce)
+        alert_pump.add_listener(lt.tracker_reply_alert, self._on_reply)
+        alert_pump.add_listener(lt.tracker_error_alert, self._on_error)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as state_file:
+                state = json.load(state_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            self.logger.warning("Discarding unreadable tracker state %s", self.path, exc_info=True)
+            return
+
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            return
+
+        for url, payload in (state.get("trackers") or {}).items():
+            # Trackers dropped from the candidate list are forgotten
+            if url in self.stats and isinstance(payload, dict):
+                self.stats[url] = TrackerStats.from_payload(payload)
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            state = {
+                "version": STATE_VERSION,
+                "trackers": {url: stats.to_payload() for url, stats in self.stats.items()},
+            }
+            self.dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_file_atomic(self.path, json.dumps(state).encode("utf-8"))
+        except OSError:
+            self.logger.warning("Failed to save tracker state", exc_info=True)
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        try:
+            current_mask = self.session.get_settings().get("alert_mask", 0)
+            self.session.apply_settings(
+                {"alert_mask": current_mask | lt.alert.category_t.tracker_notification}
+            )
+        except Exception:
+            self.logger.warning("Failed to enable tracker alerts", exc_info=True)
+
+        self._thread = threading.Thread(target=self._run, name="tracker-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.save()
+
+    def _run(self):
+        next_refresh = time.monotonic() + self.refresh_interval_seconds
+        while not self._stop.wait(self.save_interval_seconds):
+            self.save()
+            if self.on_refresh is None or time.monotonic() < next_refresh:
+                continue
+
+            next_refresh = time.monotonic() + self.refresh_interval_seconds
+
+            try:
+                self.on_refresh(self.best())
+            except Exception:
+                self.logger.exception("Tracker refresh failed")
+
+    def best(self, count: Optional[int] = None) -> List[str]:
+        """The ``count`` trackers to attach to a torrent, best first."""
+        count = self.max_trackers if count is None else count
+        now = time.time()
+
+        with self.lock:
+            live = [url for url in self.candidates if not self.stats[url].is_dead(now)]
+            # Only trackers that answered at least once compete on score;
+            # the rest are tried through the exploration slots
+            proven = sorted(
+                (url for url in live if self.stats[url].replies),
+                key=lambda url: self.stats[url].score(),
+                reverse=True,
+            )
+            untested = sorted(
+                (url for url in live if not self.stats[url].replies),
+                key=lambda url: self.stats[url].last_announce,
+            )
+
+        explore = min(EXPLORE_SLOTS, len(untested))
+        head = proven[: max(count - explore, 0)]
+        # Untested trackers fill the exploration slots, and any slots
+        # left when there are not enough proven ones
+        selected = head + untested[: count - len(head)] + proven[len(head) :]
+        return selected[:count]
+
+    def stats_payload(self):
+        now = time.time()
+        with self.lock:
+            dead = sum(1 for stats in self.stats.values() if stats.is_dead(now))
+            answered = sum(1 for stats in self.stats.values() if stats.replies)
+
+        return {
+            "candidates": len(self.candidates),
+            "answered": answered,
+            "dead": dead,
+            "maxTrackers": self.max_trackers,
+            "selected": self.best(),
+        }
+
+    def _on_announce(self, alert):
+        url = alert.tracker_url()
+        if url not in self.stats:
+            return
+
+        with self.lock:
+            self.stats[url].last_announce = time.time()
+            self.pending_announces[(alert.handle, url)] = alert.timestamp()
+            if len(self.pending_announces) > len(self.candidates) * 64:
+                self._prune_pending(alert.timestamp())
+
+    def _prune_pending(self, now):
+        for key, sent_at in list(self.pending_announces.items()):
+            if (now - sent_at).total_seconds() > PENDING_ANNOUNCE_TTL_SECONDS:
+                del self.pending_announces[key]
+
+    def _on_reply(self, alert):
+        url = alert.tracker_url()
+        if url not in self.stats:
+            return
+
+        with self.lock:
+            stats = self.stats[url]
+            sent_at = self.pending_announces.pop((alert.handle, url), None)
+            if sent_at is not None:
+                latency_ms = max((alert.timestamp() - sent_at).total_seconds() * 1000, 0)
+                stats.latency_ms = moving_average(stats.latency_ms, latency_ms)
+
+            stats.replies += 1
+            stats.consecutive_failures = 0
+            stats.peers = moving_average(stats.peers if stats.replies > 1 else None, alert.num_peers)
+            stats.last_reply = time.time()
+            self.dirty = True
+
+    def _on_error(self, alert):
+        url = alert.tracker_url()
+        if url not in self.stats:
+            return
+
+        with self.lock:
+            stats = self.stats[url]
+            self.pending_announces.pop((alert.handle, url), None)
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            stats.last_failure = time.time()
+            self.dirty = True
@@ -41,6 +41,12 @@ type PythonRpcResponse<T = unknown> =
   | {
       event: "ready";
       protocolVersion: number;
+    }
+  | {
+      event: "startup";
+      stage: string;
+      seedsTotal: number;
+      seedsAdded: number;
     };
 
 type PendingRpcRequest = {
@@ -147,6 +153,15 @@ export class PythonRPC {
       return;
     }
 
+    if ("event" in parsed) {
+      if (parsed.event === "startup") {
+        pythonRpcLogger.log(
+          `RPC startup ${parsed.stage}: ${parsed.seedsAdded}/${parsed.seedsTotal} seeds`
+        );
+      }
+      return;
+    }
+
     if (!("id" in parsed) || typeof parsed.id !== "number") {
       pythonRpcLogger.error(`Unexpected RPC message: ${payload}`);
       return;